@@ -5,6 +5,7 @@ Cerveau du jeu Défi Nature.
 Ce module ne doit JAMAIS importer pygame.
 Il contient:
 - Modèles: Animaux, Joueur, GameState
+- MoteurVectorise: mêmes règles, milliers de parties avancées en parallèle (NumPy)
 - IA: choix_robot_*
 - Données: chargement CSV 
 - creer_partie()
@@ -13,7 +14,10 @@ But: permettre de simuler des parties (stats) sur un PC sans pygame et de pouvoi
 Ainsi, on peut faire évoluer les IA et les données indépendamment de l'interface graphique.
 """
 
+import bisect
 import random
+from collections import OrderedDict, deque
+from statistics import NormalDist
 import numpy as np
 
 # AJOUT (cerveau / données) : CSV animaux
@@ -21,23 +25,32 @@ import csv
 from pathlib import Path
 
 
+# Version des règles du moteur : à incrémenter dès qu'un changement modifie
+# l'issue d'une partie pour une même seed (invalide les caches de stats).
+VERSION_MOTEUR = "1"
+
+
 # ============================================================
 # ======================= CERVEAU DU JEU ======================
 # ============================================================
 
 class Animaux:
     """Carte Animal : nom + 3 caractéristiques. + lien du fichier image"""
+    __slots__ = ("nom", "poids", "longueur", "longevite", "descriptif", "path_image")
+
     def __init__(self, nom, poids, longueur, longevite, descriptif=""):
         self.nom = nom
         self.poids = poids
         self.longueur = longueur
         self.longevite = longevite
         self.descriptif = str(descriptif or "")
-        self.path_image = "assets/images/animaux/" + self.nom + ".jpg"
+        self.path_image = "assets/animaux/" + self.nom + ".jpg"
 
 
 class Joueur:
     """Joueur : nom + pile de cartes (la carte visible est la dernière)."""
+    __slots__ = ("nom", "cartes")
+
     def __init__(self, nom, cartes):
         self.nom = nom
         self.cartes = cartes
@@ -51,25 +64,45 @@ class Joueur:
     def enlever_carte(self):
         return self.cartes.pop()
 
-    def ajouter_carte(self, carte):
-        # Réinsertion aléatoire
-        self.cartes.insert(random.randint(0, len(self.cartes)), carte)
+    def ajouter_carte(self, carte, rng=None):
+        # Réinsertion aléatoire (renvoie la position, utile au hash de position)
+        rng = _hasard(rng)
+        position = rng.randint(0, len(self.cartes))
+        self.cartes.insert(position, carte)
+        return position
 
     def est_vaincu(self):
         return len(self.cartes) == 0
 
 
-def distribuer_cartes(liste):
+def _hasard(rng):
+    """
+    Source de hasard à utiliser : l'objet random.Random fourni (simulations,
+    reproductibles et sans effet sur les autres parties), sinon le module random global.
+    """
+    return rng if rng is not None else random
+
+
+# Audit complet des invariants à chaque manche (debug uniquement : coûte O(n_cartes))
+AUDIT_INVARIANTS_DEBUG = False
+
+
+def _somme_controle(cartes):
+    """Somme de contrôle d'un paquet (identité des objets cartes)."""
+    return sum(id(c) for c in cartes)
+
+
+def distribuer_cartes(liste, rng=None):
     """Mélange puis distribue la moitié des cartes à chaque joueur."""
     cartes = liste.copy()
-    random.shuffle(cartes)
+    _hasard(rng).shuffle(cartes)
     milieu = len(cartes) // 2
     return cartes[:milieu], cartes[milieu:]
 
 
-def choix_robot_aleatoire():
+def choix_robot_aleatoire(rng=None):
     """Robot A : choix d'une caractéristique au hasard."""
-    return random.choice(["poids", "longueur", "longevite"])
+    return _hasard(rng).choice(["poids", "longueur", "longevite"])
 
 def choix_robot_aleatoire_premiere_caracteristique():
     """
@@ -79,17 +112,154 @@ def choix_robot_aleatoire_premiere_caracteristique():
 
 
 
-def choix_robot_intelligent(carte, historique):
+class AgregatsHistorique:
+    """
+    Statistiques courantes des cartes déjà jouées, tenues à jour à chaque ajout
+    (évite de reconstruire des listes à chaque décision des robots).
+
+    - moyenne : somme courante par caractéristique -> lecture O(1)
+    - médiane : pour chaque caractéristique, nombre d'occurrences de chaque valeur
+      + liste triée des valeurs distinctes. Les valeurs distinctes sont au plus
+      aussi nombreuses que les cartes du paquet : la lecture ne dépend pas de la
+      longueur de l'historique, et l'ajout d'une valeur nouvelle coûte O(log n).
+    """
+    __slots__ = ("n", "sommes", "valeurs_triees", "comptes")
+
+    def __init__(self):
+        self.n = 0
+        self.sommes = [0.0, 0.0, 0.0]
+        self.valeurs_triees = [[], [], []]
+        self.comptes = [{}, {}, {}]
+
+    def __len__(self):
+        return self.n
+
+    def ajouter(self, carte):
+        self.n += 1
+        for i, v in enumerate((carte.poids, carte.longueur, carte.longevite)):
+            self.sommes[i] += v
+            comptes = self.comptes[i]
+            if v in comptes:
+                comptes[v] += 1
+            else:
+                comptes[v] = 1
+                bisect.insort(self.valeurs_triees[i], v)
+
+    def moyennes(self):
+        return [somme / self.n for somme in self.sommes]
+
+    def _kieme(self, i, k):
+        """k-ième plus petite valeur (k à partir de 0) de la caractéristique i."""
+        cumul = 0
+        comptes = self.comptes[i]
+        for v in self.valeurs_triees[i]:
+            cumul += comptes[v]
+            if cumul > k:
+                return v
+        raise IndexError(k)
+
+    def medianes(self):
+        milieu = self.n // 2
+        res = []
+        for i in range(3):
+            if self.n % 2 == 1:
+                res.append(self._kieme(i, milieu))
+            else:
+                res.append((self._kieme(i, milieu - 1) + self._kieme(i, milieu)) / 2)
+        return res
+
+    def copie(self):
+        nouveau = AgregatsHistorique()
+        nouveau.n = self.n
+        nouveau.sommes = self.sommes.copy()
+        nouveau.valeurs_triees = [v.copy() for v in self.valeurs_triees]
+        nouveau.comptes = [c.copy() for c in self.comptes]
+        return nouveau
+
+
+class HistoriquePartage:
+    """
+    Liste en ajout seul, partageable entre une partie et ses copies (Monte Carlo).
+
+    - base : liste commune, remplie par l'historique d'origine (le seul à y écrire)
+    - repère : nombre d'éléments de base visibles par cet historique
+    - suite : éléments ajoutés par une copie après sa création (liste privée)
+
+    Copier coûte O(taille de la suite) : O(1) pour la copie d'une partie, jamais
+    O(longueur de l'historique). Se lit comme une liste : len, itération,
+    indices et tranches.
+    """
+    __slots__ = ("_base", "_n", "_suite")
+
+    def __init__(self, elements=()):
+        self._base = list(elements)
+        self._n = len(self._base)
+        self._suite = None  # None : c'est l'historique d'origine, il écrit dans base
+
+    def __len__(self):
+        return self._n + (len(self._suite) if self._suite else 0)
+
+    def __iter__(self):
+        base = self._base
+        for i in range(self._n):
+            yield base[i]
+        if self._suite:
+            yield from self._suite
+
+    def __getitem__(self, cle):
+        if isinstance(cle, slice):
+            return list(self)[cle]
+        n = len(self)
+        if cle < 0:
+            cle += n
+        if not 0 <= cle < n:
+            raise IndexError(cle)
+        if cle < self._n:
+            return self._base[cle]
+        return self._suite[cle - self._n]
+
+    def __eq__(self, autre):
+        return list(self) == list(autre)
+
+    def append(self, element):
+        if self._suite is None:
+            self._base.append(element)
+            self._n += 1
+        else:
+            self._suite.append(element)
+
+    def extend(self, elements):
+        if self._suite is None:
+            self._base.extend(elements)
+            self._n = len(self._base)
+        else:
+            self._suite.extend(elements)
+
+    def copie(self):
+        nouveau = HistoriquePartage.__new__(HistoriquePartage)
+        nouveau._base = self._base
+        nouveau._n = self._n
+        nouveau._suite = self._suite.copy() if self._suite else []
+        return nouveau
+
+
+def choix_robot_intelligent(carte, historique, rng=None):
     """
     Robot I : compare sa carte à une valeur de référence (médiane) issue
     des cartes déjà jouées, et choisit la caractéristique la plus "forte" relativement.
+
+    historique : liste de cartes, ou AgregatsHistorique (game.agregats_historique,
+    lecture sans recalcul).
     """
     if not historique:
-        return choix_robot_aleatoire()
+        return choix_robot_aleatoire(rng)
 
-    poids_m = np.median([c.poids for c in historique])
-    longueur_m = np.median([c.longueur for c in historique])
-    longevite_m = np.median([c.longevite for c in historique])
+    if isinstance(historique, AgregatsHistorique):
+        poids_m, longueur_m, longevite_m = historique.medianes()
+    else:
+        poids_m = np.median([c.poids for c in historique])
+        longueur_m = np.median([c.longueur for c in historique])
+        longevite_m = np.median([c.longevite for c in historique])
 
     scores = {
         "poids": carte.poids / poids_m if poids_m > 0 else 0,
@@ -98,17 +268,20 @@ def choix_robot_intelligent(carte, historique):
     }
     return max(scores, key=scores.get)
 
-def choix_robot_intelligent_moyenne(carte, historique):
+def choix_robot_intelligent_moyenne(carte, historique, rng=None):
     """
     Robot I : compare sa carte à une valeur de référence (médiane) issue
     des cartes déjà jouées, et choisit la caractéristique la plus "forte" relativement.
     """
     if not historique:
-        return choix_robot_aleatoire()
+        return choix_robot_aleatoire(rng)
 
-    poids_m = np.mean([c.poids for c in historique])
-    longueur_m = np.mean([c.longueur for c in historique])
-    longevite_m = np.mean([c.longevite for c in historique])
+    if isinstance(historique, AgregatsHistorique):
+        poids_m, longueur_m, longevite_m = historique.moyennes()
+    else:
+        poids_m = np.mean([c.poids for c in historique])
+        longueur_m = np.mean([c.longueur for c in historique])
+        longevite_m = np.mean([c.longevite for c in historique])
 
     scores = {
         "poids": carte.poids / poids_m if poids_m > 0 else 0,
@@ -117,23 +290,21 @@ def choix_robot_intelligent_moyenne(carte, historique):
     }
     return max(scores, key=scores.get)
 
-def choix_robot_triche_absolue(carte_jouee,carte_subie):
-    if carte_jouee.poids > carte_subie.poids:
-        return 'poids'
-    elif carte_jouee.longueur > carte_subie.longueur:
-        return 'longueur'
-    elif carte_jouee.longevite > carte_subie.longevite:
-        return 'longevite'
-    else:
-        return choix_robot_aleatoire()
+def choix_robot_triche_absolue(carte_jouee,carte_subie, rng=None, table=None):
+    # première caractéristique gagnante (poids, longueur, longévité), lue dans la table des issues
+    table = table if table is not None else TABLE_ISSUES
+    carac = table.premiere_carac_gagnante(carte_jouee, carte_subie)
+    if carac is not None:
+        return carac
+    return choix_robot_aleatoire(rng)
 
-def choix_robot_intelligent_triche(carte, liste_cartes_totales):
+def choix_robot_intelligent_triche(carte, liste_cartes_totales, rng=None):
     """
     Robot I : compare sa carte à une valeur de référence (médiane) issue
     des cartes déjà jouées, et choisit la caractéristique la plus "forte" relativement.
     """
     if not liste_cartes_totales:
-        return choix_robot_aleatoire()
+        return choix_robot_aleatoire(rng)
 
     poids_m = np.median([c.poids for c in liste_cartes_totales])
     longueur_m = np.median([c.longueur for c in liste_cartes_totales])
@@ -155,50 +326,17 @@ def copie_partie_simple(game):
     Important : on recopie aussi l'historique et les informations de manche
     déjà calculées. Sinon les stratégies basées sur l'historique
     (médiane/moyenne) sont simulées avec un contexte incomplet.
+    Voir GameState.copie_legere : seules les piles sont recopiées,
+    les historiques sont partagés (HistoriquePartage).
+    Les rollouts ne lisent jamais le journal : la copie est en niveau "off".
     """
-    j1 = Joueur(game.joueurs[0].nom, game.joueurs[0].cartes.copy())
-    j2 = Joueur(game.joueurs[1].nom, game.joueurs[1].cartes.copy())
-
-    nouvelle = GameState(j1, j2, mode_robot=game.mode_robot)
-
-    if game.joueur_actif.nom == j1.nom:
-        nouvelle.joueur_actif = nouvelle.joueurs[0]
-        nouvelle.joueur_passif = nouvelle.joueurs[1]
-    else:
-        nouvelle.joueur_actif = nouvelle.joueurs[1]
-        nouvelle.joueur_passif = nouvelle.joueurs[0]
-
-    # Historique nécessaire pour les bots intelligents (médiane / moyenne)
-    nouvelle.historique_cartes = game.historique_cartes.copy()
-    nouvelle.historique_manches = [manche.copy() for manche in game.historique_manches]
-
-    # Infos de manche (utiles au debug, gardées cohérentes dans le clone)
-    nouvelle.derniere_carac = game.derniere_carac
-    nouvelle.derniere_val_actif = game.derniere_val_actif
-    nouvelle.derniere_val_passif = game.derniere_val_passif
-    if game.dernier_gagnant is None:
-        nouvelle.dernier_gagnant = None
-    elif game.dernier_gagnant.nom == j1.nom:
-        nouvelle.dernier_gagnant = nouvelle.joueurs[0]
-    else:
-        nouvelle.dernier_gagnant = nouvelle.joueurs[1]
-
-    # État terminal éventuel (normalement faux pendant une manche)
-    nouvelle.terminee = game.terminee
-    if game.gagnant is None:
-        nouvelle.gagnant = None
-    elif game.gagnant.nom == j1.nom:
-        nouvelle.gagnant = nouvelle.joueurs[0]
-    else:
-        nouvelle.gagnant = nouvelle.joueurs[1]
-
-    return nouvelle
+    return game.copie_legere(niveau_journal="off")
 
 
 def simuler_partie_aleatoire(game, max_tours=100):
     tours = 0
     while not game.terminee and tours < max_tours:
-        carac = choix_robot_aleatoire()
+        carac = choix_robot_aleatoire(game.rng)
         game.appliquer_manche(carac)
         tours += 1
 
@@ -213,7 +351,7 @@ def simuler_partie_median(game, max_tours=100):
         carte = game.joueur_actif.carte_visible()
         if carte is None:
             return None
-        carac = choix_robot_intelligent(carte, game.historique_cartes)
+        carac = choix_robot_intelligent(carte, game.agregats_historique, game.rng)
         game.appliquer_manche(carac)
         tours += 1
 
@@ -272,6 +410,326 @@ def choix_robot_monte_carlo_median(game, essais=30):
     return meilleur
 
 
+def _domine_apparie(victoires, accords, essais, meilleur, z, marge=0.0):
+    """
+    Test apparié : contre chaque autre caractéristique c, les écarts rollout par rollout
+    d_k = gain(meilleur) - gain(c) ont-ils une moyenne significativement au-dessus de
+    -marge (moyenne - z * erreur type > -marge) ? marge = 0 : domination stricte.
+    Gains 0/1 : somme des d_k² = victoires[meilleur] + victoires[c] - 2 * accords[meilleur, c].
+    """
+    for c in range(3):
+        if c == meilleur:
+            continue
+        moyenne = (victoires[meilleur] - victoires[c]) / essais
+        carres = (victoires[meilleur] + victoires[c] - 2.0 * accords[meilleur, c]) / essais
+        # plancher 1/essais : des écarts tous identiques ne prouvent pas une variance nulle
+        variance = max(carres - moyenne * moyenne, 1.0 / essais) * essais / max(essais - 1, 1)
+        if moyenne - z * np.sqrt(variance / essais) <= -marge:
+            return False
+    return True
+
+
+def choix_robot_monte_carlo_batch(game, politique="random", essais_max=120, taille_lot=20, max_tours=100,
+                                  alpha=0.05, marge=0.05):
+    """
+    Monte Carlo par lots, sur le moteur vectorisé.
+
+    - État cloné minimal : piles (indices) + joueur actif (+ agrégats pour la médiane),
+      pas de copie de GameState ni de l'historique des manches.
+    - Chaque lot joue taille_lot rollouts pour CHACUNE des 3 caractéristiques,
+      tous avancés ensemble à chaque appel NumPy. Le rollout k des 3 caractéristiques
+      utilise les mêmes tirages (nombres aléatoires communs, voir MoteurVectorise) :
+      on compare les caractéristiques rollout par rollout, ce qui sépare aussi des
+      options aux taux de victoire proches.
+    - Arrêt anticipé après chaque lot (test séquentiel apparié, _domine_apparie) :
+      aucune des deux autres caractéristiques ne fait mieux que la meilleure de plus
+      de marge (en taux de victoire). Le risque alpha est réparti (Bonferroni) sur les
+      2 comparaisons et tous les lots. Une option nettement dominante s'arrête dès le
+      premier lot ; des options presque équivalentes s'arrêtent dès que l'écart
+      possible passe sous marge.
+    - Au pire essais_max rollouts par caractéristique (6 lots de 20 par défaut).
+
+    politique : "random" (rollouts au hasard) ou "median" (rollouts guidés par la médiane).
+    """
+    suivre_historique = politique == "median"
+    politique_rollout = politique_mediane_vectorisee if suivre_historique else politique_aleatoire_vectorisee
+
+    rng = np.random.default_rng(game.rng.getrandbits(64))
+    table = game.table_issues
+    i_actif = 0 if game.joueur_actif is game.joueurs[0] else 1
+
+    n_lots_max = max(1, -(-essais_max // taille_lot))
+    z = NormalDist().inv_cdf(1.0 - alpha / (2 * n_lots_max))
+
+    premiere_carac = np.repeat(np.arange(3), taille_lot)
+    victoires = np.zeros(3)
+    accords = np.zeros((3, 3))  # accords[c, c'] = rollouts appariés gagnés avec c et avec c'
+    essais = 0
+
+    for _ in range(n_lots_max):
+        moteur = MoteurVectorise.depuis_partie(
+            game, 3 * taille_lot, table, rng=rng, suivre_historique=suivre_historique, appariement=taille_lot
+        )
+        moteur.appliquer_manches(premiere_carac)
+
+        tours = 0
+        while (not moteur.terminee.all()) and tours < max_tours:
+            moteur.appliquer_manches(politique_rollout(moteur))
+            tours += 1
+
+        gains = (moteur.gagnant == i_actif).reshape(3, taille_lot).astype(np.float64)
+        victoires += gains.sum(axis=1)
+        accords += gains @ gains.T
+        essais += taille_lot
+
+        if _domine_apparie(victoires, accords, essais, int(np.argmax(victoires)), z, marge):
+            break
+
+    return CARACS[int(np.argmax(victoires))]
+
+
+# ================= SOLVEUR EXACT (petits paquets) =================
+
+class TableTransposition:
+    """
+    Cache LRU borné : état canonique -> valeurs (Q) des 3 caractéristiques.
+    Partagé entre décisions et parties (les valeurs ne dépendent que de l'état).
+    """
+
+    def __init__(self, taille_max=200_000):
+        self.taille_max = taille_max
+        self._valeurs = OrderedDict()
+        self.trouves = 0
+        self.manques = 0
+
+    def __len__(self):
+        return len(self._valeurs)
+
+    def get(self, cle):
+        q = self._valeurs.get(cle)
+        if q is None:
+            self.manques += 1
+            return None
+        self._valeurs.move_to_end(cle)
+        self.trouves += 1
+        return q
+
+    def put(self, cle, q):
+        self._valeurs[cle] = q
+        self._valeurs.move_to_end(cle)
+        while len(self._valeurs) > self.taille_max:
+            self._valeurs.popitem(last=False)
+
+    def vider(self):
+        self._valeurs.clear()
+
+
+TABLE_TRANSPOSITION = TableTransposition()
+
+SEUIL_SOLVEUR_EXACT = 6
+
+
+def etat_canonique(game):
+    """
+    (pile du joueur actif, pile du joueur passif), chaque carte remplacée par ses
+    3 valeurs : deux cartes de mêmes valeurs sont interchangeables.
+    """
+    def pile(joueur):
+        return tuple((c.poids, c.longueur, c.longevite) for c in joueur.cartes)
+    return pile(game.joueur_actif), pile(game.joueur_passif)
+
+
+def _issues_exactes(etat, c):
+    """
+    Toutes les suites possibles d'une manche jouée sur la caractéristique c,
+    avec leur probabilité (réinsertions uniformes, comme Joueur.ajouter_carte).
+    Retourne une liste (probabilité, gain terminal pour l'actif ou None, état suivant ou None).
+    """
+    actif, passif = etat
+    actif_gagne = actif[-1][c] > passif[-1][c]
+    gagnant, perdant = (actif, passif) if actif_gagne else (passif, actif)
+
+    carte_perdue = perdant[-1]
+    reste_perdant = perdant[:-1]
+    n = len(gagnant)
+    proba = 1.0 / ((n + 1) * (n + 1))
+
+    if not reste_perdant:
+        return [(1.0, 1.0 if actif_gagne else -1.0, None)]
+
+    issues = {}
+    for p1 in range(n + 1):
+        pile = gagnant[:p1] + (carte_perdue,) + gagnant[p1:]
+        dessus, pile = pile[-1], pile[:-1]
+        for p2 in range(n + 1):
+            nouvelle = pile[:p2] + (dessus,) + pile[p2:]
+            # le tour change : le passif devient actif
+            suivant = (reste_perdant, nouvelle) if actif_gagne else (nouvelle, reste_perdant)
+            issues[suivant] = issues.get(suivant, 0.0) + proba
+    return [(p, None, suivant) for suivant, p in issues.items()]
+
+
+def resoudre_exact(etat, tolerance=1e-9, iterations_max=10_000):
+    """
+    Expectimax exact sur tous les états atteignables depuis etat.
+
+    Valeur d'un état = gain espéré du joueur actif (+1 victoire, -1 défaite,
+    0 si la partie ne finit jamais), les deux joueurs jouant au mieux.
+    Le jeu peut boucler (un même état revient), donc pas de simple récursion :
+    itération de valeurs (vectorisée) jusqu'à stabilité.
+    Retourne un dict état -> (Q poids, Q longueur, Q longévité).
+    """
+    indice = {etat: 0}
+    etats = [etat]
+    lignes, cibles, probas, gains = [], [], [], []
+
+    k = 0
+    while k < len(etats):
+        courant = etats[k]
+        for c in range(3):
+            for p, gain, suivant in _issues_exactes(courant, c):
+                lignes.append(3 * k + c)
+                probas.append(p)
+                if suivant is None:
+                    cibles.append(-1)
+                    gains.append(gain)
+                else:
+                    j = indice.get(suivant)
+                    if j is None:
+                        j = indice[suivant] = len(etats)
+                        etats.append(suivant)
+                    cibles.append(j)
+                    gains.append(0.0)
+        k += 1
+
+    lignes = np.array(lignes, dtype=np.int64)
+    cibles = np.array(cibles, dtype=np.int64)
+    probas = np.array(probas)
+    gains = np.array(gains)
+    terminal = cibles < 0
+    cibles_sures = np.where(terminal, 0, cibles)
+    n_etats = len(etats)
+
+    valeurs = np.zeros(n_etats)
+    q = np.zeros((n_etats, 3))
+    for _ in range(iterations_max):
+        # l'état suivant est vu par l'adversaire : son gain est l'opposé du nôtre
+        contributions = probas * np.where(terminal, gains, -valeurs[cibles_sures])
+        q = np.bincount(lignes, weights=contributions, minlength=3 * n_etats).reshape(n_etats, 3)
+        nouvelles = q.max(axis=1)
+        ecart = np.abs(nouvelles - valeurs).max()
+        valeurs = nouvelles
+        if ecart < tolerance:
+            break
+
+    return {e: tuple(q[i]) for i, e in enumerate(etats)}
+
+
+def choix_robot_exact(game, seuil_cartes=SEUIL_SOLVEUR_EXACT, table=None, repli=None):
+    """
+    Robot exact : meilleure caractéristique d'après l'expectimax (resoudre_exact),
+    mémorisé dans une table de transposition LRU partagée.
+
+    Le nombre total de cartes ne change jamais pendant une partie : le solveur
+    ne sert donc que pour les paquets d'au plus seuil_cartes cartes. Au-delà,
+    repli sur Monte Carlo (choix_robot_monte_carlo_batch, rollouts médiane).
+    """
+    if game.nb_cartes_total > seuil_cartes:
+        if repli is not None:
+            return repli(game)
+        return choix_robot_monte_carlo_batch(game, "median")
+
+    table = table if table is not None else TABLE_TRANSPOSITION
+    etat = etat_canonique(game)
+    q = table.get(etat)
+    if q is None:
+        valeurs = resoudre_exact(etat)
+        for e, q_e in valeurs.items():
+            table.put(e, q_e)
+        # la racine, mise en premier, a pu être évincée si la table est plus petite que l'arbre
+        q = valeurs[etat]
+    return CARACS[int(np.argmax(q))]
+
+
+NIVEAUX_JOURNAL = ("off", "compact", "full")
+
+
+class DetecteurCycles:
+    """
+    Détecteur de répétitions borné : retient les hash des `fenetre` dernières
+    positions et signale une boucle quand une même position est revenue
+    `repetitions` fois dans cette fenêtre.
+
+    Une position complète (ordre des deux piles + joueur actif) ne se répète
+    pratiquement jamais dans une partie normale : la revoir souvent veut dire
+    que la partie tourne dans un petit ensemble de positions d'où elle ne sort
+    pas (ex. toutes les manches sont des égalités : l'actif perd toujours).
+    """
+    __slots__ = ("fenetre", "repetitions", "_derniers", "_comptes")
+
+    def __init__(self, fenetre=1000, repetitions=10):
+        self.fenetre = fenetre
+        self.repetitions = repetitions
+        self._derniers = deque()
+        self._comptes = {}
+
+    def observer(self, hash_position):
+        """Ajoute une position ; True si elle a atteint le seuil de répétitions."""
+        self._derniers.append(hash_position)
+        nb = self._comptes.get(hash_position, 0) + 1
+        self._comptes[hash_position] = nb
+        if len(self._derniers) > self.fenetre:
+            ancien = self._derniers.popleft()
+            reste = self._comptes[ancien] - 1
+            if reste:
+                self._comptes[ancien] = reste
+            else:
+                del self._comptes[ancien]
+        return nb >= self.repetitions
+
+
+class JournalCompact:
+    """
+    Journal des manches en tableau NumPy structuré (une ligne par manche) :
+    actif (0/1, indice du joueur actif), carac (indice dans CARACS),
+    v_actif, v_passif, gagnant (0/1). Préalloué, capacité doublée quand il est plein.
+    """
+    __slots__ = ("_donnees", "n")
+
+    DTYPE = np.dtype([
+        ("actif", np.int8),
+        ("carac", np.int8),
+        ("v_actif", np.float64),
+        ("v_passif", np.float64),
+        ("gagnant", np.int8),
+    ])
+
+    def __init__(self, capacite=64):
+        self._donnees = np.zeros(max(1, capacite), dtype=self.DTYPE)
+        self.n = 0
+
+    def __len__(self):
+        return self.n
+
+    def ajouter(self, actif, carac, v_actif, v_passif, gagnant):
+        if self.n == len(self._donnees):
+            agrandi = np.zeros(2 * len(self._donnees), dtype=self.DTYPE)
+            agrandi[:self.n] = self._donnees
+            self._donnees = agrandi
+        self._donnees[self.n] = (actif, carac, v_actif, v_passif, gagnant)
+        self.n += 1
+
+    def tableau(self):
+        """Vue sur les manches enregistrées (pas de copie)."""
+        return self._donnees[:self.n]
+
+    def copie(self):
+        nouveau = JournalCompact.__new__(JournalCompact)
+        nouveau._donnees = self._donnees.copy()
+        nouveau.n = self.n
+        return nouveau
+
+
 class GameState:
     """
     Moteur du jeu (aucun affichage ici).
@@ -286,17 +744,61 @@ class GameState:
 
     Invariant :
     - Aucune carte ne doit être perdue ou dupliquée (vérification interne).
+    - À chaque manche : vérification en O(1) du nombre de cartes par joueur.
+    - Audit complet (recalcul sur toutes les cartes) tous les audit_tous_les
+      manches (0 = jamais), ou à chaque manche si AUDIT_INVARIANTS_DEBUG :
+      la somme de contrôle de chaque joueur, tenue à jour à chaque transfert,
+      est comparée à celle de sa pile (détecte aussi une carte échangée ou
+      remplacée sans changer le nombre de cartes).
+
+    Hasard : rng est un random.Random propre à la partie (simulations).
+    Par défaut (None), le module random global est utilisé (jeu Pygame).
+
+    table : TableIssues du paquet de la partie (retrouvée ou construite par
+    table_issues si None), pour les robots et le hash de position. Une manche
+    compare directement les deux valeurs, qu'il faut lire de toute façon.
+
+    Représentation compacte (__slots__) : beaucoup de copies sont créées
+    pendant les simulations Monte Carlo (voir copie_legere).
+
+    Boucles (detecteur_cycles, optionnel) : hash_position est tenu à jour à
+    chaque déplacement de carte (XOR de clés Zobrist sur les paires de cartes
+    voisines, donc O(1) même pour une insertion au milieu d'une pile).
+    Si le détecteur voit une position trop souvent, cycle_detecte passe à True.
+
+    Journal (niveau_journal) :
+    - "full" : historique_cartes + historique_manches (dicts), pour l'interface
+    - "compact" : journal_compact (JournalCompact), historiques vides
+    - "off" : rien (stats, rollouts) ; seuls les agrégats des robots sont tenus à jour
     """
-    def __init__(self, joueur1, joueur2, mode_robot=None):
+    __slots__ = (
+        "joueurs", "rng", "joueur_actif", "joueur_passif", "mode_robot",
+        "historique_cartes", "agregats_historique", "cartes_initiales", "table_issues",
+        "terminee", "gagnant",
+        "derniere_carac", "derniere_val_actif", "derniere_val_passif", "dernier_gagnant",
+        "historique_manches", "niveau_journal", "journal_compact",
+        "detecteur_cycles", "hash_position", "cycle_detecte",
+        "audit_tous_les", "nb_manches", "nb_cartes_total",
+        "compte_cartes", "somme_controle",
+    )
+
+    def __init__(self, joueur1, joueur2, mode_robot=None, rng=None, audit_tous_les=0, table=None,
+                 niveau_journal="full", detecteur_cycles=None):
+        if niveau_journal not in NIVEAUX_JOURNAL:
+            raise ValueError(f"niveau_journal inconnu : {niveau_journal}")
         self.joueurs = [joueur1, joueur2]
+        self.rng = _hasard(rng)
         self.joueur_actif = joueur1
         self.joueur_passif = joueur2
 
         # None (PVP), "A" (robot aléatoire), "I" (robot intelligent)
         self.mode_robot = mode_robot
 
-        self.historique_cartes = []
+        self.historique_cartes = HistoriquePartage()
+        # médianes / moyennes courantes de historique_cartes (robots intelligents)
+        self.agregats_historique = AgregatsHistorique()
         self.cartes_initiales = joueur1.cartes + joueur2.cartes
+        self.table_issues = table if table is not None else table_issues(self.cartes_initiales)
 
         self.terminee = False
         self.gagnant = None
@@ -309,7 +811,80 @@ class GameState:
 
         # AJOUT : historique des manches (moteur)
         # Chaque entrée: dict(actif, passif, carac, v_actif, v_passif, gagnant)
-        self.historique_manches = []
+        self.historique_manches = HistoriquePartage()
+        self.niveau_journal = niveau_journal
+        self.journal_compact = JournalCompact() if niveau_journal == "compact" else None
+
+        # Invariants incrémentaux : nombre de cartes et somme de contrôle par joueur
+        self.audit_tous_les = audit_tous_les
+        self.nb_manches = 0
+        self.nb_cartes_total = len(self.cartes_initiales)
+        self.compte_cartes = [len(joueur1.cartes), len(joueur2.cartes)]
+        self.somme_controle = [_somme_controle(joueur1.cartes), _somme_controle(joueur2.cartes)]
+
+        # Détection de boucles (hash incrémental de la position)
+        self.detecteur_cycles = None
+        self.cycle_detecte = False
+        self.hash_position = None
+        if detecteur_cycles is not None:
+            self.activer_detection_cycles(detecteur_cycles)
+
+    def activer_detection_cycles(self, detecteur):
+        """Démarre le suivi du hash de position (à appeler une fois la position de départ fixée)."""
+        self.detecteur_cycles = detecteur
+        self.cycle_detecte = False
+        self.hash_position = self.calculer_hash_position()
+
+    def copie_legere(self, niveau_journal=None):
+        """
+        Copie pour les simulations : coût proportionnel aux piles uniquement.
+        niveau_journal : journal de la copie (None = celui de la partie copiée).
+        Les manches déjà jouées restent lisibles dans la copie.
+        - piles : recopiées (ce sont les seules données modifiées en place)
+        - historique des cartes et des manches : partagés, copie à l'écriture
+        - agrégats : copiés (taille bornée par le nombre de valeurs distinctes)
+        - paquet initial, table des issues, source de hasard : partagés
+        """
+        j1 = Joueur(self.joueurs[0].nom, self.joueurs[0].cartes.copy())
+        j2 = Joueur(self.joueurs[1].nom, self.joueurs[1].cartes.copy())
+        correspondance = {id(self.joueurs[0]): j1, id(self.joueurs[1]): j2}
+
+        nouvelle = GameState.__new__(GameState)
+        nouvelle.joueurs = [j1, j2]
+        nouvelle.rng = self.rng
+        nouvelle.joueur_actif = correspondance[id(self.joueur_actif)]
+        nouvelle.joueur_passif = correspondance[id(self.joueur_passif)]
+        nouvelle.mode_robot = self.mode_robot
+
+        nouvelle.historique_cartes = self.historique_cartes.copie()
+        nouvelle.agregats_historique = self.agregats_historique.copie()
+        nouvelle.cartes_initiales = self.cartes_initiales
+        nouvelle.table_issues = self.table_issues
+
+        nouvelle.terminee = self.terminee
+        nouvelle.gagnant = correspondance.get(id(self.gagnant))
+        nouvelle.derniere_carac = self.derniere_carac
+        nouvelle.derniere_val_actif = self.derniere_val_actif
+        nouvelle.derniere_val_passif = self.derniere_val_passif
+        nouvelle.dernier_gagnant = correspondance.get(id(self.dernier_gagnant))
+        nouvelle.historique_manches = self.historique_manches.copie()
+        nouvelle.niveau_journal = niveau_journal or self.niveau_journal
+        nouvelle.journal_compact = None
+        if nouvelle.niveau_journal == "compact":
+            nouvelle.journal_compact = self.journal_compact.copie() if self.journal_compact else JournalCompact()
+
+        # pas d'audit périodique dans les copies (comme une partie créée sans audit_tous_les)
+        nouvelle.audit_tous_les = 0
+        nouvelle.nb_manches = self.nb_manches
+        nouvelle.nb_cartes_total = self.nb_cartes_total
+        nouvelle.compte_cartes = self.compte_cartes.copy()
+        nouvelle.somme_controle = self.somme_controle.copy()
+
+        # pas de détection de boucles dans les copies
+        nouvelle.detecteur_cycles = None
+        nouvelle.cycle_detecte = False
+        nouvelle.hash_position = None
+        return nouvelle
 
     def actif_est_robot(self):
         return self.mode_robot is not None and self.joueur_actif.nom == "Robot"
@@ -329,20 +904,33 @@ class GameState:
         v2 = getattr(carte_adverse, caracteristique)
 
         # règle : strictement supérieur pour gagner, sinon actif perd
+        # (v1, v2 servent aussi à l'interface : la comparaison directe ne coûte rien de plus)
         if v1 > v2:
             gagnant, perdant = self.joueur_actif, self.joueur_passif
         else:
             gagnant, perdant = self.joueur_passif, self.joueur_actif
 
         # transfert + réinsertion aléatoire
-        carte_perdue = perdant.enlever_carte()
-        gagnant.ajouter_carte(carte_perdue)
+        if self.hash_position is None:
+            carte_perdue = perdant.enlever_carte()
+            gagnant.ajouter_carte(carte_perdue, self.rng)
+
+            carte_jouee = gagnant.enlever_carte()
+            gagnant.ajouter_carte(carte_jouee, self.rng)
+        else:
+            carte_perdue = self._deplacer_hash(perdant, gagnant)
+            self._deplacer_hash(gagnant, gagnant)
 
-        carte_jouee = gagnant.enlever_carte()
-        gagnant.ajouter_carte(carte_jouee)
+        self._noter_transfert(perdant, gagnant, carte_perdue)
 
-        self.historique_cartes.extend([carte_active, carte_adverse])
-        self._verifier_invariants()
+        if self.niveau_journal == "full":
+            self.historique_cartes.extend([carte_active, carte_adverse])
+        self.agregats_historique.ajouter(carte_active)
+        self.agregats_historique.ajouter(carte_adverse)
+        self.nb_manches += 1
+        self._verifier_invariants_rapide()
+        if AUDIT_INVARIANTS_DEBUG or (self.audit_tous_les > 0 and self.nb_manches % self.audit_tous_les == 0):
+            self._verifier_invariants()
 
         self.derniere_carac = caracteristique
         self.derniere_val_actif = v1
@@ -350,17 +938,22 @@ class GameState:
         self.dernier_gagnant = gagnant
 
         # AJOUT : log de manche (avant le swap de tour)
-        try:
-            self.historique_manches.append({
-                "actif": self.joueur_actif.nom,
-                "passif": self.joueur_passif.nom,
-                "carac": caracteristique,
-                "v_actif": v1,
-                "v_passif": v2,
-                "gagnant": gagnant.nom
-            })
-        except Exception:
-            pass
+        if self.niveau_journal == "full":
+            try:
+                self.historique_manches.append({
+                    "actif": self.joueur_actif.nom,
+                    "passif": self.joueur_passif.nom,
+                    "carac": caracteristique,
+                    "v_actif": v1,
+                    "v_passif": v2,
+                    "gagnant": gagnant.nom
+                })
+            except Exception:
+                pass
+        elif self.niveau_journal == "compact":
+            i_actif = 0 if self.joueur_actif is self.joueurs[0] else 1
+            i_gagnant = i_actif if gagnant is self.joueur_actif else 1 - i_actif
+            self.journal_compact.ajouter(i_actif, INDICE_CARAC[caracteristique], v1, v2, i_gagnant)
 
         if perdant.est_vaincu():
             self.terminee = True
@@ -370,7 +963,90 @@ class GameState:
         # on change le tour du joueur
         self.joueur_actif, self.joueur_passif = self.joueur_passif, self.joueur_actif
 
+        if self.hash_position is not None:
+            self.hash_position ^= self.table_issues.cle_zobrist_actif
+            if self.detecteur_cycles.observer(self.hash_position):
+                self.cycle_detecte = True
+
+    # ---------- hash de position (Zobrist sur les paires de cartes voisines) ----------
+
+    def _cle_paire(self, i_joueur, dessous, dessus):
+        table = self.table_issues
+        largeur = table.largeur_zobrist
+        return table.cles_zobrist[(i_joueur * largeur + dessous) * largeur + dessus]
+
+    def _indice_carte(self, cartes, position):
+        """Indice (table) de cartes[position], ou carte fictive bas/haut de pile."""
+        if position < 0:
+            return self.table_issues.bas_pile
+        if position >= len(cartes):
+            return self.table_issues.haut_pile
+        return self.table_issues.indice_de[id(cartes[position])]
+
+    def calculer_hash_position(self):
+        """Hash complet (O(n_cartes)) : sert d'état initial et de vérification."""
+        h = 0
+        for i_joueur, joueur in enumerate(self.joueurs):
+            for k in range(-1, len(joueur.cartes)):
+                h ^= self._cle_paire(i_joueur, self._indice_carte(joueur.cartes, k),
+                                     self._indice_carte(joueur.cartes, k + 1))
+        if self.joueur_actif is self.joueurs[1]:
+            h ^= self.table_issues.cle_zobrist_actif
+        return h
+
+    def _deplacer_hash(self, source, cible):
+        """
+        source.enlever_carte() puis cible.ajouter_carte() (réinsertion au hasard),
+        avec mise à jour du hash. Retrait du dessus : (dessous, c), (c, haut) -> (dessous, haut) ;
+        insertion : (dessous, dessus) -> (dessous, c), (c, dessus). Tout en variables
+        locales : appelé deux fois par manche.
+        """
+        table = self.table_issues
+        cles = table.cles_zobrist
+        indice_de = table.indice_de
+        largeur = table.largeur_zobrist
+        bas, haut = table.bas_pile, table.haut_pile
+
+        cartes = source.cartes
+        base = (0 if source is self.joueurs[0] else 1) * largeur
+        carte = cartes.pop()
+        c = indice_de[id(carte)]
+        dessous = indice_de[id(cartes[-1])] if cartes else bas
+        h = cles[(base + dessous) * largeur + c] ^ cles[(base + c) * largeur + haut] ^ cles[(base + dessous) * largeur + haut]
+
+        cartes = cible.cartes
+        base = (0 if cible is self.joueurs[0] else 1) * largeur
+        position = cible.ajouter_carte(carte, self.rng)
+        dessous = indice_de[id(cartes[position - 1])] if position > 0 else bas
+        dessus = indice_de[id(cartes[position + 1])] if position + 1 < len(cartes) else haut
+        h ^= cles[(base + dessous) * largeur + dessus] ^ cles[(base + dessous) * largeur + c] ^ cles[(base + c) * largeur + dessus]
+
+        self.hash_position ^= h
+        return carte
+
+    def _noter_transfert(self, perdant, gagnant, carte):
+        """Met à jour compteurs et sommes de contrôle après le passage d'une carte."""
+        i_perdant = 0 if perdant is self.joueurs[0] else 1
+        i_gagnant = 1 - i_perdant
+        cle = id(carte)
+
+        self.compte_cartes[i_perdant] -= 1
+        self.compte_cartes[i_gagnant] += 1
+        self.somme_controle[i_perdant] -= cle
+        self.somme_controle[i_gagnant] += cle
+
+    def _verifier_invariants_rapide(self):
+        """Vérification O(1), faite à chaque manche."""
+        j1, j2 = self.joueurs
+        assert len(j1.cartes) == self.compte_cartes[0] and len(j2.cartes) == self.compte_cartes[1], (
+            "ERREUR: nombre de cartes d'un joueur incohérent"
+        )
+        assert self.compte_cartes[0] + self.compte_cartes[1] == self.nb_cartes_total, (
+            "ERREUR: nombre total de cartes a changé"
+        )
+
     def _verifier_invariants(self):
+        """Audit complet O(n_cartes) : recalcule tout à partir des piles."""
         toutes = []
         for j in self.joueurs:
             toutes.extend(j.cartes)
@@ -380,6 +1056,416 @@ class GameState:
         assert set(id(c) for c in toutes) == set(id(c) for c in self.cartes_initiales), (
             "ERREUR: carte disparue ou carte inconnue apparue"
         )
+        for i, j in enumerate(self.joueurs):
+            assert _somme_controle(j.cartes) == self.somme_controle[i], (
+                "ERREUR: somme de contrôle incrémentale différente des piles"
+            )
+
+
+# ============================================================
+# ============== MOTEUR VECTORISE (simulations NumPy) ========
+# ============================================================
+
+# Ordre des colonnes de la matrice des caractéristiques (indice = code carac)
+CARACS = ["poids", "longueur", "longevite"]
+
+
+INDICE_CARAC = {c: i for i, c in enumerate(CARACS)}
+
+
+def matrice_caracteristiques(liste_animaux):
+    """Matrice NumPy (n_cartes x 3) : une ligne par carte, colonnes = CARACS."""
+    return np.array(
+        [[a.poids, a.longueur, a.longevite] for a in liste_animaux],
+        dtype=float,
+    ).reshape(-1, 3)
+
+
+def signature_paquet(liste_animaux):
+    """Identité + valeurs des cartes (sans tenir compte de l'ordre) : change dès que le paquet change."""
+    return frozenset((id(a), a.poids, a.longueur, a.longevite) for a in liste_animaux)
+
+
+class TableIssues:
+    """
+    Issues précalculées de toutes les confrontations d'un paquet (petit et fixe).
+
+    - stats : matrice (n_cartes x 3) des caractéristiques
+    - victoires[i_actif, i_passif, c] : True si la carte active gagne sur CARACS[c]
+      (strictement supérieur, comme appliquer_manche)
+    - premiere_victoire[i_actif, i_passif] : première caractéristique gagnante
+      (ordre de CARACS), -1 si aucune (robot triche absolue)
+    - rangs[i, c] : rang de la carte i pour CARACS[c] (0 = plus petite valeur,
+      même rang pour des valeurs égales)
+    - ordres[c] : indices des cartes triées par CARACS[c], valeurs_triees[c] : valeurs correspondantes
+    - indice_de : id(carte) -> indice de la carte dans le paquet
+    - cles_zobrist : clés aléatoires 64 bits pour le hash de position (voir GameState)
+
+    Pour le moteur vectorisé, une manche se résume donc à une lecture dans un tableau.
+    """
+
+    def __init__(self, liste_animaux):
+        self.cartes = list(liste_animaux)
+        self.signature = signature_paquet(self.cartes)
+        self.indice_de = {id(a): i for i, a in enumerate(self.cartes)}
+
+        self.stats = matrice_caracteristiques(self.cartes)
+        self.victoires = self.stats[:, None, :] > self.stats[None, :, :]
+        self.premiere_victoire = np.where(
+            self.victoires.any(axis=2), self.victoires.argmax(axis=2), -1
+        )
+
+        self.rangs = np.zeros(self.stats.shape, dtype=np.int64)
+        for c in range(3):
+            self.rangs[:, c] = np.unique(self.stats[:, c], return_inverse=True)[1]
+        self.ordres = np.argsort(self.stats, axis=0, kind="stable").T
+        self.valeurs_triees = np.take_along_axis(self.stats, self.ordres.T, axis=0).T
+
+        # Versions Python pour les lectures une par une (plus rapides qu'un accès NumPy scalaire)
+        self._victoires_listes = self.victoires.tolist()
+        self._premiere_listes = self.premiere_victoire.tolist()
+
+        # Hash de position : une clé par (joueur, carte du dessous, carte du dessus)
+        # pour chaque paire de cartes voisines d'une pile, + une clé "joueur 1 actif".
+        # Bas et haut de pile sont les cartes fictives n et n + 1.
+        n = len(self.cartes)
+        self.bas_pile = n
+        self.haut_pile = n + 1
+        self.largeur_zobrist = n + 2
+        generateur = random.Random(0x5EED)
+        self.cles_zobrist = [generateur.getrandbits(64) for _ in range(2 * (n + 2) * (n + 2))]
+        self.cle_zobrist_actif = generateur.getrandbits(64)
+
+    def __len__(self):
+        return len(self.cartes)
+
+    def actif_gagne(self, carte_active, carte_passive, caracteristique):
+        """Issue d'une manche : True si la carte active gagne sur cette caractéristique."""
+        i = self.indice_de.get(id(carte_active))
+        j = self.indice_de.get(id(carte_passive))
+        if i is None or j is None:
+            # carte hors paquet (ne devrait pas arriver) : comparaison directe
+            return getattr(carte_active, caracteristique) > getattr(carte_passive, caracteristique)
+        return self._victoires_listes[i][j][INDICE_CARAC[caracteristique]]
+
+    def premiere_carac_gagnante(self, carte_active, carte_passive):
+        """Première caractéristique (ordre de CARACS) qui fait gagner, ou None."""
+        i = self.indice_de.get(id(carte_active))
+        j = self.indice_de.get(id(carte_passive))
+        if i is None or j is None:
+            for c in CARACS:
+                if getattr(carte_active, c) > getattr(carte_passive, c):
+                    return c
+            return None
+        c = self._premiere_listes[i][j]
+        return CARACS[c] if c >= 0 else None
+
+
+def _table_de(paquet):
+    """Accepte une TableIssues ou une liste de cartes."""
+    return paquet if isinstance(paquet, TableIssues) else table_issues(paquet)
+
+
+_TABLES_ISSUES = {}
+_TABLES_ISSUES_MAX = 8
+
+
+def table_issues(liste_animaux):
+    """
+    TableIssues du paquet, reconstruite seulement si le paquet a changé
+    (autres cartes ou autres valeurs, par ex. après rechargement de data/animaux.csv).
+    L'ordre des cartes ne compte pas : une partie déjà distribuée retrouve la table du paquet.
+    """
+    signature = signature_paquet(liste_animaux)
+    table = _TABLES_ISSUES.get(signature)
+    if table is None:
+        if len(_TABLES_ISSUES) >= _TABLES_ISSUES_MAX:
+            _TABLES_ISSUES.clear()
+        table = TableIssues(liste_animaux)
+        _TABLES_ISSUES[signature] = table
+    return table
+
+
+class MoteurVectorise:
+    """
+    Second moteur, pensé pour les simulations en masse (aucun objet Animaux ici).
+
+    Mêmes règles que GameState :
+    - valeur strictement supérieure pour gagner, le joueur actif perd les égalités ;
+    - le perdant donne sa carte visible, le gagnant la réinsère au hasard,
+      puis retire sa carte visible et la réinsère au hasard (comme appliquer_manche) ;
+    - la partie s'arrête quand un joueur n'a plus de cartes.
+
+    Représentation (G parties avancées en même temps à chaque appel NumPy) :
+    - table : TableIssues du paquet (stats, issues précalculées des confrontations) ;
+      les indices de cartes sont ceux de la table
+    - piles : tableau (G, 2, n_cartes) d'indices de cartes. La pile du joueur j
+      de la partie g est piles[g, j, :tailles[g, j]] ; la carte visible est la
+      dernière (même convention que Joueur.cartes).
+    - actif : (G,) indice 0/1 du joueur actif
+    - terminee, gagnant (-1 tant que pas de vainqueur), manches
+    - historique (optionnel, politique médiane) :
+      comptes_historique (G, n_cartes) = cartes jouées dans ce moteur,
+      historique_base (3, n_cartes) = historique commun de départ, par caractéristique
+    - appariement (optionnel) : L tel que G est un multiple de L. Les parties g et
+      g + L, g + 2L... reçoivent les mêmes tirages aléatoires (nombres aléatoires
+      communs) : leurs issues ne diffèrent que par ce qui les distingue au départ.
+    """
+
+    def __init__(self, table, piles, tailles, actif, rng=None, comptes_historique=None, historique_base=None,
+                 appariement=None):
+        self.table = table
+        self.stats = table.stats
+        self.victoires = table.victoires
+        self.piles = np.array(piles, dtype=np.int64)
+        self.tailles = np.array(tailles, dtype=np.int64)
+        self.actif = np.array(actif, dtype=np.int64)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.appariement = appariement
+
+        n_parties, _, n_cartes = self.piles.shape
+        self.terminee = (self.tailles == 0).any(axis=1)
+        self.gagnant = np.full(n_parties, -1, dtype=np.int64)
+        self.manches = np.zeros(n_parties, dtype=np.int64)
+
+        # Vues "une ligne par (partie, joueur)" : ligne = 2 * partie + joueur.
+        # Indexer des lignes d'un tableau 2D est bien plus rapide que du 3D.
+        self._piles_lignes = self.piles.reshape(2 * n_parties, n_cartes)
+        self._tailles_lignes = self.tailles.reshape(2 * n_parties)
+        self._colonnes = np.arange(n_cartes)
+
+        self.comptes_historique = comptes_historique
+        self.historique_base = historique_base
+        if comptes_historique is not None:
+            self._ordres = table.ordres
+            self._valeurs_triees = table.valeurs_triees
+            self._base_triee = np.take_along_axis(historique_base, self._ordres, axis=1)
+
+    @staticmethod
+    def _historique_vide(n_parties, n_cartes):
+        return np.zeros((n_parties, n_cartes), dtype=np.int64), np.zeros((3, n_cartes), dtype=np.int64)
+
+    @classmethod
+    def distribuer(cls, liste_animaux, n_parties, rng=None, suivre_historique=False):
+        """
+        Crée n_parties parties neuves : paquet mélangé puis coupé en deux
+        (comme distribuer_cartes), joueur qui commence tiré au hasard.
+        liste_animaux : liste de cartes ou TableIssues déjà construite.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        table = _table_de(liste_animaux)
+        n_cartes = len(table)
+        milieu = n_cartes // 2
+
+        paquets = rng.permuted(np.tile(np.arange(n_cartes), (n_parties, 1)), axis=1)
+
+        piles = np.zeros((n_parties, 2, n_cartes), dtype=np.int64)
+        piles[:, 0, :milieu] = paquets[:, :milieu]
+        piles[:, 1, :n_cartes - milieu] = paquets[:, milieu:]
+
+        tailles = np.empty((n_parties, 2), dtype=np.int64)
+        tailles[:, 0] = milieu
+        tailles[:, 1] = n_cartes - milieu
+
+        comptes, base = None, None
+        if suivre_historique:
+            comptes, base = cls._historique_vide(n_parties, n_cartes)
+
+        actif = rng.integers(0, 2, size=n_parties)
+        return cls(table, piles, tailles, actif, rng=rng, comptes_historique=comptes, historique_base=base)
+
+    @classmethod
+    def depuis_partie(cls, game, n_parties, liste_animaux, rng=None, suivre_historique=False, appariement=None):
+        """
+        Recopie n_parties fois la position d'un GameState (piles + joueur actif).
+        Le joueur 0 du moteur est game.joueurs[0].
+        liste_animaux : liste de cartes ou TableIssues déjà construite.
+        suivre_historique : reprend aussi game.agregats_historique (politique médiane).
+        appariement : voir la classe.
+        """
+        table = _table_de(liste_animaux)
+        indice_de = table.indice_de
+        stats = table.stats
+        n_cartes = len(table)
+
+        piles = np.zeros((n_parties, 2, n_cartes), dtype=np.int64)
+        tailles = np.zeros((n_parties, 2), dtype=np.int64)
+        for j, joueur in enumerate(game.joueurs):
+            indices = [indice_de[id(c)] for c in joueur.cartes]
+            piles[:, j, :len(indices)] = indices
+            tailles[:, j] = len(indices)
+
+        comptes, base = None, None
+        if suivre_historique:
+            comptes, base = cls._historique_vide(n_parties, n_cartes)
+            # Les agrégats donnent, par caractéristique, le nombre d'occurrences de chaque
+            # valeur : on les attribue à une carte du paquet qui a cette valeur.
+            agregats = game.agregats_historique
+            for c in range(3):
+                for valeur, nb in agregats.comptes[c].items():
+                    cartes = np.nonzero(stats[:, c] == valeur)[0]
+                    if cartes.size:
+                        base[c, cartes[0]] += nb
+
+        actif = 0 if game.joueur_actif is game.joueurs[0] else 1
+        return cls(table, piles, tailles, np.full(n_parties, actif), rng=rng,
+                   comptes_historique=comptes, historique_base=base, appariement=appariement)
+
+    def aleas(self, parties, k=1):
+        """
+        Tirages uniformes dans [0, 1), tableau (k, len(parties)).
+        Avec appariement, les parties d'un même groupe (même g % L) ont les mêmes tirages.
+        """
+        if self.appariement is None:
+            return self.rng.random((k, parties.size))
+        return self.rng.random((k, self.appariement))[:, parties % self.appariement]
+
+    def cartes_visibles(self):
+        """(carte du joueur actif, carte du joueur passif) pour chaque partie."""
+        ligne_actif = 2 * np.arange(self.piles.shape[0]) + self.actif
+        ligne_passif = ligne_actif ^ 1
+        haut_actif = np.maximum(self._tailles_lignes[ligne_actif] - 1, 0)
+        haut_passif = np.maximum(self._tailles_lignes[ligne_passif] - 1, 0)
+        return (
+            self._piles_lignes[ligne_actif, haut_actif],
+            self._piles_lignes[ligne_passif, haut_passif],
+        )
+
+    def _inserer(self, piles, positions, cartes, rangs):
+        """
+        Insère cartes[i] à la position positions[i] de la ligne i de piles.
+        Renvoie les nouvelles piles.
+        """
+        decalees = np.empty_like(piles)
+        decalees[:, 1:] = piles[:, :-1]
+        decalees[:, 0] = piles[:, 0]
+
+        nouvelles = np.where(self._colonnes < positions[:, None], piles, decalees)
+        nouvelles[rangs, positions] = cartes
+        return nouvelles
+
+    def appliquer_manches(self, caracs):
+        """
+        Joue une manche dans chaque partie non terminée.
+        caracs : tableau (G,) de codes 0/1/2 (indices dans CARACS).
+        """
+        idx = np.flatnonzero(~self.terminee)
+        if idx.size == 0:
+            return
+
+        piles = self._piles_lignes
+        tailles = self._tailles_lignes
+        caracs = np.asarray(caracs)[idx]
+
+        ligne_actif = 2 * idx + self.actif[idx]
+        ligne_passif = ligne_actif ^ 1
+        taille_actif = tailles[ligne_actif]
+        taille_passif = tailles[ligne_passif]
+        carte_actif = piles[ligne_actif, taille_actif - 1]
+        carte_passif = piles[ligne_passif, taille_passif - 1]
+
+        if self.comptes_historique is not None:
+            self.comptes_historique[idx, carte_actif] += 1
+            self.comptes_historique[idx, carte_passif] += 1
+
+        # règle : strictement supérieur pour gagner, sinon actif perd (issue précalculée)
+        actif_gagne = self.victoires[carte_actif, carte_passif, caracs]
+        ligne_gagnant = np.where(actif_gagne, ligne_actif, ligne_passif)
+        taille_gagnant = np.where(actif_gagne, taille_actif, taille_passif)
+        taille_perdant = np.where(actif_gagne, taille_passif, taille_actif) - 1
+        carte_perdue = np.where(actif_gagne, carte_passif, carte_actif)
+
+        # transfert + réinsertion aléatoire (même séquence que GameState) :
+        # carte perdue insérée chez le gagnant, puis sa carte du dessus réinsérée
+        tailles[ligne_gagnant ^ 1] = taille_perdant
+
+        # positions uniformes dans [0, taille_gagnant] (un seul tirage pour les deux insertions)
+        rangs = np.arange(idx.size)
+        positions = (self.aleas(idx, 2) * (taille_gagnant + 1)).astype(np.int64)
+
+        pile = self._inserer(piles[ligne_gagnant], positions[0], carte_perdue, rangs)
+        carte_jouee = pile[rangs, taille_gagnant]
+        pile = self._inserer(pile, positions[1], carte_jouee, rangs)
+        piles[ligne_gagnant] = pile
+        tailles[ligne_gagnant] = taille_gagnant + 1
+
+        self.manches[idx] += 1
+
+        fin = taille_perdant == 0
+        self.terminee[idx[fin]] = True
+        self.gagnant[idx[fin]] = ligne_gagnant[fin] & 1
+
+        # on change le tour du joueur
+        suite = idx[~fin]
+        self.actif[suite] ^= 1
+
+    def jouer(self, politique_0, politique_1, max_manches=5000):
+        """
+        Fait avancer toutes les parties jusqu'à la fin (ou max_manches).
+        Une politique est une fonction moteur -> tableau (G,) de codes carac.
+        """
+        while (not self.terminee.all()) and self.manches.max() < max_manches:
+            c0 = politique_0(self)
+            c1 = politique_1(self)
+            self.appliquer_manches(np.where(self.actif == 0, c0, c1))
+
+
+def politique_aleatoire_vectorisee(moteur):
+    """Équivalent vectorisé de choix_robot_aleatoire."""
+    return (moteur.aleas(np.arange(moteur.piles.shape[0]))[0] * 3).astype(np.int64)
+
+
+def politique_premiere_vectorisee(moteur):
+    """Équivalent vectorisé de choix_robot_aleatoire_premiere_caracteristique."""
+    return np.zeros(moteur.piles.shape[0], dtype=np.int64)
+
+
+def politique_triche_absolue_vectorisee(moteur):
+    """Équivalent vectorisé de choix_robot_triche_absolue (première carac gagnante)."""
+    carte_actif, carte_passif = moteur.cartes_visibles()
+    premiere = moteur.table.premiere_victoire[carte_actif, carte_passif]
+    hasard = politique_aleatoire_vectorisee(moteur)
+    return np.where(premiere >= 0, premiere, hasard)
+
+
+def politique_mediane_vectorisee(moteur):
+    """
+    Équivalent vectorisé de choix_robot_intelligent : ratio carte / médiane de
+    l'historique, pour chaque partie (le moteur doit suivre l'historique).
+    Les 3 caractéristiques sont traitées d'un coup : comptes triés par valeur,
+    somme cumulée, puis recherche des deux éléments du milieu.
+    """
+    comptes = moteur.comptes_historique[:, moteur._ordres] + moteur._base_triee
+    cumul = np.cumsum(comptes, axis=2)
+
+    n = cumul[:, 0, -1]
+    k_bas = np.maximum((n - 1) // 2, 0)[:, None, None]
+    k_haut = (n // 2)[:, None, None]
+
+    lignes = np.arange(3)
+    bas = moteur._valeurs_triees[lignes, (cumul > k_bas).argmax(axis=2)]
+    haut = moteur._valeurs_triees[lignes, (cumul > k_haut).argmax(axis=2)]
+    mediane = (bas + haut) / 2
+
+    carte_actif, _ = moteur.cartes_visibles()
+    scores = np.divide(moteur.stats[carte_actif], mediane, out=np.zeros_like(mediane), where=mediane > 0)
+    return np.where(n > 0, scores.argmax(axis=1), politique_aleatoire_vectorisee(moteur))
+
+
+def simuler_parties_vectorisees(liste_animaux, n_parties, politique_0, politique_1,
+                                max_manches=5000, seed=None):
+    """
+    Joue n_parties parties indépendantes avec le moteur vectorisé.
+    Retourne un dict : victoires de chaque joueur, timeouts, nombre de manches par partie.
+    """
+    moteur = MoteurVectorise.distribuer(liste_animaux, n_parties, rng=np.random.default_rng(seed))
+    moteur.jouer(politique_0, politique_1, max_manches=max_manches)
+    return {
+        "victoires_0": int((moteur.gagnant == 0).sum()),
+        "victoires_1": int((moteur.gagnant == 1).sum()),
+        "timeouts": int((moteur.gagnant < 0).sum()),
+        "manches": moteur.manches.copy(),
+    }
 
 
 # -------------------------------------------------------------------
@@ -483,25 +1569,45 @@ _animaux_csv = charger_animaux_csv(_CSV_PATH)
 if _animaux_csv:
     LISTE_ANIMAUX = _animaux_csv
 
+# Issues de toutes les confrontations du paquet chargé (voir TableIssues)
+TABLE_ISSUES = table_issues(LISTE_ANIMAUX)
+
+
+def recharger_animaux(path_csv=None):
+    """
+    Relit le paquet depuis le CSV (data/animaux.csv par défaut) et reconstruit
+    TABLE_ISSUES. Garde le paquet actuel si le fichier est absent ou invalide.
+    """
+    global LISTE_ANIMAUX, TABLE_ISSUES
+    animaux = charger_animaux_csv(path_csv or _CSV_PATH)
+    if animaux:
+        LISTE_ANIMAUX = animaux
+        TABLE_ISSUES = table_issues(LISTE_ANIMAUX)
+    return LISTE_ANIMAUX
+
 
-def creer_partie(mode, prenom="Humain"):
-    c1, c2 = distribuer_cartes(LISTE_ANIMAUX)
+def creer_partie(mode, prenom="Humain", rng=None):
+    """
+    Partie pour le jeu (humain) : une manche par clic, on peut donc
+    se permettre l'audit complet des invariants à chaque manche.
+    """
+    c1, c2 = distribuer_cartes(LISTE_ANIMAUX, rng)
 
     if mode == "PVP":
         j1 = Joueur("Joueur 1", c1)
         j2 = Joueur("Joueur 2", c2)
-        return GameState(j1, j2, mode_robot=None)
+        return GameState(j1, j2, mode_robot=None, rng=rng, audit_tous_les=1)
 
     nom_humain = prenom.strip() if prenom.strip() else "Humain"
 
     if mode == "RA":
         humain = Joueur(nom_humain, c1)
         robot = Joueur("Robot", c2)
-        return GameState(humain, robot, mode_robot="A")
+        return GameState(humain, robot, mode_robot="A", rng=rng, audit_tous_les=1)
 
     if mode == "RI":
         humain = Joueur(nom_humain, c1)
         robot = Joueur("Robot", c2)
-        return GameState(humain, robot, mode_robot="I")
+        return GameState(humain, robot, mode_robot="I", rng=rng, audit_tous_les=1)
 
     raise ValueError("Mode inconnu")
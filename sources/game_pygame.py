@@ -8,10 +8,16 @@ UI Pygame du jeu Défi Nature.
 
 from cerveau import *
 import pygame
+import hashlib
+import os
+import struct
 import sys
 import random
+import time
 import numpy as np
+from collections import OrderedDict
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 pygame.init()
 
@@ -36,6 +42,558 @@ def chemin_projet(*parties):
     return str(RACINE_PROJET.joinpath(*parties))
 
 
+# ============================================================
+# ===================== ROBOT (THREAD) ========================
+# ============================================================
+
+def choix_robot_selon_mode(game):
+    """Caractéristique choisie par le robot actif de `game` (selon game.mode_robot)."""
+    carte = game.joueur_actif.carte_visible()
+    mode_robot = game.mode_robot
+    if mode_robot == "A":
+        return choix_robot_aleatoire(game.rng)
+    if mode_robot == "MC_R":
+        return choix_robot_monte_carlo_batch(game, "random")
+    if mode_robot == "MC_M":
+        return choix_robot_monte_carlo_batch(game, "median")
+    if mode_robot == "EX":
+        return choix_robot_exact(game)
+    return choix_robot_intelligent(carte, game.agregats_historique)
+
+
+class RobotEnArrierePlan:
+    """
+    Fait réfléchir le robot dans un thread à part pour que la fenêtre reste fluide.
+
+    - lancer(game) : démarre le calcul (la boucle ne modifie pas la partie pendant ce temps)
+    - resultat(game) : None tant que le robot réfléchit, sinon la caractéristique choisie
+    - pret() : le calcul est fini, resultat() le rendra sans attendre
+    - annuler() : oublie le calcul en cours (Rejouer, retour au menu...)
+    """
+
+    def __init__(self):
+        self._executeur = ThreadPoolExecutor(max_workers=1)
+        self._futur = None
+        self._partie = None
+
+    def en_cours(self):
+        return self._futur is not None
+
+    def pret(self):
+        return self._futur is not None and self._futur.done()
+
+    def lancer(self, game):
+        self.annuler()
+        self._partie = game
+        self._futur = self._executeur.submit(choix_robot_selon_mode, game)
+        self._futur.add_done_callback(_reveiller_boucle)
+
+    def resultat(self, game):
+        if self._futur is None or game is not self._partie:
+            return None
+        if not self._futur.done():
+            return None
+        futur = self._futur
+        self._futur = None
+        self._partie = None
+        return futur.result()
+
+    def annuler(self):
+        # Un calcul déjà démarré ne peut pas être interrompu : on ignore juste son résultat.
+        if self._futur is not None:
+            self._futur.cancel()
+        self._futur = None
+        self._partie = None
+
+    def fermer(self):
+        self.annuler()
+        self._executeur.shutdown(wait=False, cancel_futures=True)
+
+
+# ============================================================
+# ================= AFFICHAGE (ZONES SALES) ===================
+# ============================================================
+
+# Posté quand le robot a fini de réfléchir : réveille la boucle au repos.
+EVENEMENT_ROBOT = pygame.USEREVENT + 1
+
+
+def _reveiller_boucle(_futur=None):
+    try:
+        pygame.event.post(pygame.event.Event(EVENEMENT_ROBOT))
+    except pygame.error:
+        pass
+
+
+class OrdonnanceurAffichage:
+    """
+    Décide quoi redessiner, et à quel rythme tourner la boucle.
+
+    - zones : nom -> Rect dans la fenêtre (haut, gauche, jeu, overlays)
+    - signaler(nom, signature) : un tuple qui résume ce que la zone affiche ;
+      si la signature change, la zone est "sale"
+    - valider() : Rects des zones sales, à passer à pygame.display.update
+    - attendre(clock, actif) : 60 FPS pendant une animation ou quand le choix du robot
+      est prêt, sinon on dort jusqu'au prochain événement (clic, touche, robot...)
+    """
+
+    FPS_ACTIF = 60
+    ATTENTE_REPOS_MS = 250
+
+    def __init__(self, zones):
+        self.zones = dict(zones)
+        self._signatures = {}
+        self._sales = set(self.zones)
+        self._evenements = []
+
+    def tout_invalider(self):
+        self._sales = set(self.zones)
+
+    def signaler(self, nom, signature):
+        if nom not in self._signatures or self._signatures[nom] != signature:
+            self._signatures[nom] = signature
+            self._sales.add(nom)
+
+    def recouvrir(self, nom, visible):
+        """
+        `nom` est dessiné par-dessus toute la fenêtre (voile semi-transparent) :
+        s'il change, ou si une zone change pendant qu'il est affiché, on repeint tout.
+        """
+        if nom in self._sales or (visible and self._sales):
+            self.tout_invalider()
+
+    def est_sale(self, nom):
+        return nom in self._sales
+
+    def a_redessiner(self):
+        return bool(self._sales)
+
+    def valider(self):
+        rects = [rect for nom, rect in self.zones.items() if nom in self._sales]
+        self._sales = set()
+        return rects
+
+    def observer(self, event):
+        # Fenêtre découverte / restaurée : son contenu n'est plus garanti.
+        types = [getattr(pygame, nom, None) for nom in ("VIDEOEXPOSE", "WINDOWEXPOSED", "WINDOWSHOWN", "WINDOWRESTORED", "WINDOWSIZECHANGED")]
+        if event.type in types:
+            self.tout_invalider()
+
+    def evenements(self):
+        evenements = self._evenements + pygame.event.get()
+        self._evenements = []
+        for event in evenements:
+            self.observer(event)
+        return evenements
+
+    def attendre(self, clock, actif):
+        if actif:
+            clock.tick(self.FPS_ACTIF)
+            return
+        event = pygame.event.wait(self.ATTENTE_REPOS_MS)
+        if event.type != pygame.NOEVENT:
+            self._evenements.append(event)
+        clock.tick()
+
+
+# ============================================================
+# ===================== CACHE DES TEXTES ======================
+# ============================================================
+
+class CacheTextes:
+    """
+    Cache LRU borné des textes déjà rendus : (texte, police, couleur) -> Surface.
+    Les découpages en lignes (texte, police, largeur) sont mémorisés de la même façon.
+
+    Les Surfaces rendues sont partagées : on les blitte, on ne dessine jamais dessus.
+    """
+
+    def __init__(self, taille_max=1024):
+        self.taille_max = taille_max
+        self._surfaces = OrderedDict()
+        self._lignes = OrderedDict()
+        self.trouves = 0
+        self.manques = 0
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def _lire(self, table, cle):
+        valeur = table.get(cle)
+        if valeur is None:
+            self.manques += 1
+            return None
+        table.move_to_end(cle)
+        self.trouves += 1
+        return valeur
+
+    def _ecrire(self, table, cle, valeur):
+        table[cle] = valeur
+        table.move_to_end(cle)
+        while len(table) > self.taille_max:
+            table.popitem(last=False)
+
+    def rendre(self, police, texte, couleur):
+        cle = (texte, police, couleur)
+        surface = self._lire(self._surfaces, cle)
+        if surface is None:
+            surface = police.render(texte, True, couleur)
+            self._ecrire(self._surfaces, cle, surface)
+        return surface
+
+    def decouper(self, texte, police, largeur_max):
+        """Découpe `texte` en lignes de largeur <= largeur_max (mot à mot)."""
+        cle = (texte, police, largeur_max)
+        lignes = self._lire(self._lignes, cle)
+        if lignes is None:
+            lignes = []
+            cur = ""
+            for w in texte.split(" "):
+                test = (cur + " " + w).strip()
+                if police.size(test)[0] <= largeur_max:
+                    cur = test
+                else:
+                    if cur:
+                        lignes.append(cur)
+                    cur = w
+            if cur:
+                lignes.append(cur)
+            lignes = tuple(lignes)
+            self._ecrire(self._lignes, cle, lignes)
+        return list(lignes)
+
+    def rendre_lignes(self, texte, police, couleur, largeur_max):
+        return [self.rendre(police, ligne, couleur) for ligne in self.decouper(texte, police, largeur_max)]
+
+    def vider(self):
+        self._surfaces.clear()
+        self._lignes.clear()
+
+
+# ============================================================
+# ================== FACES DE CARTES (CACHE) ==================
+# ============================================================
+
+class CompositeurCartes:
+    """
+    Faces de cartes pré-dessinées : clé -> Surface de la taille de la zone joueur.
+
+    Tout ce qui ne bouge pas tant que la carte reste affichée (fond, bordure,
+    image, caractéristiques, descriptif, nom) est dessiné une seule fois ;
+    seul le badge "Cartes: n" est redessiné par-dessus à chaque image.
+
+    contexte(...) : options d'affichage + taille ; s'il change, le cache est vidé.
+    Une face provisoire (dessiner renvoie False, ex. image pas encore disponible)
+    n'est pas gardée : elle est redessinée à l'image suivante.
+    """
+
+    def __init__(self, taille_max=24):
+        self.taille_max = taille_max
+        self._faces = OrderedDict()
+        self._contexte = None
+        self.trouves = 0
+        self.manques = 0
+
+    def __len__(self):
+        return len(self._faces)
+
+    def contexte(self, contexte):
+        if contexte != self._contexte:
+            self._faces.clear()
+            self._contexte = contexte
+
+    def face(self, cle, taille, dessiner):
+        """Face en cache pour `cle`, sinon dessiner(surface) sur une Surface neuve de `taille`."""
+        surface = self._faces.get(cle)
+        if surface is not None:
+            self._faces.move_to_end(cle)
+            self.trouves += 1
+            return surface
+        self.manques += 1
+        surface = pygame.Surface(taille)
+        if dessiner(surface) is False:
+            return surface
+        self._faces[cle] = surface
+        while len(self._faces) > self.taille_max:
+            self._faces.popitem(last=False)
+        return surface
+
+    def vider(self):
+        self._faces.clear()
+
+
+# ============================================================
+# ========= IMAGES : PRÉCHARGEMENT + MINIATURES DISQUE =========
+# ============================================================
+
+# Miniatures déjà redimensionnées, réutilisées d'un lancement à l'autre
+DOSSIER_CACHE_IMAGES = chemin_projet("data", "cache_images")
+VERSION_MINIATURES = 1
+
+
+def _fichier_miniature(source, largeur, hauteur, dossier_cache):
+    """Nom du fichier cache : dépend du fichier source (nom, taille, date de modif) et de la taille cible."""
+    info = os.stat(source)
+    brut = f"{VERSION_MINIATURES}|{Path(source).name}|{info.st_size}|{info.st_mtime_ns}|{largeur}x{hauteur}"
+    return os.path.join(dossier_cache, hashlib.sha1(brut.encode("utf-8")).hexdigest() + ".rgba")
+
+
+def _lire_miniature(fichier):
+    # Format : largeur, hauteur (2 entiers 32 bits) puis les pixels RGBA bruts
+    try:
+        with open(fichier, "rb") as f:
+            donnees = f.read()
+    except OSError:
+        return None
+    if len(donnees) < 8:
+        return None
+    w, h = struct.unpack("<II", donnees[:8])
+    if len(donnees) != 8 + 4 * w * h:
+        return None
+    return pygame.image.frombytes(donnees[8:], (w, h), "RGBA")
+
+
+def _ecrire_miniature(fichier, img):
+    try:
+        os.makedirs(os.path.dirname(fichier), exist_ok=True)
+        temporaire = fichier + f".{os.getpid()}.tmp"
+        with open(temporaire, "wb") as f:
+            f.write(struct.pack("<II", img.get_width(), img.get_height()))
+            f.write(pygame.image.tobytes(img, "RGBA"))
+        os.replace(temporaire, fichier)
+    except OSError:
+        pass
+
+
+def nettoyer_miniatures(dossier_cache, demandes):
+    """
+    Supprime du cache disque les miniatures qu'aucune demande actuelle ne produit
+    (image modifiée ou retirée, autre taille, autre VERSION_MINIATURES), ainsi que
+    les fichiers temporaires abandonnés. Renvoie le nombre de fichiers supprimés.
+    """
+    try:
+        noms = os.listdir(dossier_cache)
+    except OSError:
+        return 0
+
+    attendus = set()
+    for source, largeur, hauteur in demandes:
+        try:
+            attendus.add(os.path.basename(_fichier_miniature(source, largeur, hauteur, dossier_cache)))
+        except OSError:
+            pass  # source absente : ses anciennes miniatures partent aussi
+
+    supprimes = 0
+    for nom in noms:
+        if nom in attendus or not nom.endswith((".rgba", ".tmp")):
+            continue
+        try:
+            os.remove(os.path.join(dossier_cache, nom))
+            supprimes += 1
+        except OSError:
+            pass
+    return supprimes
+
+
+def decoder_image(source):
+    """
+    Image `source` en pleine taille, 32 bits avec alpha : comme convert_alpha(),
+    mais utilisable hors du thread principal. Lève une exception si échec.
+    """
+    img = pygame.image.load(source)
+    rgba = pygame.Surface((img.get_width(), img.get_height()), pygame.SRCALPHA, 32)
+    rgba.blit(img, (0, 0))
+    return rgba
+
+
+def charger_miniature(source, largeur, hauteur, dossier_cache=None, maitre=None):
+    """
+    Image `source` redimensionnée pour tenir dans (largeur, hauteur) en conservant le ratio,
+    ou None si échec. Surface non convertie : utilisable hors du thread principal
+    (convert_alpha() se fait dans la boucle).
+
+    Avec dossier_cache, le résultat est relu tel quel aux lancements suivants
+    (ni décodage JPEG, ni redimensionnement).
+    maitre : fonction qui renvoie l'image décodée de `source`, partagée entre
+    plusieurs tailles ; par défaut on décode le fichier.
+    """
+    try:
+        fichier = None
+        if dossier_cache is not None:
+            fichier = _fichier_miniature(source, largeur, hauteur, dossier_cache)
+            img = _lire_miniature(fichier)
+            if img is not None:
+                return img
+
+        img = maitre() if maitre is not None else decoder_image(source)
+        iw, ih = img.get_width(), img.get_height()
+        if iw <= 0 or ih <= 0:
+            return None
+
+        scale = min(largeur / iw, hauteur / ih)
+        new_w = max(1, int(iw * scale))
+        new_h = max(1, int(ih * scale))
+        img = pygame.transform.smoothscale(img, (new_w, new_h))
+
+        if fichier is not None:
+            _ecrire_miniature(fichier, img)
+        return img
+    except Exception:
+        return None
+
+
+class PrechargeurImages:
+    """
+    Prépare les images du paquet dans un thread à part, pendant l'écran d'accueil :
+    la première apparition d'un animal ne fige plus la fenêtre.
+
+    - lancer(demandes) : [(source, largeur, hauteur), ...] dans l'ordre voulu ; les
+      tailles d'un même fichier qui se suivent partagent un seul décodage
+    - prendre(source, largeur, hauteur, maitre=None) : l'image préparée ; si elle n'a
+      pas encore été commencée, on la charge tout de suite (sans attendre celles d'avant)
+    - nettoyer(demandes) : au démarrage, retire du cache disque les miniatures que
+      ces demandes ne produisent plus (voir nettoyer_miniatures), dans le thread
+    """
+
+    def __init__(self, dossier_cache=None):
+        self.dossier_cache = dossier_cache
+        self._executeur = ThreadPoolExecutor(max_workers=1)
+        self._futurs = {}
+        self._maitre = (None, None)  # (source, image décodée), lu et écrit par le thread seulement
+
+    def restantes(self):
+        return sum(1 for futur in self._futurs.values() if not futur.done())
+
+    def _preparer(self, source, largeur, hauteur):
+        def maitre():
+            if self._maitre[0] != source:
+                self._maitre = (source, decoder_image(source))
+            return self._maitre[1]
+        return charger_miniature(source, largeur, hauteur, self.dossier_cache, maitre)
+
+    def _oublier_maitre(self):
+        self._maitre = (None, None)
+
+    def nettoyer(self, demandes):
+        if self.dossier_cache is not None:
+            self._executeur.submit(nettoyer_miniatures, self.dossier_cache, list(demandes))
+
+    def lancer(self, demandes):
+        for source, largeur, hauteur in demandes:
+            cle = (source, largeur, hauteur)
+            if cle not in self._futurs:
+                self._futurs[cle] = self._executeur.submit(self._preparer, source, largeur, hauteur)
+        self._executeur.submit(self._oublier_maitre)
+
+    def prendre(self, source, largeur, hauteur, maitre=None):
+        futur = self._futurs.pop((source, largeur, hauteur), None)
+        if futur is None or futur.cancel():
+            return charger_miniature(source, largeur, hauteur, self.dossier_cache, maitre)
+        return futur.result()
+
+    def fermer(self):
+        self._executeur.shutdown(wait=False, cancel_futures=True)
+
+
+class CacheImages:
+    """
+    Images prêtes à blitter, bornées en mémoire (octets de pixels) et non en nombre.
+
+    - clé (source,) : l'image "maître" décodée une seule fois par fichier ;
+      clé (source, largeur, hauteur) : une taille, dérivée du maître si besoin
+    - au-delà de budget_octets, on évince les moins récemment utilisées (LRU)
+    - un échec de chargement est retenu duree_echec_s secondes, puis retenté
+    """
+
+    def __init__(self, budget_octets=48 * 2**20, duree_echec_s=30.0, horloge=time.monotonic):
+        self.budget_octets = budget_octets
+        self.duree_echec_s = duree_echec_s
+        self.horloge = horloge
+        self._images = OrderedDict()
+        self._echecs = {}
+        self.octets = 0
+        self.trouves = 0
+        self.manques = 0
+
+    def __len__(self):
+        return len(self._images)
+
+    @staticmethod
+    def octets_image(img):
+        return img.get_pitch() * img.get_height()
+
+    def _lire(self, cle):
+        img = self._images.get(cle)
+        if img is None:
+            self.manques += 1
+            return None
+        self._images.move_to_end(cle)
+        self.trouves += 1
+        return img
+
+    def _ajouter(self, cle, img):
+        self._images[cle] = img
+        self.octets += self.octets_image(img)
+        # on garde toujours au moins la dernière image, même plus grosse que le budget
+        while self.octets > self.budget_octets and len(self._images) > 1:
+            _, ancienne = self._images.popitem(last=False)
+            self.octets -= self.octets_image(ancienne)
+
+    def _echec_recent(self, cle):
+        expire = self._echecs.get(cle)
+        if expire is None:
+            return False
+        if self.horloge() < expire:
+            return True
+        del self._echecs[cle]
+        return False
+
+    def _noter_echec(self, cle):
+        maintenant = self.horloge()
+        for ancienne in [c for c, expire in self._echecs.items() if expire <= maintenant]:
+            del self._echecs[ancienne]
+        self._echecs[cle] = maintenant + self.duree_echec_s
+
+    def maitre(self, source):
+        """Image pleine taille de `source` (décodée au premier appel). Lève une exception si échec."""
+        img = self._lire((source,))
+        if img is None:
+            img = decoder_image(source).convert_alpha()
+            self._ajouter((source,), img)
+        return img
+
+    def image(self, source, largeur, hauteur, prechargeur=None):
+        """Image de `source` à la taille (largeur, hauteur), ou None si échec (récent)."""
+        cle = (source, largeur, hauteur)
+        img = self._lire(cle)
+        if img is not None:
+            return img
+        if self._echec_recent(cle):
+            return None
+
+        maitre = lambda: self.maitre(source)
+        if prechargeur is not None:
+            img = prechargeur.prendre(source, largeur, hauteur, maitre)
+        else:
+            img = charger_miniature(source, largeur, hauteur, None, maitre)
+        try:
+            if img is not None:
+                img = img.convert_alpha()
+        except Exception:
+            img = None
+
+        if img is None:
+            self._noter_echec(cle)
+            return None
+        self._ajouter(cle, img)
+        return img
+
+    def vider(self):
+        self._images.clear()
+        self._echecs.clear()
+        self.octets = 0
+
+
 def run():
     # ============================================================
     # ======================= PYGAME / UI =========================
@@ -65,6 +623,7 @@ def run():
     police_petite = pygame.font.SysFont(FONT_FAMILY, 17)
     police_tres_petite = pygame.font.SysFont(FONT_FAMILY, 14)
     police_desc = pygame.font.SysFont(FONT_FAMILY, 15)
+    police_regles_compacte = pygame.font.SysFont("arial", 18)  # overlays trop longs
 
     # Dimensions layout
     HAUT_H = int(HAUTEUR * 0.15)
@@ -87,7 +646,7 @@ def run():
     SETTINGS = {
         "show_opponent_card": False,  # debug : montre l'adversaire (carte visible)
         "volume": 0.8,               # volume global [0.0, 1.0]
-        "robot_mode": "I"            # robot choisi dans options (A, I, MC_R, MC_M)
+        "robot_mode": "I"            # robot choisi dans options (A, I, MC_R, MC_M, EX)
     }
 
     ROBOT_CHOICES = [
@@ -131,6 +690,18 @@ def run():
         },
     ]
 
+    # Le solveur exact ne tourne que sur un petit paquet : au-delà, ce robot
+    # jouerait exactement comme le robot Monte Carlo Médiane.
+    if len(LISTE_ANIMAUX) <= SEUIL_SOLVEUR_EXACT:
+        ROBOT_CHOICES.append(("EX", "Robot Exact"))
+        ROBOT_HELP_LINES.append({
+            "titre": "Robot Exact",
+            "lignes": [
+                f"Petit paquet ({SEUIL_SOLVEUR_EXACT} cartes max) : calcule la meilleure caractéristique exactement, "
+                "en moyennant tous les mélanges possibles."
+            ]
+        })
+
     def robot_mode_label(code):
         for c, nom in ROBOT_CHOICES:
             if c == code:
@@ -205,6 +776,7 @@ def run():
 
     # Zone carte (dans frame_j1/j2)
     zone_carte = pygame.Rect(20, 20, frame_j1.get_width() - 40, frame_j1.get_height() - 40)
+    TAILLE_IMAGE_CARTE = (zone_carte.width - 20, int(zone_carte.height * 0.48))
 
     # Boutons caractéristiques (dans frame_jeu)
     caracteristiques = [("Poids", "poids"), ("Longueur", "longueur"), ("Longévité", "longevite")]
@@ -282,59 +854,32 @@ def run():
     # ========================= UTILITAIRES =======================
     # ============================================================
 
+    # Textes rendus / découpés une seule fois, puis réutilisés à chaque image
+    textes = CacheTextes()
+
     def wrap_lines(text, font, max_width):
         """Utilitaires pour les textes du menu hamburger"""
-        words = text.split(" ")
-        lines, cur = [], ""
-        for w in words:
-            test = (cur + " " + w).strip()
-            if font.size(test)[0] <= max_width:
-                cur = test
-            else:
-                if cur:
-                    lines.append(cur)
-                cur = w
-        if cur:
-            lines.append(cur)
-        return lines
+        return textes.decouper(text, font, max_width)
 
     # ------------------------------------------------------------
     # Cache images cartes (robuste + performant)
     # ------------------------------------------------------------
-    IMAGES_CACHE = {}
+    IMAGES_CACHE = CacheImages()
+    prechargeur = PrechargeurImages(DOSSIER_CACHE_IMAGES)
 
     def charger_image_carte(path, target_w, target_h):
         """
         Charge et redimensionne une image de carte pour tenir dans (target_w, target_h)
         en conservant le ratio. Retourne une Surface prête à blitter, ou None si échec.
-        Cache interne par (path, target_w, target_h).
+        Cache borné en mémoire (voir CacheImages) ; l'image vient du préchargeur
+        (thread + miniatures sur disque) quand elle est déjà prête.
         """
-        key = (path, target_w, target_h)
-        if key in IMAGES_CACHE:
-            return IMAGES_CACHE[key]
-
-        try:
-            img = pygame.image.load(chemin_projet(*Path(path).parts)).convert_alpha()
-            iw, ih = img.get_width(), img.get_height()
-            if iw <= 0 or ih <= 0:
-                IMAGES_CACHE[key] = None
-                return None
-
-            scale = min(target_w / iw, target_h / ih)
-            new_w = max(1, int(iw * scale))
-            new_h = max(1, int(ih * scale))
-            img_scaled = pygame.transform.smoothscale(img, (new_w, new_h))
-
-            IMAGES_CACHE[key] = img_scaled
-            return img_scaled
-        except Exception:
-            IMAGES_CACHE[key] = None
-            return None
+        return IMAGES_CACHE.image(chemin_projet(*Path(path).parts), target_w, target_h, prechargeur)
 
     def dessiner_bouton(surface, rect, texte, actif=True):
         couleur = BOUTON_ACTIF if actif else BOUTON
         pygame.draw.rect(surface, couleur, rect, border_radius=12)
-        t = police.render(texte, True, NOIR)
+        t = textes.rendre(police, texte, NOIR)
         tx = rect.x + (rect.width - t.get_width()) // 2
         ty = rect.y + (rect.height - t.get_height()) // 2
         surface.blit(t, (tx, ty))
@@ -348,7 +893,7 @@ def run():
         pygame.draw.rect(fenetre, PANEL, box, border_radius=14)
         pygame.draw.rect(fenetre, VERT_NATURE, box, 3, border_radius=14)
 
-        titre = police_menu.render(title, True, BLANC)
+        titre = textes.rendre(police_menu, title, BLANC)
         fenetre.blit(titre, (box.x + 30, box.y + 20))
 
         max_w = box.width - 60
@@ -368,7 +913,7 @@ def run():
 
         max_lines = (box.height - 120) // line_h
         if len(lignes) > max_lines:
-            font_rules = pygame.font.SysFont("arial", 18)
+            font_rules = police_regles_compacte
             line_h = 18
             lignes = []
             for l in lines:
@@ -382,10 +927,10 @@ def run():
 
         max_lines = (box.height - 120) // line_h
         for l in lignes[:max_lines]:
-            fenetre.blit(font_rules.render(l, True, BLANC), (box.x + 30, y_text))
+            fenetre.blit(textes.rendre(font_rules, l, BLANC), (box.x + 30, y_text))
             y_text += line_h
 
-        fermer = police_petite.render("Cliquez dans la fenêtre pour fermer", True, BOUTON_ACTIF)
+        fermer = textes.rendre(police_petite, "Cliquez dans la fenêtre pour fermer", BOUTON_ACTIF)
         fenetre.blit(fermer, (box.x + 30, box.bottom - 35))
 
         return box
@@ -399,28 +944,28 @@ def run():
         pygame.draw.rect(fenetre, PANEL, panel, border_radius=16)
         pygame.draw.rect(fenetre, VERT_NATURE, panel, 3, border_radius=16)
 
-        titre = police_menu.render("Comprendre les robots", True, BLANC)
+        titre = textes.rendre(police_menu, "Comprendre les robots", BLANC)
         fenetre.blit(titre, (panel.x + 28, panel.y + 20))
 
-        card_h = 116
+        card_h = min(116, (panel.height - 118) // len(ROBOT_HELP_LINES) - 10)
         y = panel.y + 78
         for bloc in ROBOT_HELP_LINES:
             card = pygame.Rect(panel.x + 24, y, panel.width - 48, card_h)
             pygame.draw.rect(fenetre, FOND, card, border_radius=12)
             pygame.draw.rect(fenetre, (70, 76, 88), card, width=1, border_radius=12)
 
-            tt = police.render(bloc["titre"], True, BOUTON_ACTIF)
+            tt = textes.rendre(police, bloc["titre"], BOUTON_ACTIF)
             fenetre.blit(tt, (card.x + 14, card.y + 10))
 
             ty = card.y + 42
             for l in bloc["lignes"]:
                 for wl in wrap_lines(l, police_petite, card.width - 24):
-                    fenetre.blit(police_petite.render(wl, True, BLANC), (card.x + 14, ty))
+                    fenetre.blit(textes.rendre(police_petite, wl, BLANC), (card.x + 14, ty))
                     ty += 18
 
             y += card_h + 10
 
-        fermer = police_petite.render("Cliquez dans la fenêtre pour fermer", True, BOUTON_ACTIF)
+        fermer = textes.rendre(police_petite, "Cliquez dans la fenêtre pour fermer", BOUTON_ACTIF)
         fenetre.blit(fermer, (panel.x + 28, panel.bottom - 30))
 
         return panel
@@ -474,17 +1019,17 @@ def run():
 
         total = len(LISTE_ANIMAUX)
         if total == 0:
-            titre = police_menu.render("Animaux", True, BLANC)
+            titre = textes.rendre(police_menu, "Animaux", BLANC)
             fenetre.blit(titre, (panel.x + 30, panel.y + 24))
-            fenetre.blit(police.render("Aucune donnée animale disponible.", True, BLANC), (panel.x + 30, panel.y + 90))
+            fenetre.blit(textes.rendre(police, "Aucune donnée animale disponible.", BLANC), (panel.x + 30, panel.y + 90))
             return panel, prev_rect, next_rect
 
         animal = LISTE_ANIMAUX[idx_animal % total]
 
-        titre = police_menu.render("Découvrir les animaux", True, BLANC)
+        titre = textes.rendre(police_menu, "Découvrir les animaux", BLANC)
         fenetre.blit(titre, (panel.x + 30, panel.y + 24))
 
-        compteur = police.render(f"{(idx_animal % total) + 1} / {total}", True, BOUTON_ACTIF)
+        compteur = textes.rendre(police, f"{(idx_animal % total) + 1} / {total}", BOUTON_ACTIF)
         fenetre.blit(compteur, (panel.right - compteur.get_width() - 30, panel.y + 30))
 
         pygame.draw.rect(fenetre, CARTE_COL, img_rect, border_radius=12)
@@ -507,16 +1052,16 @@ def run():
             fenetre.blit(couche, zone_img.topleft)
             pygame.draw.rect(fenetre, NOIR, zone_img, width=1, border_radius=18)
         else:
-            fenetre.blit(police.render("Image introuvable", True, NOIR), (img_rect.x + 20, img_rect.y + 20))
+            fenetre.blit(textes.rendre(police, "Image introuvable", NOIR), (img_rect.x + 20, img_rect.y + 20))
 
         pygame.draw.rect(fenetre, (255, 255, 255, 92), stats_rect, border_radius=10)
         pygame.draw.rect(fenetre, NOIR, stats_rect, width=1, border_radius=10)
 
         nom = _nom_affiche_animal(animal.nom)
-        fenetre.blit(police_menu.render(nom, True, NOIR), (stats_rect.x + 12, stats_rect.y + 14))
-        fenetre.blit(police.render(f"Poids : {animal.poids}", True, NOIR), (stats_rect.x + 12, stats_rect.y + 64))
-        fenetre.blit(police.render(f"Longueur : {animal.longueur}", True, NOIR), (stats_rect.x + 12, stats_rect.y + 98))
-        fenetre.blit(police.render(f"Longévité : {animal.longevite}", True, NOIR), (stats_rect.x + 12, stats_rect.y + 132))
+        fenetre.blit(textes.rendre(police_menu, nom, NOIR), (stats_rect.x + 12, stats_rect.y + 14))
+        fenetre.blit(textes.rendre(police, f"Poids : {animal.poids}", NOIR), (stats_rect.x + 12, stats_rect.y + 64))
+        fenetre.blit(textes.rendre(police, f"Longueur : {animal.longueur}", NOIR), (stats_rect.x + 12, stats_rect.y + 98))
+        fenetre.blit(textes.rendre(police, f"Longévité : {animal.longevite}", NOIR), (stats_rect.x + 12, stats_rect.y + 132))
 
         pygame.draw.rect(fenetre, (255, 255, 255, 80), desc_rect, border_radius=10)
         pygame.draw.rect(fenetre, NOIR, desc_rect, width=1, border_radius=10)
@@ -524,13 +1069,13 @@ def run():
         y = desc_rect.y + 10
         max_lines = max(6, (desc_rect.height - 14) // 18)
         for line in wrap_lines(getattr(animal, "descriptif", ""), police_desc, desc_rect.width - 16)[:max_lines]:
-            fenetre.blit(police_desc.render(line, True, NOIR), (desc_rect.x + 8, y))
+            fenetre.blit(textes.rendre(police_desc, line, NOIR), (desc_rect.x + 8, y))
             y += 18
 
         dessiner_bouton(fenetre, prev_rect, "Precedent", actif=False)
         dessiner_bouton(fenetre, next_rect, "Suivant", actif=True)
 
-        hint = police_petite.render("Cliquez hors du panneau pour fermer", True, BOUTON_ACTIF)
+        hint = textes.rendre(police_petite, "Cliquez hors du panneau pour fermer", BOUTON_ACTIF)
         fenetre.blit(hint, (panel.x + 30, panel.bottom - 18))
 
         return panel, prev_rect, next_rect
@@ -545,49 +1090,49 @@ def run():
         pygame.draw.rect(fenetre, PANEL, panel, border_radius=16)
         pygame.draw.rect(fenetre, VERT_NATURE, panel, 3, border_radius=16)
 
-        titre = police_menu.render("Options", True, BLANC)
+        titre = textes.rendre(police_menu, "Options", BLANC)
         fenetre.blit(titre, (panel.x + 30, panel.y + 25))
 
         # Toggle carte adverse (debug)
         pygame.draw.rect(fenetre, FOND, toggle_rect, border_radius=12)
         label = "Afficher la carte adverse (debug)"
         val = "ON" if SETTINGS.get("show_opponent_card", True) else "OFF"
-        t1 = police.render(label, True, BLANC)
-        t2 = police.render(val, True, BOUTON_ACTIF)
+        t1 = textes.rendre(police, label, BLANC)
+        t2 = textes.rendre(police, val, BOUTON_ACTIF)
         fenetre.blit(t1, (toggle_rect.x + 14, toggle_rect.y + 14))
         fenetre.blit(t2, (toggle_rect.right - t2.get_width() - 14, toggle_rect.y + 14))
 
         # Choix du robot pour le mode Joueur vs Robot
         pygame.draw.rect(fenetre, FOND, robot_rect, border_radius=12)
         robot_label = robot_mode_label(SETTINGS.get("robot_mode", "I"))
-        tr1 = police.render("Robot utilisé en mode Joueur vs Robot", True, BLANC)
-        tr2 = police_menu_lateral.render(robot_label, True, BOUTON_ACTIF)
+        tr1 = textes.rendre(police, "Robot utilisé en mode Joueur vs Robot", BLANC)
+        tr2 = textes.rendre(police_menu_lateral, robot_label, BOUTON_ACTIF)
         fenetre.blit(tr1, (robot_rect.x + 14, robot_rect.y + 10))
         fenetre.blit(tr2, (robot_rect.x + 14, robot_rect.y + 42))
-        indic = police_petite.render("Clique pour changer", True, BLANC)
+        indic = textes.rendre(police_petite, "Clique pour changer", BLANC)
         fenetre.blit(indic, (robot_rect.right - indic.get_width() - 12, robot_rect.y + 30))
 
         # Volume
         vol = clamp01(SETTINGS.get("volume", 0.8))
         vol_pct = int(round(vol * 100))
 
-        tvol = police.render("Volume sons", True, BLANC)
+        tvol = textes.rendre(police, "Volume sons", BLANC)
         fenetre.blit(tvol, (panel.x + 34, panel.y + 294))
 
         pygame.draw.rect(fenetre, BOUTON, minus_rect, border_radius=12)
         pygame.draw.rect(fenetre, BOUTON, plus_rect, border_radius=12)
-        fenetre.blit(police_menu.render("-", True, NOIR), (minus_rect.x + 18, minus_rect.y + 4))
-        fenetre.blit(police_menu.render("+", True, NOIR), (plus_rect.x + 16, plus_rect.y + 2))
+        fenetre.blit(textes.rendre(police_menu, "-", NOIR), (minus_rect.x + 18, minus_rect.y + 4))
+        fenetre.blit(textes.rendre(police_menu, "+", NOIR), (plus_rect.x + 16, plus_rect.y + 2))
 
         pygame.draw.rect(fenetre, FOND, bar_rect, border_radius=10)
         fill_w = int(bar_rect.width * vol)
         fill_rect = pygame.Rect(bar_rect.x, bar_rect.y, fill_w, bar_rect.height)
         pygame.draw.rect(fenetre, BOUTON_ACTIF, fill_rect, border_radius=10)
 
-        tv = police.render(f"{vol_pct} %", True, BLANC)
+        tv = textes.rendre(police, f"{vol_pct} %", BLANC)
         fenetre.blit(tv, (bar_rect.centerx - tv.get_width() // 2, bar_rect.y - 2))
 
-        hint = police_petite.render("Cliquez hors du panneau pour fermer", True, BOUTON_ACTIF)
+        hint = textes.rendre(police_petite, "Cliquez hors du panneau pour fermer", BOUTON_ACTIF)
         fenetre.blit(hint, (panel.x + 30, panel.bottom - 30))
 
         return panel, toggle_rect, robot_rect, minus_rect, plus_rect, bar_rect
@@ -609,7 +1154,7 @@ def run():
         pygame.draw.rect(surface, FOND, box, border_radius=12)
         pygame.draw.rect(surface, VERT_NATURE, box, 2, border_radius=12)
 
-        titre = police_petite.render("Historique (5)", True, BLANC)
+        titre = textes.rendre(police_petite, "Historique (5)", BLANC)
         surface.blit(titre, (box.x + 10, box.y + 10))
 
         # dernières entrées
@@ -639,7 +1184,7 @@ def run():
                 y += 10
                 continue
             for ll in wrap_lines(l, police_petite, max_w):
-                surface.blit(police_petite.render(ll, True, BLANC), (box.x + 10, y))
+                surface.blit(textes.rendre(police_petite, ll, BLANC), (box.x + 10, y))
                 y += 18
             if y > box.bottom - 12:
                 break
@@ -653,6 +1198,7 @@ def run():
     UI_ANIM = "ANIM"      # animation fin de manche
     UI_RESULT = "RESULT"  # résultat + clic pour continuer
     UI_END = "END"        # écran victoire dédié
+    UI_ROBOT = "ROBOT"    # AJOUT : le robot réfléchit (calcul en arrière-plan)
 
     ui_state = UI_START
     game = None
@@ -728,7 +1274,9 @@ def run():
         nonlocal ui_state
         ui_state = UI_END
 
-    # Robot auto
+    # Robot auto (AJOUT : le choix est calculé en arrière-plan, la boucle se contente de l'attendre)
+    robot_thread = RobotEnArrierePlan()
+
     def robot_joue_si_besoin():
         nonlocal message_ui, ui_state, game
 
@@ -740,25 +1288,22 @@ def run():
             return
 
         if ui_state == UI_PLAY and game.actif_est_robot():
-            play(S_CLICK, 0.6)
-
             carte = game.joueur_actif.carte_visible()
             if carte is None:
                 ui_state_to_end()
                 return
 
-            mode_robot = game.mode_robot
-            if mode_robot == "A":
-                car = choix_robot_aleatoire()
-            elif mode_robot == "I":
-                car = choix_robot_intelligent(carte, game.historique_cartes)
-            elif mode_robot == "MC_R":
-                car = choix_robot_monte_carlo_random(game, essais=20)
-            elif mode_robot == "MC_M":
-                car = choix_robot_monte_carlo_median(game, essais=20)
-            else:
-                car = choix_robot_intelligent(carte, game.historique_cartes)
+            robot_thread.lancer(game)
+            ui_state = UI_ROBOT
+            message_ui = "Le robot réfléchit…"
+            return
+
+        if ui_state == UI_ROBOT:
+            car = robot_thread.resultat(game)
+            if car is None:
+                return
 
+            play(S_CLICK, 0.6)
             game.appliquer_manche(car)
 
             label = {"poids": "Poids", "longueur": "Longueur", "longevite": "Longévité"}[car]
@@ -772,11 +1317,65 @@ def run():
     clock = pygame.time.Clock()
     running = True
 
+    # Zones de la fenêtre : seules celles qui ont changé sont redessinées et poussées à l'écran
+    ordonnanceur = OrdonnanceurAffichage({
+        "haut": pygame.Rect(0, 0, LARGEUR, HAUT_H),
+        "gauche": pygame.Rect(0, HAUT_H, GAUCHE_W, HAUTEUR - HAUT_H),
+        "jeu": pygame.Rect(GAUCHE_W, HAUT_H, LARGEUR - GAUCHE_W, HAUTEUR - HAUT_H),
+        "overlays": pygame.Rect(0, 0, LARGEUR, HAUTEUR),
+    })
+
+    def signature_partie():
+        if game is None:
+            return None
+        return (
+            id(game),
+            game.joueurs.index(game.joueur_actif),
+            len(getattr(game, "historique_manches", [])),
+            tuple((len(j.cartes), id(j.carte_visible())) for j in game.joueurs),
+            game.terminee,
+        )
+
+    def boucle_active():
+        # 60 FPS seulement pendant une animation ou si le choix du robot attend d'être joué.
+        # Pendant que le robot réfléchit, on dort : EVENEMENT_ROBOT réveille la boucle.
+        return ui_state == UI_ANIM or robot_thread.pret()
+
     # ============================================================
     # ======================== DRAW CARD =========================
     # ============================================================
 
+    # Faces de cartes déjà composées (le badge du nombre de cartes est ajouté à chaque image)
+    faces_cartes = CompositeurCartes()
+
     def draw_card(surface, joueur, est_actif, highlight=False):
+        carte = joueur.carte_visible()
+        adverse = game is not None and joueur is not game.joueur_actif
+        cacher_adverse = adverse and not SETTINGS.get("show_opponent_card", True)
+        debug_adverse = adverse and SETTINGS.get("show_opponent_card", True)
+
+        faces_cartes.contexte((surface.get_size(), SETTINGS.get("show_opponent_card", True)))
+        cle = (joueur.nom, carte, est_actif, highlight, cacher_adverse, debug_adverse)
+        face = faces_cartes.face(
+            cle,
+            surface.get_size(),
+            lambda s: dessiner_face_carte(s, joueur.nom, carte, est_actif, highlight, cacher_adverse, debug_adverse),
+        )
+        surface.blit(face, (0, 0))
+
+        # badge nombre de cartes (fixe, lisible et discret)
+        badge_w, badge_h = 110, 24
+        badge_rect = pygame.Rect(zone_carte.right - badge_w - 8, zone_carte.y + 4, badge_w, badge_h)
+        pygame.draw.rect(surface, (22, 26, 32), badge_rect, border_radius=8)
+        pygame.draw.rect(surface, BOUTON_ACTIF, badge_rect, width=1, border_radius=8)
+        txt_count = textes.rendre(police_tres_petite, f"Cartes: {len(joueur.cartes)}", BLANC)
+        surface.blit(txt_count, (badge_rect.x + 10, badge_rect.y + 5))
+
+    def dessiner_face_carte(surface, nom_joueur, carte, est_actif, highlight, cacher_adverse, debug_adverse):
+        """Dessine la face ; renvoie False si l'image manque (face provisoire, pas mise en cache)."""
+        image_ok = True
+        surface.fill(PANEL)
+
         # base
         pygame.draw.rect(surface, CARTE_COL, zone_carte, border_radius=14)
 
@@ -786,44 +1385,28 @@ def run():
         elif est_actif:
             pygame.draw.rect(surface, BOUTON_ACTIF, zone_carte, width=3, border_radius=14)
 
-        # badge nombre de cartes (fixe, lisible et discret)
-        badge_w, badge_h = 110, 24
-        badge_rect = pygame.Rect(zone_carte.right - badge_w - 8, zone_carte.y + 4, badge_w, badge_h)
-        pygame.draw.rect(surface, (22, 26, 32), badge_rect, border_radius=8)
-        pygame.draw.rect(surface, BOUTON_ACTIF, badge_rect, width=1, border_radius=8)
-        txt_count = police_tres_petite.render(f"Cartes: {len(joueur.cartes)}", True, BLANC)
-        surface.blit(txt_count, (badge_rect.x + 10, badge_rect.y + 5))
-
-        carte = joueur.carte_visible()
         if carte is None:
-            name = police.render(joueur.nom, True, NOIR)
+            name = textes.rendre(police, nom_joueur, NOIR)
             surface.blit(name, (30, 28))
-            surface.blit(police.render("Plus de cartes", True, NOIR), (30, 120))
-            return
+            surface.blit(textes.rendre(police, "Plus de cartes", NOIR), (30, 120))
+            return True
 
         # Layout interne de la carte :
         # - image en haut
         # - caractéristiques au milieu
         # - descriptif en bas
-        img_rect = pygame.Rect(zone_carte.x + 10, zone_carte.y + 36, zone_carte.width - 20, int(zone_carte.height * 0.48))
+        img_rect = pygame.Rect(zone_carte.x + 10, zone_carte.y + 36, *TAILLE_IMAGE_CARTE)
         stats_rect = pygame.Rect(zone_carte.x + 10, img_rect.bottom + 8, zone_carte.width - 20, 78)
         desc_rect = pygame.Rect(zone_carte.x + 10, stats_rect.bottom + 8, zone_carte.width - 20, zone_carte.bottom - (stats_rect.bottom + 16))
 
         # ---------------------------------------------------------
         # Affichage image : carte adverse éventuellement cachée
         # ---------------------------------------------------------
-        cacher_adverse = False
-        try:
-            if game is not None and joueur is not game.joueur_actif and not SETTINGS.get("show_opponent_card", True):
-                cacher_adverse = True
-        except Exception:
-            cacher_adverse = False
-
         if cacher_adverse:
             # dos de carte simple (aucun asset requis)
             pygame.draw.rect(surface, (180, 170, 150), img_rect, border_radius=10)
             pygame.draw.rect(surface, NOIR, img_rect, width=3, border_radius=10)
-            txt1 = police.render("Carte cachée", True, NOIR)
+            txt1 = textes.rendre(police, "Carte cachée", NOIR)
             surface.blit(txt1, (img_rect.centerx - txt1.get_width() // 2, img_rect.centery - 15))
         else:
             img = charger_image_carte(carte.path_image, img_rect.width, img_rect.height)
@@ -833,11 +1416,12 @@ def run():
                 r.center = img_rect.center
                 surface.blit(img, r.topleft)
             else:
+                image_ok = False
                 pygame.draw.rect(surface, CARTE_COL, img_rect, border_radius=10)
                 pygame.draw.rect(surface, NOIR, img_rect, width=2, border_radius=10)
-                surface.blit(police.render(joueur.nom, True, NOIR), (30, 28))
-                surface.blit(police.render(carte.nom, True, NOIR), (30, 62))
-                surface.blit(police.render("Image introuvable", True, NOIR), (30, 120))
+                surface.blit(textes.rendre(police, nom_joueur, NOIR), (30, 28))
+                surface.blit(textes.rendre(police, carte.nom, NOIR), (30, 62))
+                surface.blit(textes.rendre(police, "Image introuvable", NOIR), (30, 120))
 
         # bloc caractéristiques
         pygame.draw.rect(surface, (255, 255, 255, 90), stats_rect, border_radius=10)
@@ -848,12 +1432,12 @@ def run():
         pygame.draw.rect(surface, NOIR, desc_rect, width=1, border_radius=10)
 
         if cacher_adverse:
-            surface.blit(police_petite.render("Caractéristiques cachées", True, NOIR), (stats_rect.x + 10, stats_rect.y + 26))
-            surface.blit(police_desc.render("Descriptif caché", True, NOIR), (desc_rect.x + 10, desc_rect.y + 10))
+            surface.blit(textes.rendre(police_petite, "Caractéristiques cachées", NOIR), (stats_rect.x + 10, stats_rect.y + 26))
+            surface.blit(textes.rendre(police_desc, "Descriptif caché", NOIR), (desc_rect.x + 10, desc_rect.y + 10))
         else:
-            txt_p = police_petite.render(f"Poids : {carte.poids}", True, NOIR)
-            txt_l = police_petite.render(f"Longueur : {carte.longueur}", True, NOIR)
-            txt_lo = police_petite.render(f"Longévité : {carte.longevite}", True, NOIR)
+            txt_p = textes.rendre(police_petite, f"Poids : {carte.poids}", NOIR)
+            txt_l = textes.rendre(police_petite, f"Longueur : {carte.longueur}", NOIR)
+            txt_lo = textes.rendre(police_petite, f"Longévité : {carte.longevite}", NOIR)
             surface.blit(txt_p, (stats_rect.x + 10, stats_rect.y + 8))
             surface.blit(txt_l, (stats_rect.x + 10, stats_rect.y + 30))
             surface.blit(txt_lo, (stats_rect.x + 10, stats_rect.y + 52))
@@ -862,33 +1446,38 @@ def run():
             y_desc = desc_rect.y + 8
             max_desc_lines = max(4, (desc_rect.height - 10) // 16)
             for line in wrap_lines(desc, police_desc, desc_rect.width - 14)[:max_desc_lines]:
-                surface.blit(police_desc.render(line, True, NOIR), (desc_rect.x + 7, y_desc))
+                surface.blit(textes.rendre(police_desc, line, NOIR), (desc_rect.x + 7, y_desc))
                 y_desc += 16
 
         # Nom du joueur (sans bandeau de fond)
-        surface.blit(police_petite.render(joueur.nom, True, BLANC), (zone_carte.x + 10, zone_carte.y + 6))
+        surface.blit(textes.rendre(police_petite, nom_joueur, BLANC), (zone_carte.x + 10, zone_carte.y + 6))
 
         # Message debug uniquement sur la carte adverse quand elle est visible
-        try:
-            if (game is not None and joueur is not game.joueur_actif
-                and SETTINGS.get("show_opponent_card", True)):
-                dbg = police_petite.render("(Mode debug : en vrai on ne voit pas la carte)", True, BOUTON_ACTIF)
-                dbg_bg = pygame.Surface((dbg.get_width() + 12, dbg.get_height() + 6), pygame.SRCALPHA)
-                dbg_bg.fill((0, 0, 0, 140))
-                surface.blit(dbg_bg, (zone_carte.x + 10, zone_carte.y + 36))
-                surface.blit(dbg, (zone_carte.x + 16, zone_carte.y + 39))
-        except Exception:
-            pass
-
+        if debug_adverse:
+            dbg = textes.rendre(police_petite, "(Mode debug : en vrai on ne voit pas la carte)", BOUTON_ACTIF)
+            dbg_bg = pygame.Surface((dbg.get_width() + 12, dbg.get_height() + 6), pygame.SRCALPHA)
+            dbg_bg.fill((0, 0, 0, 140))
+            surface.blit(dbg_bg, (zone_carte.x + 10, zone_carte.y + 36))
+            surface.blit(dbg, (zone_carte.x + 16, zone_carte.y + 39))
+
+        return image_ok
+
+    # Préchargement des images pendant l'écran d'accueil (carte + onglet Animaux, fichier par fichier)
+    _, img_rect_animaux, _, _, _, _ = layout_animaux_panel()
+    tailles_images = [TAILLE_IMAGE_CARTE, (img_rect_animaux.width - 12, img_rect_animaux.height - 12)]
+    demandes_images = [
+        (chemin_projet(*Path(animal.path_image).parts), w, h)
+        for animal in LISTE_ANIMAUX
+        for w, h in tailles_images
+    ]
+    prechargeur.nettoyer(demandes_images)
+    prechargeur.lancer(demandes_images)
 
     # ============================================================
     # ============================ BOUCLE =========================
     # ============================================================
 
     while running:
-        # robot joue automatiquement si besoin
-        robot_joue_si_besoin()
-
         # fin animation -> basculer vers RESULT ou END
         if ui_state == UI_ANIM:
             if pygame.time.get_ticks() - anim_start_ms >= ANIM_DUREE_MS:
@@ -897,7 +1486,7 @@ def run():
                 else:
                     ui_state = UI_RESULT
 
-        for event in pygame.event.get():
+        for event in ordonnanceur.evenements():
             if event.type == pygame.QUIT:
                 running = False
 
@@ -1024,6 +1613,7 @@ def run():
                                 elif opt == "Options":
                                     afficher_options = True
                                 elif opt == "Rejouer":
+                                    robot_thread.annuler()
                                     ui_state = UI_START
                                     game = None
                                     message_ui = ""
@@ -1073,6 +1663,7 @@ def run():
                     panel = layout_victory_panel()
                     if victory_replay_rect.collidepoint(x, y):
                         play(S_CLICK, 0.7)
+                        robot_thread.annuler()
                         ui_state = UI_START
                         game = None
                         message_ui = ""
@@ -1096,61 +1687,87 @@ def run():
                             start_round_animation()
                             break
 
+        # robot joue automatiquement si besoin (après les événements : un clic qui
+        # lui donne la main le lance tout de suite, sans attendre le prochain réveil)
+        robot_joue_si_besoin()
+
         # ============================================================
         # ========================= AFFICHAGE =========================
         # ============================================================
 
-        fenetre.fill(FOND)
-
-        frame_haut.fill(VERT_NATURE)
-        frame_gauche.fill(PANEL)
-        frame_jeu.fill(PANEL)
-        frame_j1.fill(PANEL)
-        frame_j2.fill(PANEL)
-
-        # Titre
-        texte_titre = police_titre.render("Défi Nature", True, BLANC)
-        frame_haut.blit(texte_titre, (LARGEUR // 2 - texte_titre.get_width() // 2, 20))
-
-        # Hamburger
-        pygame.draw.rect(frame_haut, PANEL, bouton_menu, border_radius=8)
-        icone = police_menu.render("≡" if not menu_ouvert else "×", True, BLANC)
-        frame_haut.blit(icone, (bouton_menu.x + 13, bouton_menu.y + 4))
-
-        # Menu gauche
-        if menu_ouvert:
-            for i, rect in enumerate(option_rects):
-                pygame.draw.rect(frame_gauche, FOND, rect, border_radius=12)
-                txt = police_menu_lateral.render(options[i], True, BLANC)
-                frame_gauche.blit(txt, (rect.x + 14, rect.y + (rect.height - txt.get_height()) // 2))
-        else:
-            # AJOUT : Historique (quand menu fermé) pour ne pas chevaucher
-            if ui_state != UI_START and game is not None:
-                draw_history_panel(frame_gauche, game)
+        if ui_state == UI_END and game is not None and game.terminee and (not victory_sound_played):
+            play(S_VICTORY, 0.9)
+            victory_sound_played = True
+
+        # Chaque zone résume ce qu'elle affiche ; rien n'a changé -> rien à redessiner
+        ordonnanceur.signaler("haut", (menu_ouvert,))
+        ordonnanceur.signaler("gauche", (menu_ouvert, ui_state == UI_START, signature_partie()))
+        ordonnanceur.signaler("jeu", (
+            ui_state, prenom, prenom_actif, message_ui, anim_winner_index,
+            SETTINGS.get("show_opponent_card", True), SETTINGS.get("robot_mode", "I"), signature_partie(),
+        ))
+        overlay_visible = (afficher_regles or afficher_apropos or afficher_robots or afficher_options
+                           or afficher_animaux or ui_state == UI_END)
+        ordonnanceur.signaler("overlays", (
+            afficher_regles, afficher_apropos, afficher_robots, afficher_options, afficher_animaux,
+            index_animal, clamp01(SETTINGS.get("volume", 0.8)), ui_state == UI_END,
+        ))
+        ordonnanceur.recouvrir("overlays", overlay_visible)
+
+        if not ordonnanceur.a_redessiner():
+            ordonnanceur.attendre(clock, boucle_active())
+            continue
+
+        if ordonnanceur.est_sale("haut"):
+            frame_haut.fill(VERT_NATURE)
+
+            # Titre
+            texte_titre = textes.rendre(police_titre, "Défi Nature", BLANC)
+            frame_haut.blit(texte_titre, (LARGEUR // 2 - texte_titre.get_width() // 2, 20))
+
+            # Hamburger
+            pygame.draw.rect(frame_haut, PANEL, bouton_menu, border_radius=8)
+            icone = textes.rendre(police_menu, "≡" if not menu_ouvert else "×", BLANC)
+            frame_haut.blit(icone, (bouton_menu.x + 13, bouton_menu.y + 4))
+            fenetre.blit(frame_haut, (0, 0))
+
+        if ordonnanceur.est_sale("gauche"):
+            frame_gauche.fill(PANEL)
+
+            # Menu gauche
+            if menu_ouvert:
+                for i, rect in enumerate(option_rects):
+                    pygame.draw.rect(frame_gauche, FOND, rect, border_radius=12)
+                    txt = textes.rendre(police_menu_lateral, options[i], BLANC)
+                    frame_gauche.blit(txt, (rect.x + 14, rect.y + (rect.height - txt.get_height()) // 2))
+            else:
+                # AJOUT : Historique (quand menu fermé) pour ne pas chevaucher
+                if ui_state != UI_START and game is not None:
+                    draw_history_panel(frame_gauche, game)
+            fenetre.blit(frame_gauche, (0, HAUT_H))
 
         # START
-        if ui_state == UI_START:
+        if ui_state == UI_START and ordonnanceur.est_sale("jeu"):
             box = layout_start()
 
-            fenetre.blit(frame_haut, (0, 0))
-            fenetre.blit(frame_gauche, (0, HAUT_H))
+            frame_jeu.fill(PANEL)
             fenetre.blit(frame_jeu, (GAUCHE_W, HAUT_H))
 
             pygame.draw.rect(fenetre, PANEL, box, border_radius=16)
             pygame.draw.rect(fenetre, VERT_NATURE, box, width=3, border_radius=16)
 
-            titre = police_menu.render("Choisis un mode", True, BLANC)
+            titre = textes.rendre(police_menu, "Choisis un mode", BLANC)
             fenetre.blit(titre, (box.x + 70, box.y + 30))
 
             # Bloc robot à droite (évite le chevauchement avec le prénom)
             pygame.draw.rect(fenetre, FOND, robot_info_rect, border_radius=12)
             pygame.draw.rect(fenetre, VERT_NATURE, robot_info_rect, width=2, border_radius=12)
-            rt1 = police_petite.render("Robot sélectionné", True, BLANC)
-            rt2 = police.render(robot_mode_label(SETTINGS.get("robot_mode", "I")), True, BOUTON_ACTIF)
+            rt1 = textes.rendre(police_petite, "Robot sélectionné", BLANC)
+            rt2 = textes.rendre(police, robot_mode_label(SETTINGS.get("robot_mode", "I")), BOUTON_ACTIF)
             fenetre.blit(rt1, (robot_info_rect.x + 14, robot_info_rect.y + 10))
             fenetre.blit(rt2, (robot_info_rect.x + 14, robot_info_rect.y + 34))
 
-            lab = police.render("Ton prénom :", True, BLANC)
+            lab = textes.rendre(police, "Ton prénom :", BLANC)
             fenetre.blit(lab, (input_rect.x, input_rect.y - 36))
 
             pygame.draw.rect(fenetre, CARTE_COL, input_rect, border_radius=12)
@@ -1161,18 +1778,20 @@ def run():
                 width=2,
                 border_radius=12
             )
-            fenetre.blit(police.render(prenom, True, NOIR), (input_rect.x + 12, input_rect.y + 12))
+            fenetre.blit(textes.rendre(police, prenom, NOIR), (input_rect.x + 12, input_rect.y + 12))
 
             pygame.draw.rect(fenetre, BOUTON, clear_rect, border_radius=12)
-            fenetre.blit(police_menu.render("×", True, NOIR), (clear_rect.x + 14, clear_rect.y + 4))
+            fenetre.blit(textes.rendre(police_menu, "×", NOIR), (clear_rect.x + 14, clear_rect.y + 4))
 
             for label, mode, rect in start_buttons:
                 dessiner_bouton(fenetre, rect, label, actif=True)
 
-            hint = police_petite.render("Menu ≡ : Rejouer / Options / Règles / Animaux / Robots / À propos / Quitter", True, BLANC)
+            hint = textes.rendre(police_petite, "Menu ≡ : Rejouer / Options / Règles / Animaux / Robots / À propos / Quitter", BLANC)
             fenetre.blit(hint, (box.x + 70, box.bottom - 30))
 
-        else:
+        elif ordonnanceur.est_sale("jeu"):
+            frame_jeu.fill(PANEL)
+
             # Jeu : cartes + boutons
             if game is not None:
                 est_actif_j1 = (game.joueur_actif is game.joueurs[0])
@@ -1192,7 +1811,7 @@ def run():
                 info = f"Tour de : {game.joueur_actif.nom}"
                 if game.actif_est_robot():
                     info += " (Robot)"
-                txt_info = police.render(info, True, BLANC)
+                txt_info = textes.rendre(police, info, BLANC)
                 frame_jeu.blit(txt_info, (tour_bar_rect.x + 14, tour_bar_rect.y + 6))
 
                 # Boutons carac : désactivés pendant ANIM/RESULT/END ou robot
@@ -1200,23 +1819,21 @@ def run():
                 for label, key, rect in boutons_carac:
                     couleur = BOUTON_ACTIF if boutons_actifs else BOUTON
                     pygame.draw.rect(frame_jeu, couleur, rect, border_radius=10)
-                    t = police.render(label, True, NOIR)
+                    t = textes.rendre(police, label, NOIR)
                     tx = rect.x + (rect.width - t.get_width()) // 2
                     ty = rect.y + (rect.height - t.get_height()) // 2
                     frame_jeu.blit(t, (tx, ty))
 
                 # Message
                 if message_ui:
-                    txt_msg = police_petite.render(message_ui, True, BLANC)
+                    txt_msg = textes.rendre(police_petite, message_ui, BLANC)
                     frame_jeu.blit(txt_msg, (20, frame_jeu.get_height() - 20))
 
                 if ui_state == UI_RESULT:
-                    txt = police_petite.render("Clique pour continuer…", True, BOUTON_ACTIF)
+                    txt = textes.rendre(police_petite, "Clique pour continuer…", BOUTON_ACTIF)
                     frame_jeu.blit(txt, (frame_jeu.get_width() - 210, frame_jeu.get_height() - 20))
 
             # blit principal
-            fenetre.blit(frame_haut, (0, 0))
-            fenetre.blit(frame_gauche, (0, HAUT_H))
             fenetre.blit(frame_jeu, (GAUCHE_W, HAUT_H))
 
         # ===================== OVERLAYS =====================
@@ -1237,12 +1854,6 @@ def run():
 
         # ===================== ECRAN VICTOIRE DEDIE =====================
         if ui_state == UI_END:
-            nonlocal_victory_sound_played = False  # placeholder to keep structure
-            # (On garde exactement la logique existante ci-dessous)
-            if game is not None and game.terminee and (not victory_sound_played):
-                play(S_VICTORY, 0.9)
-                victory_sound_played = True
-
             overlay = pygame.Surface((LARGEUR, HAUTEUR), pygame.SRCALPHA)
             overlay.fill((0, 0, 0, 180))
             fenetre.blit(overlay, (0, 0))
@@ -1251,31 +1862,33 @@ def run():
             pygame.draw.rect(fenetre, PANEL, panel, border_radius=18)
             pygame.draw.rect(fenetre, VERT_NATURE, panel, 3, border_radius=18)
 
-            titre = police_menu.render("Victoire !", True, BLANC)
+            titre = textes.rendre(police_menu, "Victoire !", BLANC)
             fenetre.blit(titre, (panel.x + 30, panel.y + 25))
 
             if game is not None and game.gagnant is not None:
                 msg = f"{game.gagnant.nom} a gagné la partie"
-                tmsg = police.render(msg, True, BOUTON_ACTIF)
+                tmsg = textes.rendre(police, msg, BOUTON_ACTIF)
                 fenetre.blit(tmsg, (panel.x + 30, panel.y + 80))
 
                 j1, j2 = game.joueurs[0], game.joueurs[1]
-                s1 = police.render(f"{j1.nom} : {len(j1.cartes)} cartes", True, BLANC)
-                s2 = police.render(f"{j2.nom} : {len(j2.cartes)} cartes", True, BLANC)
+                s1 = textes.rendre(police, f"{j1.nom} : {len(j1.cartes)} cartes", BLANC)
+                s2 = textes.rendre(police, f"{j2.nom} : {len(j2.cartes)} cartes", BLANC)
                 fenetre.blit(s1, (panel.x + 30, panel.y + 125))
                 fenetre.blit(s2, (panel.x + 30, panel.y + 155))
             else:
-                tmsg = police.render("Partie terminée", True, BOUTON_ACTIF)
+                tmsg = textes.rendre(police, "Partie terminée", BOUTON_ACTIF)
                 fenetre.blit(tmsg, (panel.x + 30, panel.y + 80))
 
             dessiner_bouton(fenetre, victory_replay_rect, "Rejouer", actif=True)
             dessiner_bouton(fenetre, victory_quit_rect, "Quitter", actif=False)
 
-            hint = police_petite.render("Astuce : Menu ≡ fonctionne aussi", True, BLANC)
+            hint = textes.rendre(police_petite, "Astuce : Menu ≡ fonctionne aussi", BLANC)
             fenetre.blit(hint, (panel.x + 30, panel.bottom - 30))
 
-        pygame.display.flip()
-        clock.tick(60)
+        pygame.display.update(ordonnanceur.valider())
+        ordonnanceur.attendre(clock, boucle_active())
 
+    robot_thread.fermer()
+    prechargeur.fermer()
     pygame.quit()
     sys.exit()
\ No newline at end of file
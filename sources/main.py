@@ -8,9 +8,14 @@ Point d'entrée du projet.
 
 - Mode jeu (Pygame) : python sources/main.py play
 - Mode stats (sans Pygame) : python sources/main.py stats
+  (--parties : garde aussi le détail de chaque partie dans data/parties/)
+  (--latences : mesure la durée de chaque décision des stratégies)
+  (--budget=SECONDES : nombre de parties choisi par match-up pour tenir dans ce temps)
+- Export CSV des résultats stockés : python sources/main.py export
 """
 
 import sys 
+import multiprocessing
 
 
 def main():
@@ -26,14 +31,30 @@ def main():
 
     if mode in ("stats", "sim", "simulation"):
         from stats import run_stats
-        run_stats()
+        budget_s = None
+        for arg in sys.argv[2:]:
+            if arg.startswith("--budget="):
+                budget_s = float(arg.split("=", 1)[1])
+        run_stats(
+            enregistrer_parties="--parties" in sys.argv[2:],
+            profil_latences="--latences" in sys.argv[2:],
+            budget_s=budget_s,
+        )
+        return
+
+    if mode in ("export", "csv"):
+        from stats import run_export
+        run_export()
         return
 
     print("Mode inconnu.")
     print("Utilisation :")
     print("  python sources/main.py play   # jeu Pygame")
     print("  python sources/main.py stats  # simulations sans Pygame")
+    print("  python sources/main.py export # CSV des résultats stockés (data/results_export.csv)")
 
 
 if __name__ == "__main__":
+    # Nécessaire pour le pool de processus des stats dans le .exe (Windows)
+    multiprocessing.freeze_support()
     main()
@@ -16,22 +16,32 @@ Objectif :
 Aucune dépendance pygame.
 """
 
+import os
+import sys
+import json
+import time
 import random
 import csv
+from statistics import NormalDist
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Callable, Dict, List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
+import cerveau
 from cerveau import (
-    Joueur, GameState, LISTE_ANIMAUX, distribuer_cartes,
+    VERSION_MOTEUR,
+    Joueur, GameState, distribuer_cartes,
     choix_robot_aleatoire,
     choix_robot_aleatoire_premiere_caracteristique,
     choix_robot_intelligent,
     choix_robot_intelligent_moyenne,
     choix_robot_triche_absolue,
     choix_robot_intelligent_triche,
-    choix_robot_monte_carlo_random,
-    choix_robot_monte_carlo_median,
+    choix_robot_monte_carlo_batch,
+    choix_robot_exact,
+    DetecteurCycles,
 )
+from stockage import CacheParties, EnregistreurParties, StockageResultats, empreinte_paquet
 
 
 # ============================================================
@@ -44,11 +54,21 @@ class Strategie:
 
     - nom : nom lisible
     - choisir(etat) : fonction qui renvoie "poids" / "longueur" / "longevite"
+    - version : à changer quand le comportement de la stratégie change
+      (sinon le cache des parties renverrait les anciens résultats)
     """
 
-    def __init__(self, nom: str, choisir: Callable[[GameState], str]):
+    def __init__(self, nom: str, choisir: Callable[[GameState], str], version: str = "1"):
         self.nom = nom
         self.choisir = choisir
+        self.version = version
+
+    def choisir_chronometre(self, etat: GameState, histogramme: "HistogrammeLatence") -> str:
+        """choisir(etat), en ajoutant la durée de l'appel à histogramme (profil des latences)."""
+        debut = time.perf_counter_ns()
+        carac = self.choisir(etat)
+        histogramme.ajouter(time.perf_counter_ns() - debut)
+        return carac
 
 
 def _safe_carac(carac: str) -> str:
@@ -70,7 +90,7 @@ def _carte_actif(etat: GameState):
 # -----------------------
 
 def strat_random(etat: GameState) -> str:
-    return _safe_carac(choix_robot_aleatoire())
+    return _safe_carac(choix_robot_aleatoire(etat.rng))
 
 
 def strat_first(etat: GameState) -> str:
@@ -84,15 +104,15 @@ def strat_first(etat: GameState) -> str:
 def strat_median_hist(etat: GameState) -> str:
     carte = _carte_actif(etat)
     if carte is None:
-        return _safe_carac(choix_robot_aleatoire())
-    return _safe_carac(choix_robot_intelligent(carte, etat.historique_cartes))
+        return _safe_carac(choix_robot_aleatoire(etat.rng))
+    return _safe_carac(choix_robot_intelligent(carte, etat.agregats_historique, etat.rng))
 
 
 def strat_mean_hist(etat: GameState) -> str:
     carte = _carte_actif(etat)
     if carte is None:
-        return _safe_carac(choix_robot_aleatoire())
-    return _safe_carac(choix_robot_intelligent_moyenne(carte, etat.historique_cartes))
+        return _safe_carac(choix_robot_aleatoire(etat.rng))
+    return _safe_carac(choix_robot_intelligent_moyenne(carte, etat.agregats_historique, etat.rng))
 
 
 # -----------------------
@@ -100,11 +120,16 @@ def strat_mean_hist(etat: GameState) -> str:
 # -----------------------
 
 def strat_monte_carlo_random(etat: GameState) -> str:
-    return _safe_carac(choix_robot_monte_carlo_random(etat, essais=30))
+    return _safe_carac(choix_robot_monte_carlo_batch(etat, "random"))
 
 
 def strat_monte_carlo_median(etat: GameState) -> str:
-    return _safe_carac(choix_robot_monte_carlo_median(etat, essais=30))
+    return _safe_carac(choix_robot_monte_carlo_batch(etat, "median"))
+
+
+def strat_exact(etat: GameState) -> str:
+    # exact si le paquet est petit, sinon Monte Carlo médiane (voir choix_robot_exact)
+    return _safe_carac(choix_robot_exact(etat))
 
 
 # -----------------------
@@ -115,15 +140,15 @@ def strat_cheat_absolute(etat: GameState) -> str:
     carte_jouee = etat.joueur_actif.carte_visible()
     carte_subie = etat.joueur_passif.carte_visible()
     if carte_jouee is None or carte_subie is None:
-        return _safe_carac(choix_robot_aleatoire())
-    return _safe_carac(choix_robot_triche_absolue(carte_jouee, carte_subie))
+        return _safe_carac(choix_robot_aleatoire(etat.rng))
+    return _safe_carac(choix_robot_triche_absolue(carte_jouee, carte_subie, etat.rng, table=etat.table_issues))
 
 
 def strat_cheat_median_allcards(etat: GameState) -> str:
     carte = _carte_actif(etat)
     if carte is None:
-        return _safe_carac(choix_robot_aleatoire())
-    return _safe_carac(choix_robot_intelligent_triche(carte, LISTE_ANIMAUX))
+        return _safe_carac(choix_robot_aleatoire(etat.rng))
+    return _safe_carac(choix_robot_intelligent_triche(carte, cerveau.LISTE_ANIMAUX, etat.rng))
 
 
 # Liste des stratégies disponibles
@@ -132,12 +157,21 @@ STRATEGIES: List[Strategie] = [
     Strategie("FirstStat(poids)", strat_first),
     Strategie("MedianRatio(hist)", strat_median_hist),
     Strategie("MeanRatio(hist)", strat_mean_hist),
-    Strategie("MonteCarlo_random", strat_monte_carlo_random),
-    Strategie("MonteCarlo_median", strat_monte_carlo_median),
+    # version 3 : moteur vectorisé, rollouts appariés et arrêt anticipé (choix_robot_monte_carlo_batch)
+    Strategie("MonteCarlo_random", strat_monte_carlo_random, version="3"),
+    Strategie("MonteCarlo_median", strat_monte_carlo_median, version="3"),
     Strategie("CheatAbsolute(see both)", strat_cheat_absolute),
     Strategie("CheatMedianAllCards(median global)", strat_cheat_median_allcards),
 ]
 
+# Le solveur exact n'est joué que si le paquet est assez petit :
+# au-delà, il retombe sur MonteCarlo_median et dédoublerait ce matchup.
+if len(cerveau.LISTE_ANIMAUX) <= cerveau.SEUIL_SOLVEUR_EXACT:
+    STRATEGIES.insert(
+        [s.nom for s in STRATEGIES].index("MonteCarlo_median") + 1,
+        Strategie("Exact(small deck)/MC_median", strat_exact),
+    )
+
 STRATEGIE_PAR_NOM: Dict[str, Strategie] = {s.nom: s for s in STRATEGIES}
 
 
@@ -145,6 +179,7 @@ STRATEGIE_PAR_NOM: Dict[str, Strategie] = {s.nom: s for s in STRATEGIES}
 # ======================= GROUPES ============================
 # ============================================================
 
+# Classement à la main, utilisé seulement sans modèle de coût (voir ModeleCout.est_grosse)
 PETITES_STRATS = {
     "Random",
     "FirstStat(poids)",
@@ -155,15 +190,21 @@ GROSSES_STRATS = {
     "MedianRatio(hist)",
     "MonteCarlo_random",
     "MonteCarlo_median",
+    "Exact(small deck)/MC_median",
     "CheatAbsolute(see both)",
 }
 
 
-def est_grosse_strategie(strat: Strategie) -> bool:
+def est_grosse_strategie(strat: Strategie, modele: Optional["ModeleCout"] = None) -> bool:
+    """Selon les coûts calibrés si le modèle connaît la stratégie, sinon selon GROSSES_STRATS."""
+    if modele is not None and strat.nom in modele.cout_decision_s:
+        return modele.est_grosse(strat)
     return strat.nom in GROSSES_STRATS
 
 
-def est_petite_strategie(strat: Strategie) -> bool:
+def est_petite_strategie(strat: Strategie, modele: Optional["ModeleCout"] = None) -> bool:
+    if modele is not None and strat.nom in modele.cout_decision_s:
+        return not modele.est_grosse(strat)
     return strat.nom in PETITES_STRATS
 
 
@@ -175,10 +216,23 @@ def ic95_proportion(nb_succes: int, n: int) -> Tuple[float, float]:
     """
     Intervalle de confiance 95% (méthode de Wilson) pour une proportion p = nb_succes/n.
     """
+    return intervalle_wilson(nb_succes, n, 1.96)  # 95%
+
+
+def z_sequentiel(alpha: float, n_regards: int) -> float:
+    """
+    Quantile pour des bornes valides quand on regarde les résultats n_regards fois
+    et qu'on peut s'arrêter à n'importe lequel : le risque alpha est partagé
+    à parts égales entre les regards (dépense d'alpha de Bonferroni).
+    """
+    return NormalDist().inv_cdf(1.0 - alpha / (2.0 * max(1, n_regards)))
+
+
+def intervalle_wilson(nb_succes: int, n: int, z: float) -> Tuple[float, float]:
+    """Intervalle de Wilson pour p = nb_succes/n, au niveau donné par z."""
     if n <= 0:
         return 0.0, 1.0
 
-    z = 1.96  # 95%
     p = nb_succes / n
 
     denom = 1.0 + (z * z) / n
@@ -220,6 +274,206 @@ def ecart_type(liste: List[float]) -> float:
     return var ** 0.5
 
 
+class Accumulateur:
+    """
+    Résumé d'une suite de valeurs sans garder la liste (mémoire O(1) par match-up) :
+
+    - n, somme : la somme est exacte pour des entiers (nombres de manches),
+      donc moyenne() est identique à moyenne(liste) ;
+    - moyenne / variance courantes par la méthode de Welford (m2) ;
+    - min / max ;
+    - comptes {valeur: nombre} : médiane exacte. Les nombres de manches sont
+      de petits entiers, le dictionnaire reste petit (au plus max_manches clés).
+
+    fusionner(autre) combine deux accumulateurs (morceaux de seeds, processus) ;
+    fusionner dans l'ordre des morceaux donne la même somme qu'en série.
+    """
+
+    __slots__ = ("n", "somme", "_moyenne", "_m2", "min", "max", "comptes")
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.somme = 0
+        self._moyenne = 0.0
+        self._m2 = 0.0
+        self.min = None
+        self.max = None
+        self.comptes: Dict[float, int] = {}
+
+    def __len__(self) -> int:
+        return self.n
+
+    def ajouter(self, x: float) -> None:
+        self.n += 1
+        self.somme += x
+        delta = x - self._moyenne
+        self._moyenne += delta / self.n
+        self._m2 += delta * (x - self._moyenne)
+        if self.min is None or x < self.min:
+            self.min = x
+        if self.max is None or x > self.max:
+            self.max = x
+        self.comptes[x] = self.comptes.get(x, 0) + 1
+
+    def fusionner(self, autre: "Accumulateur") -> None:
+        """Ajoute les valeurs de autre (formule de Chan et al. pour m2)."""
+        if autre.n == 0:
+            return
+        if self.n == 0:
+            self.n, self.somme = autre.n, autre.somme
+            self._moyenne, self._m2 = autre._moyenne, autre._m2
+            self.min, self.max = autre.min, autre.max
+            self.comptes = dict(autre.comptes)
+            return
+
+        n = self.n + autre.n
+        delta = autre._moyenne - self._moyenne
+        self._m2 += autre._m2 + delta * delta * self.n * autre.n / n
+        self._moyenne += delta * autre.n / n
+        self.n = n
+        self.somme += autre.somme
+        self.min = min(self.min, autre.min)
+        self.max = max(self.max, autre.max)
+        for valeur, c in autre.comptes.items():
+            self.comptes[valeur] = self.comptes.get(valeur, 0) + c
+
+    def moyenne(self) -> float:
+        return (self.somme / self.n) if self.n else float("nan")
+
+    def ecart_type(self) -> float:
+        """Même convention que ecart_type(liste) : nan si vide, 0.0 si n = 1, sinon / (n - 1)."""
+        if self.n == 0:
+            return float("nan")
+        if self.n == 1:
+            return 0.0
+        return max(0.0, self._m2 / (self.n - 1)) ** 0.5
+
+    def mediane(self) -> float:
+        if self.n == 0:
+            return float("nan")
+        rang_bas = (self.n - 1) // 2
+        rang_haut = self.n // 2
+        vu = 0
+        bas = None
+        for valeur in sorted(self.comptes):
+            vu += self.comptes[valeur]
+            if bas is None and vu > rang_bas:
+                bas = valeur
+            if vu > rang_haut:
+                if rang_bas == rang_haut:
+                    return bas
+                return (bas + valeur) / 2.0
+        return float("nan")
+
+
+class HistogrammeLatence:
+    """
+    Durées d'appel (en ns) rangées en classes logarithmiques : 8 sous-classes
+    par puissance de 2, soit une erreur relative < 12.5 % sur les quantiles,
+    dans un tableau fixe de 512 compteurs (ajout O(1), pas de liste de durées).
+
+    Fusionnable (processus, répétitions) et sérialisable (vers_dict / depuis_dict).
+    """
+
+    SOUS_CLASSES = 8
+    NB_CLASSES = 512
+
+    __slots__ = ("comptes", "n", "total_ns")
+
+    def __init__(self) -> None:
+        self.comptes = [0] * self.NB_CLASSES
+        self.n = 0
+        self.total_ns = 0
+
+    def __len__(self) -> int:
+        return self.n
+
+    @staticmethod
+    def _classe(ns: int) -> int:
+        if ns < 8:
+            return max(0, ns)
+        e = ns.bit_length() - 1
+        return (e - 2) * 8 + ((ns >> (e - 3)) & 7)
+
+    @staticmethod
+    def _bornes(classe: int) -> Tuple[int, int]:
+        """[bas, haut[ en ns des durées rangées dans cette classe."""
+        if classe < 8:
+            return classe, classe + 1
+        e = classe // 8 + 2
+        bas = (8 + classe % 8) << (e - 3)
+        return bas, bas + (1 << (e - 3))
+
+    def ajouter(self, ns: int) -> None:
+        self.comptes[self._classe(ns)] += 1
+        self.n += 1
+        self.total_ns += ns
+
+    def fusionner(self, autre: "HistogrammeLatence") -> None:
+        if autre.n == 0:
+            return
+        comptes = self.comptes
+        for i, c in enumerate(autre.comptes):
+            if c:
+                comptes[i] += c
+        self.n += autre.n
+        self.total_ns += autre.total_ns
+
+    def copie(self) -> "HistogrammeLatence":
+        h = HistogrammeLatence()
+        h.comptes = list(self.comptes)
+        h.n = self.n
+        h.total_ns = self.total_ns
+        return h
+
+    def difference(self, avant: "HistogrammeLatence") -> "HistogrammeLatence":
+        """Appels ajoutés depuis la copie avant (self doit contenir avant)."""
+        h = HistogrammeLatence()
+        h.comptes = [c - a for c, a in zip(self.comptes, avant.comptes)]
+        h.n = self.n - avant.n
+        h.total_ns = self.total_ns - avant.total_ns
+        return h
+
+    def quantile(self, q: float) -> float:
+        """Durée (ns) au quantile q, milieu de sa classe ; nan si vide."""
+        if self.n == 0:
+            return float("nan")
+        rang = max(1, min(self.n, int(-(-q * self.n // 1))))
+        vu = 0
+        for classe, c in enumerate(self.comptes):
+            vu += c
+            if vu >= rang:
+                bas, haut = self._bornes(classe)
+                return (bas + haut) / 2.0
+        return float("nan")
+
+    def vers_dict(self) -> Dict[str, object]:
+        return {
+            "n": self.n,
+            "total_ns": self.total_ns,
+            "comptes": {str(i): c for i, c in enumerate(self.comptes) if c},
+        }
+
+    @classmethod
+    def depuis_dict(cls, d: Dict[str, object]) -> "HistogrammeLatence":
+        h = cls()
+        h.n = int(d["n"])
+        h.total_ns = int(d["total_ns"])
+        for i, c in d["comptes"].items():
+            h.comptes[int(i)] = int(c)
+        return h
+
+    def resume(self) -> Dict[str, object]:
+        """Chiffres exportés : nombre d'appels, temps total, p50 / p90 / p99 en µs."""
+        return {
+            "calls": self.n,
+            "total_s": self.total_ns / 1e9,
+            "p50_us": self.quantile(0.50) / 1e3,
+            "p90_us": self.quantile(0.90) / 1e3,
+            "p99_us": self.quantile(0.99) / 1e3,
+        }
+
+
 # ============================================================
 # ======================= EXPORT CSV ==========================
 # ============================================================
@@ -241,132 +495,495 @@ def chemin_results_csv() -> Path:
     return _trouver_racine_projet() / "data" / "results.csv"
 
 
+def chemin_results_sqlite() -> Path:
+    return _trouver_racine_projet() / "data" / "results.sqlite"
+
+
+def chemin_parties() -> Path:
+    return _trouver_racine_projet() / "data" / "parties"
+
+
+def chemin_telemetrie_json() -> Path:
+    return _trouver_racine_projet() / "data" / "results_telemetry.json"
+
+
+COLONNES_CSV = [
+    "mode",
+    "A", "B",
+    "n_games",
+    "seed",
+
+    "wins_A", "wins_B",
+    "n_valid_games",
+    "n_total_runs",
+    "n_timeouts",
+
+    "winrate_A_pct", "winrate_B_pct",
+    "winrate_A_ci95_low_pct", "winrate_A_ci95_high_pct",
+
+    "avg_rounds_overall",
+    "avg_rounds_all_runs",
+    "avg_rounds_when_A_wins",
+    "avg_rounds_when_B_wins",
+
+    "n_repetitions",
+    "winrate_A_mean_pct",
+    "winrate_A_std_pct",
+    "winrate_A_median_pct",
+    "winrate_A_min_pct",
+    "winrate_A_max_pct",
+
+    "winrate_A_global_pct",
+    "winrate_A_global_ci95_low_pct",
+    "winrate_A_global_ci95_high_pct",
+
+    "avg_rounds_overall_mean",
+    "avg_rounds_overall_std",
+    "avg_rounds_all_runs_mean",
+    "avg_rounds_all_runs_std",
+
+    "total_wins_A",
+    "total_wins_B",
+    "total_valid_games",
+    "total_timeouts",
+
+    # profil des latences de décision (python sources/main.py stats --latences)
+    "latency_A_calls", "latency_A_total_s", "latency_A_p50_us", "latency_A_p90_us", "latency_A_p99_us",
+    "latency_B_calls", "latency_B_total_s", "latency_B_p50_us", "latency_B_p90_us", "latency_B_p99_us",
+]
+
+
 def ecrire_ligne_csv(res: Dict[str, object]) -> None:
     path = chemin_results_csv()
     path.parent.mkdir(parents=True, exist_ok=True)
 
-    colonnes = [
-        "mode",
-        "A", "B",
-        "n_games",
-        "seed",
-
-        "wins_A", "wins_B",
-        "n_valid_games",
-        "n_total_runs",
-        "n_timeouts",
-
-        "winrate_A_pct", "winrate_B_pct",
-        "winrate_A_ci95_low_pct", "winrate_A_ci95_high_pct",
-
-        "avg_rounds_overall",
-        "avg_rounds_all_runs",
-        "avg_rounds_when_A_wins",
-        "avg_rounds_when_B_wins",
-
-        "n_repetitions",
-        "winrate_A_mean_pct",
-        "winrate_A_std_pct",
-        "winrate_A_median_pct",
-        "winrate_A_min_pct",
-        "winrate_A_max_pct",
-
-        "winrate_A_global_pct",
-        "winrate_A_global_ci95_low_pct",
-        "winrate_A_global_ci95_high_pct",
-
-        "avg_rounds_overall_mean",
-        "avg_rounds_overall_std",
-        "avg_rounds_all_runs_mean",
-        "avg_rounds_all_runs_std",
-
-        "total_wins_A",
-        "total_wins_B",
-        "total_valid_games",
-        "total_timeouts",
-    ]
-
     fichier_existe = path.exists()
     with path.open("a", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=colonnes, delimiter=";")
+        writer = csv.DictWriter(f, fieldnames=COLONNES_CSV, delimiter=";")
         if not fichier_existe:
             writer.writeheader()
 
-        ligne = {c: res.get(c, "") for c in colonnes}
+        ligne = {c: res.get(c, "") for c in COLONNES_CSV}
         writer.writerow(ligne)
 
 
 # ============================================================
-# ======================= GESTION DU HASARD ==================
+# ======================= TELEMETRIE ==========================
 # ============================================================
 
-def _executer_avec_seed_globale(seed: int, fonction):
+def _nb_parties(res: Dict[str, object]) -> int:
+    """Parties jouées (timeouts et cycles compris) d'un résultat simple ou répétitions."""
+    if res.get("mode") == "repetitions":
+        return int(res["total_valid_games"]) + int(res["total_timeouts"]) + int(res.get("total_cycles", 0))
+    return int(res["n_total_runs"])
+
+
+def _duree_lisible(secondes: float) -> str:
+    secondes = int(round(secondes))
+    if secondes >= 3600:
+        return "%dh%02dm" % (secondes // 3600, (secondes % 3600) // 60)
+    if secondes >= 60:
+        return "%dm%02ds" % (secondes // 60, secondes % 60)
+    return "%ds" % secondes
+
+
+class Telemetrie:
     """
-    Le module cerveau.py utilise le hasard via le module random (global).
-    Pour obtenir des résultats reproductibles et indépendants de l'ordre,
-    on force random.seed(seed) uniquement pendant la partie,
-    puis on restaure l'état précédent du hasard.
+    Suivi d'un lancement de stats :
+
+    - avancer(n_parties, n_manches, cpu_s) : appelé seed par seed (série) ou
+      lot par lot (multiprocessus). Affiche au plus une fois par intervalle_s
+      une ligne unique (parties/s, manches/s, ETA) sur flux (stderr par défaut).
+    - debut_matchup / fin_matchup(res) : chiffres par match-up (parties, manches,
+      timeouts, cycles, décisions, temps mur et CPU, parties/s, latences si profil),
+      et latences fusionnées par stratégie.
+    - compter_decisions(a, b) : décisions jouées pour le match-up courant (série).
+      Elles dépendent du cache des parties : la télémétrie les garde, pas les résultats.
+    - ecrire_resume(chemin) : résumé JSON à la fin du lancement.
+
+    n_parties_prevues sert à l'ETA (débit moyen depuis le début).
     """
-    etat_hasard = random.getstate()
-    try:
-        random.seed(seed)
-        return fonction()
-    finally:
-        random.setstate(etat_hasard)
+
+    def __init__(self, n_parties_prevues: int = 0, intervalle_s: float = 0.5, flux=None):
+        self.n_parties_prevues = n_parties_prevues
+        self.intervalle_s = intervalle_s
+        self.flux = flux if flux is not None else sys.stderr
+        self.debut_mur = time.perf_counter()
+        self.debut_cpu = time.process_time()
+        self.parties = 0
+        self.manches = 0
+        self.cpu_pool_s = 0.0  # temps CPU remonté par les processus du pool
+        self.matchups: List[Dict[str, object]] = []
+        self.latences: Dict[str, HistogrammeLatence] = {}
+        self._courant: Optional[Dict[str, object]] = None
+        self._dernier_affichage = 0.0
+        self._largeur_ligne = 0
+
+    def avancer(self, n_parties: int, n_manches: int, cpu_s: float = 0.0) -> None:
+        self.parties += n_parties
+        self.manches += n_manches
+        self.cpu_pool_s += cpu_s
+
+        maintenant = time.perf_counter()
+        if maintenant - self._dernier_affichage >= self.intervalle_s:
+            self._dernier_affichage = maintenant
+            self._afficher(maintenant)
+
+    def eta_s(self, maintenant: Optional[float] = None) -> float:
+        """Temps restant estimé (nan tant qu'aucune partie n'est finie)."""
+        if maintenant is None:
+            maintenant = time.perf_counter()
+        ecoule = maintenant - self.debut_mur
+        if self.parties == 0 or ecoule <= 0:
+            return float("nan")
+        restantes = max(0, self.n_parties_prevues - self.parties)
+        return restantes * ecoule / self.parties
+
+    def _afficher(self, maintenant: float) -> None:
+        ecoule = max(1e-9, maintenant - self.debut_mur)
+        ligne = "%d/%d parties | %.0f parties/s | %.0f manches/s" % (
+            self.parties, self.n_parties_prevues, self.parties / ecoule, self.manches / ecoule,
+        )
+        eta = self.eta_s(maintenant)
+        if eta == eta:
+            ligne += " | ETA " + _duree_lisible(eta)
+        if self._courant is not None:
+            ligne = "%s vs %s | %s" % (self._courant["A"], self._courant["B"], ligne)
+
+        self.flux.write("\r" + ligne.ljust(self._largeur_ligne))
+        self.flux.flush()
+        self._largeur_ligne = len(ligne)
+
+    def effacer_ligne(self) -> None:
+        """Efface la ligne de progression avant un affichage normal (print_result...)."""
+        if self._largeur_ligne:
+            self.flux.write("\r" + " " * self._largeur_ligne + "\r")
+            self.flux.flush()
+            self._largeur_ligne = 0
+
+    def debut_matchup(self, strat_a: Strategie, strat_b: Strategie) -> None:
+        self.effacer_ligne()
+        self._courant = {
+            "A": strat_a.nom,
+            "B": strat_b.nom,
+            "debut_mur": time.perf_counter(),
+            "debut_cpu": time.process_time(),
+            "debut_cpu_pool": self.cpu_pool_s,
+            "decisions": (0, 0),
+        }
+
+    def compter_decisions(self, decisions_a: int, decisions_b: int) -> None:
+        if self._courant is not None:
+            a, b = self._courant["decisions"]
+            self._courant["decisions"] = (a + decisions_a, b + decisions_b)
+
+    def fin_matchup(
+        self,
+        res: Dict[str, object],
+        cpu_s: Optional[float] = None,
+        decisions: Optional[Tuple[int, int]] = None,
+    ) -> Dict[str, object]:
+        """
+        Enregistre les chiffres du match-up courant.
+        cpu_s, decisions : temps CPU et décisions (A, B) du match-up s'ils sont connus
+        par ailleurs (mode multiprocessus, où les match-ups se chevauchent et le temps
+        mur n'a pas de sens) ; sinon mesurés depuis debut_matchup.
+        """
+        self.effacer_ligne()
+        courant = self._courant or {}
+        self._courant = None
+
+        mur_s = None
+        if cpu_s is None and courant:
+            mur_s = time.perf_counter() - courant["debut_mur"]
+            cpu_s = (time.process_time() - courant["debut_cpu"]) + (self.cpu_pool_s - courant["debut_cpu_pool"])
+        if decisions is None:
+            decisions = courant.get("decisions", (0, 0))
+
+        parties = _nb_parties(res)
+        manches = int(res.get("total_rounds_all_runs", 0))
+        ligne = {
+            "A": res["A"],
+            "B": res["B"],
+            "mode": res["mode"],
+            "parties": parties,
+            "manches": manches,
+            "timeouts": int(res.get("n_timeouts", 0)),
+            "cycles": int(res.get("n_cycles", 0)),
+            "decisions_A": int(decisions[0]),
+            "decisions_B": int(decisions[1]),
+            "mur_s": mur_s,
+            "cpu_s": cpu_s,
+            "parties_par_s": (parties / mur_s) if mur_s else None,
+            "parties_par_s_cpu": (parties / cpu_s) if cpu_s else None,
+            "manches_par_s_cpu": (manches / cpu_s) if cpu_s else None,
+        }
+        for cote in ("A", "B"):
+            if "latency_hist_" + cote in res:
+                h = self.latences.setdefault(res[cote], HistogrammeLatence())
+                h.fusionner(HistogrammeLatence.depuis_dict(res["latency_hist_" + cote]))
+                ligne["latence_" + cote] = {k: res["latency_%s_%s" % (cote, k)] for k in h.resume()}
+        self.matchups.append(ligne)
+        return ligne
+
+    def resume(self) -> Dict[str, object]:
+        mur_s = time.perf_counter() - self.debut_mur
+        cpu_s = (time.process_time() - self.debut_cpu) + self.cpu_pool_s
+        return {
+            "fin": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "mur_s": mur_s,
+            "cpu_s": cpu_s,
+            "parties": self.parties,
+            "manches": self.manches,
+            "parties_par_s": (self.parties / mur_s) if mur_s > 0 else None,
+            "manches_par_s": (self.manches / mur_s) if mur_s > 0 else None,
+            "matchups": self.matchups,
+            "latences_par_strategie": {nom: h.resume() for nom, h in self.latences.items()},
+        }
+
+    def ecrire_resume(self, chemin: Optional[Path] = None) -> Path:
+        """Résumé JSON (data/results_telemetry.json par défaut, à côté de results.csv)."""
+        self.effacer_ligne()
+        chemin = Path(chemin) if chemin is not None else chemin_telemetrie_json()
+        chemin.parent.mkdir(parents=True, exist_ok=True)
+        with chemin.open("w", encoding="utf-8") as f:
+            json.dump(self.resume(), f, ensure_ascii=False, indent=2)
+        return chemin
+
+
+def _volume_partiel(partiel: Dict[str, object]) -> Tuple[int, int, float]:
+    """(parties, manches, temps CPU) d'un partiel, pour Telemetrie.avancer."""
+    n = partiel["victoires_a"] + partiel["victoires_b"] + partiel["nb_timeouts"] + partiel["nb_cycles"]
+    return n, partiel["manches_total_tous_runs"], partiel["temps_cpu_s"]
+
+
+def _parties_prevues(n_games: int, n_repetitions: int) -> int:
+    """Parties d'un match-up du tournoi (symétrisé : 2 par seed)."""
+    return 2 * n_games * n_repetitions
 
 
 # ============================================================
 # ======================= SIMULATION CORE ======================
 # ============================================================
 
-def creer_partie_bot_vs_bot() -> GameState:
+def creer_partie_bot_vs_bot(rng: random.Random) -> GameState:
     """
     Crée une partie BotA vs BotB.
     Le joueur qui commence est tiré au hasard.
+    Tout le hasard de la partie (distribution, réinsertions, stratégies)
+    passe par rng : aucune interaction avec le module random global.
     """
-    c1, c2 = distribuer_cartes(LISTE_ANIMAUX)
+    c1, c2 = distribuer_cartes(cerveau.LISTE_ANIMAUX, rng)
     j1 = Joueur("BotA", c1)
     j2 = Joueur("BotB", c2)
-    etat = GameState(j1, j2, mode_robot=None)
+    etat = GameState(j1, j2, mode_robot=None, rng=rng, niveau_journal="off")
 
-    if random.random() < 0.5:
+    if rng.random() < 0.5:
         etat.joueur_actif, etat.joueur_passif = etat.joueur_passif, etat.joueur_actif
 
     return etat
 
 
+# Détection des parties qui tournent en rond (voir DetecteurCycles).
+# Activée seulement après CYCLE_APRES_MANCHES manches : une partie normale
+# finit bien avant (~50 manches en moyenne) et ne paie donc pas le suivi du hash.
+CYCLE_APRES_MANCHES = 200
+CYCLE_FENETRE = 1000
+CYCLE_REPETITIONS = 10
+
+
+# -----------------------
+# Cache disque des parties (voir stockage.CacheParties)
+# -----------------------
+
+_CHEMIN_CACHE_PARTIES: Optional[Path] = None
+_TAILLE_CACHE_PARTIES = 500_000
+_CACHE_PARTIES: Optional[CacheParties] = None
+_CACHE_PID: Optional[int] = None
+_EMPREINTE_PAQUET: Optional[Tuple[list, str]] = None  # (paquet, empreinte)
+
+
+def chemin_cache_parties() -> Path:
+    return _trouver_racine_projet() / "data" / "cache_parties.sqlite"
+
+
+def activer_cache_parties(chemin: Optional[Path], taille_max: int = 500_000) -> None:
+    """
+    Active (chemin) ou désactive (None) le cache des parties pour ce processus.
+    Fonction de module : sert aussi d'initializer aux processus du pool.
+    """
+    global _CHEMIN_CACHE_PARTIES, _TAILLE_CACHE_PARTIES, _CACHE_PARTIES, _CACHE_PID
+    if _CACHE_PARTIES is not None and _CACHE_PID == os.getpid():
+        _CACHE_PARTIES.fermer()
+    _CHEMIN_CACHE_PARTIES = Path(chemin) if chemin is not None else None
+    _TAILLE_CACHE_PARTIES = taille_max
+    _CACHE_PARTIES = None
+    _CACHE_PID = None
+
+
+def _cache_parties() -> Optional[CacheParties]:
+    """
+    Connexion au cache du processus courant (ouverte à la demande).
+    Un processus fils (fork) ne réutilise pas la connexion SQLite du parent.
+    """
+    global _CACHE_PARTIES, _CACHE_PID
+    if _CHEMIN_CACHE_PARTIES is None:
+        return None
+    if _CACHE_PARTIES is None or _CACHE_PID != os.getpid():
+        _CACHE_PARTIES = CacheParties(_CHEMIN_CACHE_PARTIES, taille_max=_TAILLE_CACHE_PARTIES)
+        _CACHE_PID = os.getpid()
+    return _CACHE_PARTIES
+
+
+def _empreinte_paquet_courant() -> str:
+    """Empreinte de cerveau.LISTE_ANIMAUX, recalculée si recharger_animaux a changé de paquet."""
+    global _EMPREINTE_PAQUET
+    paquet = cerveau.LISTE_ANIMAUX
+    if _EMPREINTE_PAQUET is None or _EMPREINTE_PAQUET[0] is not paquet:
+        _EMPREINTE_PAQUET = (paquet, empreinte_paquet(paquet))
+    return _EMPREINTE_PAQUET[1]
+
+
+def valider_cache_parties() -> None:
+    """Écrit sur disque les résultats en attente (fin de lot / de comparaison)."""
+    if _CACHE_PARTIES is not None and _CACHE_PID == os.getpid():
+        _CACHE_PARTIES.valider()
+
+
+def _cle_partie(strat_a: Strategie, strat_b: Strategie, seed: int, max_manches: int) -> str:
+    """
+    Tout ce dont dépend l'issue d'une partie : stratégies (+ versions), seed,
+    max_manches, contenu du paquet et version du moteur (règles + détection des cycles).
+    """
+    return "|".join((
+        strat_a.nom, strat_a.version,
+        strat_b.nom, strat_b.version,
+        str(seed), str(max_manches), _empreinte_paquet_courant(), _version_moteur_stats(),
+    ))
+
+
+def _version_moteur_stats() -> str:
+    """Version du moteur + paramètres de détection des cycles (changent les issues)."""
+    return "%s/c%d-%d-%d" % (VERSION_MOTEUR, CYCLE_APRES_MANCHES, CYCLE_FENETRE, CYCLE_REPETITIONS)
+
+
 def jouer_une_partie(
     strat_a: Strategie,
     strat_b: Strategie,
     seed: int,
     max_manches: int = 5000,
-) -> Tuple[str, int]:
+    decisions: Optional[Dict[str, int]] = None,
+) -> Tuple[str, int, str]:
     """
     Joue UNE partie.
-    Retourne (gagnant, nb_manches).
-    gagnant ∈ {"BotA","BotB","TIMEOUT"}.
+    Retourne (gagnant, nb_manches, premier).
+    gagnant ∈ {"BotA","BotB","TIMEOUT","CYCLE"} ; premier ∈ {"BotA","BotB"} : le bot qui a commencé.
+
+    La partie a son propre random.Random(seed) : résultat reproductible,
+    indépendant de l'ordre des parties et sans interférence entre threads.
+
+    CYCLE : la partie tourne en rond (même position revue CYCLE_REPETITIONS fois
+    dans les CYCLE_FENETRE dernières manches, voir DetecteurCycles) ; on l'arrête
+    sans attendre max_manches.
+
+    Si le cache des parties est actif (activer_cache_parties), une partie
+    déjà simulée n'est pas rejouée : on relit son résultat.
+
+    decisions : compteur nom de stratégie -> appels à choisir, propre à l'appelant
+    (une partie relue dans le cache ne coûte aucune décision).
     """
+    cache = _cache_parties()
+    if cache is None:
+        return _simuler_partie(strat_a, strat_b, seed, max_manches, decisions)
 
-    def _faire_partie():
-        etat = creer_partie_bot_vs_bot()
-        manches = 0
+    cle = _cle_partie(strat_a, strat_b, seed, max_manches)
+    connu = cache.lire(cle)
+    if connu is not None:
+        return connu
 
-        while (not etat.terminee) and manches < max_manches:
-            if etat.joueur_actif.nom == "BotA":
-                carac = strat_a.choisir(etat)
+    gagnant, manches, premier = _simuler_partie(strat_a, strat_b, seed, max_manches, decisions)
+    cache.ecrire(cle, gagnant, manches, premier)
+    return gagnant, manches, premier
+
+# Profil des latences de décision (opt-in : chronométrer chaque appel a un coût).
+PROFIL_LATENCES = False
+LATENCES_PAR_STRATEGIE: Dict[str, HistogrammeLatence] = {}
+
+
+def activer_profil_latences(actif: bool = True) -> None:
+    """Chronomètre (ou non) chaque décision des stratégies dans ce processus."""
+    global PROFIL_LATENCES
+    PROFIL_LATENCES = actif
+
+
+def _latences(strat: Strategie) -> HistogrammeLatence:
+    h = LATENCES_PAR_STRATEGIE.get(strat.nom)
+    if h is None:
+        h = LATENCES_PAR_STRATEGIE[strat.nom] = HistogrammeLatence()
+    return h
+
+
+def _initialiser_processus(
+    chemin_cache: Optional[Path],
+    taille_cache: int,
+    profil_latences: bool,
+) -> None:
+    """Initializer du pool : même configuration que le processus principal (utile hors fork)."""
+    activer_cache_parties(chemin_cache, taille_cache)
+    activer_profil_latences(profil_latences)
+
+
+def _simuler_partie(
+    strat_a: Strategie,
+    strat_b: Strategie,
+    seed: int,
+    max_manches: int,
+    decisions: Optional[Dict[str, int]] = None,
+) -> Tuple[str, int, str]:
+    """Simule réellement la partie (voir jouer_une_partie)."""
+    etat = creer_partie_bot_vs_bot(random.Random(seed))
+    premier = etat.joueur_actif.nom
+    manches = 0
+    decisions_a = 0
+    gagnant = None
+    profil = PROFIL_LATENCES
+    if profil:
+        latences_a = _latences(strat_a)
+        latences_b = _latences(strat_b)
+
+    while (not etat.terminee) and manches < max_manches:
+        if manches == CYCLE_APRES_MANCHES:
+            etat.activer_detection_cycles(DetecteurCycles(CYCLE_FENETRE, CYCLE_REPETITIONS))
+
+        if etat.joueur_actif.nom == "BotA":
+            if profil:
+                carac = strat_a.choisir_chronometre(etat, latences_a)
             else:
-                carac = strat_b.choisir(etat)
+                carac = strat_a.choisir(etat)
+            decisions_a += 1
+        elif profil:
+            carac = strat_b.choisir_chronometre(etat, latences_b)
+        else:
+            carac = strat_b.choisir(etat)
 
-            carac = _safe_carac(carac)
-            etat.appliquer_manche(carac)
-            manches += 1
+        carac = _safe_carac(carac)
+        etat.appliquer_manche(carac)
+        manches += 1
+        if etat.cycle_detecte:
+            gagnant = "CYCLE"
+            break
 
-        if (not etat.terminee) or (etat.gagnant is None):
-            return "TIMEOUT", manches
+    if decisions is not None:
+        decisions[strat_a.nom] = decisions.get(strat_a.nom, 0) + decisions_a
+        decisions[strat_b.nom] = decisions.get(strat_b.nom, 0) + manches - decisions_a
 
-        return etat.gagnant.nom, manches
+    if gagnant is not None:
+        return gagnant, manches, premier
 
-    return _executer_avec_seed_globale(seed, _faire_partie)
+    if (not etat.terminee) or (etat.gagnant is None):
+        return "TIMEOUT", manches, premier
+
+    return etat.gagnant.nom, manches, premier
 
 
 def _jouer_deux_parties_symetrisees(
@@ -374,113 +991,255 @@ def _jouer_deux_parties_symetrisees(
     strat_b: Strategie,
     seed: int,
     max_manches: int = 5000,
-) -> List[Tuple[str, int]]:
+    decisions: Optional[Dict[str, int]] = None,
+) -> List[Tuple[str, int, bool]]:
     """
     Comparaison équitable :
     - Partie 1 : A en BotA contre B en BotB avec seed = seed
     - Partie 2 : B en BotA contre A en BotB avec seed = seed
 
     Retourne une liste de 2 résultats "du point de vue de A" :
-    chaque élément = (issue, nb_manches)
-    avec issue dans {"A", "B", "TIMEOUT"}.
+    chaque élément = (issue, nb_manches, a_commence)
+    avec issue dans {"A", "B", "TIMEOUT", "CYCLE"}.
+
+    Les deux parties passent par jouer_une_partie, donc par le cache :
+    la clé de la partie 2 (B en BotA) est distincte de celle de la partie 1.
     """
     resultats = []
 
     # Partie 1 : A joue BotA
-    g1, m1 = jouer_une_partie(strat_a, strat_b, seed=seed, max_manches=max_manches)
-    if g1 == "TIMEOUT":
-        resultats.append(("TIMEOUT", m1))
+    g1, m1, p1 = jouer_une_partie(strat_a, strat_b, seed=seed, max_manches=max_manches, decisions=decisions)
+    if g1 in ("TIMEOUT", "CYCLE"):
+        resultats.append((g1, m1, p1 == "BotA"))
     elif g1 == "BotA":
-        resultats.append(("A", m1))
+        resultats.append(("A", m1, p1 == "BotA"))
     else:
-        resultats.append(("B", m1))
+        resultats.append(("B", m1, p1 == "BotA"))
 
     # Partie 2 : swap, mais on reconvertit le résultat du point de vue de A
-    g2, m2 = jouer_une_partie(strat_b, strat_a, seed=seed, max_manches=max_manches)
-    if g2 == "TIMEOUT":
-        resultats.append(("TIMEOUT", m2))
+    g2, m2, p2 = jouer_une_partie(strat_b, strat_a, seed=seed, max_manches=max_manches, decisions=decisions)
+    if g2 in ("TIMEOUT", "CYCLE"):
+        resultats.append((g2, m2, p2 == "BotB"))
     elif g2 == "BotB":
         # ici A jouait BotB
-        resultats.append(("A", m2))
+        resultats.append(("A", m2, p2 == "BotB"))
     else:
-        resultats.append(("B", m2))
+        resultats.append(("B", m2, p2 == "BotB"))
 
     return resultats
 
 
-def comparer_deux_strategies(
+# -----------------------
+# Résultats partiels (fusionnables entre morceaux de seeds / processus)
+# -----------------------
+
+def _tirer_seeds(seed: int, n_games: int) -> List[int]:
+    """Seeds des n_games parties d'une expérience (même tirage que la boucle historique)."""
+    generateur = random.Random(seed)
+    return [generateur.randrange(0, 2**31 - 1) for _ in range(n_games)]
+
+
+def _nouveau_partiel() -> Dict[str, object]:
+    return {
+        "victoires_a": 0,
+        "victoires_b": 0,
+        "nb_timeouts": 0,
+        "nb_cycles": 0,
+        "manches_total_tous_runs": 0,
+        "manches_parties_valides": Accumulateur(),
+        "manches_quand_a_gagne": Accumulateur(),
+        "manches_quand_b_gagne": Accumulateur(),
+        "decisions_a": 0,
+        "decisions_b": 0,
+        "temps_cpu_s": 0.0,
+        "latences_a": HistogrammeLatence(),
+        "latences_b": HistogrammeLatence(),
+    }
+
+
+def _debut_mesure(strat_a: Strategie, strat_b: Strategie) -> Tuple[object, ...]:
+    """(compteur de décisions à remplir par les parties, temps CPU, latences) au début d'une mesure."""
+    return (
+        {},
+        time.process_time(),
+        _latences(strat_a).copie() if PROFIL_LATENCES else None,
+        _latences(strat_b).copie() if PROFIL_LATENCES else None,
+    )
+
+
+def _fin_mesure(
+    partiel: Dict[str, object],
+    strat_a: Strategie,
+    strat_b: Strategie,
+    debut: Tuple[object, ...],
+) -> None:
+    """
+    Décisions, temps CPU et latences depuis _debut_mesure (A contre lui-même : tout compte pour A).
+    Le temps CPU et les décisions n'entrent pas dans le résultat (ils varient d'un
+    lancement à l'autre, selon le cache) : ils servent à la télémétrie.
+    """
+    decisions = debut[0]
+    partiel["decisions_a"] += decisions.get(strat_a.nom, 0)
+    if strat_b.nom != strat_a.nom:
+        partiel["decisions_b"] += decisions.get(strat_b.nom, 0)
+    partiel["temps_cpu_s"] += time.process_time() - debut[1]
+    if debut[2] is not None:
+        partiel["latences_a"].fusionner(_latences(strat_a).difference(debut[2]))
+        if strat_b.nom != strat_a.nom:
+            partiel["latences_b"].fusionner(_latences(strat_b).difference(debut[3]))
+
+
+def _ajouter_issue(partiel: Dict[str, object], issue: str, nb_manches: int) -> None:
+    """issue ∈ {"A", "B", "TIMEOUT", "CYCLE"} (point de vue de A)."""
+    partiel["manches_total_tous_runs"] += nb_manches
+
+    if issue == "TIMEOUT":
+        partiel["nb_timeouts"] += 1
+    elif issue == "CYCLE":
+        partiel["nb_cycles"] += 1
+    elif issue == "A":
+        partiel["victoires_a"] += 1
+        partiel["manches_parties_valides"].ajouter(nb_manches)
+        partiel["manches_quand_a_gagne"].ajouter(nb_manches)
+    else:
+        partiel["victoires_b"] += 1
+        partiel["manches_parties_valides"].ajouter(nb_manches)
+        partiel["manches_quand_b_gagne"].ajouter(nb_manches)
+
+
+def _fusionner_partiels(partiels: List[Dict[str, object]]) -> Dict[str, object]:
+    """
+    Fusionne des partiels (accumulateurs de manches + compteurs). Les sommes
+    de manches sont entières : les moyennes sont identiques au mode série.
+    """
+    total = _nouveau_partiel()
+    for p in partiels:
+        for cle, valeur in p.items():
+            if isinstance(valeur, (Accumulateur, HistogrammeLatence)):
+                total[cle].fusionner(valeur)
+            else:
+                total[cle] += valeur
+    return total
+
+
+def _jouer_seed(
     strat_a: Strategie,
     strat_b: Strategie,
-    n_games: int,
     seed: int,
-    print_every: int = 0,
-    export_csv: bool = True,
-    symetriser: bool = True,
-    max_manches: int = 5000,
+    symetriser: bool,
+    max_manches: int,
+    decisions: Optional[Dict[str, int]] = None,
+) -> List[Tuple[str, int, bool]]:
+    """Parties jouées pour UNE seed, du point de vue de A : (issue, nb_manches, a_commence)."""
+    if symetriser:
+        return _jouer_deux_parties_symetrisees(strat_a, strat_b, seed=seed, max_manches=max_manches,
+                                               decisions=decisions)
+
+    gagnant, m, premier = jouer_une_partie(strat_a, strat_b, seed=seed, max_manches=max_manches,
+                                           decisions=decisions)
+    if gagnant in ("TIMEOUT", "CYCLE"):
+        return [(gagnant, m, premier == "BotA")]
+    if gagnant == "BotA":
+        return [("A", m, premier == "BotA")]
+    return [("B", m, premier == "BotA")]
+
+
+def _jouer_lot(
+    strat_a: Strategie,
+    strat_b: Strategie,
+    seeds: List[int],
+    symetriser: bool,
+    max_manches: int,
+    detail: bool = False,
 ) -> Dict[str, object]:
     """
-    UNE expérience :
-    - symetriser=True (recommandé) : on joue 2 parties par seed (A/B puis B/A)
-      => plus robuste et indépendant de l'ordre.
-    - symetriser=False : une seule partie par seed.
+    Unité de travail : joue toutes les seeds d'un morceau et renvoie le partiel.
+    Fonction de module (picklable) pour pouvoir tourner dans un processus séparé.
 
-    Les TIMEOUTS sont comptés et exclus du winrate.
+    detail=True : le partiel contient aussi "parties" = [(seed, issues), ...]
+    pour l'enregistreur de parties du processus principal.
     """
+    partiel = _nouveau_partiel()
+    debut = _debut_mesure(strat_a, strat_b)
+    parties = []
+    for s in seeds:
+        issues = _jouer_seed(strat_a, strat_b, s, symetriser, max_manches, debut[0])
+        for issue, nb_manches, _ in issues:
+            _ajouter_issue(partiel, issue, nb_manches)
+        if detail:
+            parties.append((s, issues))
+    valider_cache_parties()
+    _fin_mesure(partiel, strat_a, strat_b, debut)
+    if detail:
+        partiel["parties"] = parties
+    return partiel
 
-    victoires_a = 0
-    victoires_b = 0
-
-    manches_total_tous_runs = 0
-    manches_parties_valides: List[int] = []
-    manches_quand_a_gagne: List[int] = []
-    manches_quand_b_gagne: List[int] = []
 
-    nb_timeouts = 0
+# -----------------------
+# Détail partie par partie (voir stockage.EnregistreurParties)
+# -----------------------
 
-    generateur = random.Random(seed)
+def _nouveau_matchup(
+    enregistreur: EnregistreurParties,
+    strat_a: Strategie,
+    strat_b: Strategie,
+    n_games: int,
+    seed: int,
+    symetriser: bool,
+    max_manches: int,
+) -> int:
+    return enregistreur.nouveau_matchup(
+        A=strat_a.nom, B=strat_b.nom, n_games=n_games, seed=seed,
+        symetriser=symetriser, max_manches=max_manches,
+    )
 
-    for k in range(1, n_games + 1):
-        s = generateur.randrange(0, 2**31 - 1)
 
-        if symetriser:
-            resultats = _jouer_deux_parties_symetrisees(
-                strat_a, strat_b, seed=s, max_manches=max_manches
-            )
+def _enregistrer_seed(
+    enregistreur: EnregistreurParties,
+    matchup: int,
+    seed: int,
+    issues: List[Tuple[str, int, bool]],
+) -> None:
+    """Parties d'une seed (sortie de _jouer_seed, cote 1 = partie symétrisée)."""
+    for cote, (issue, nb_manches, a_commence) in enumerate(issues):
+        enregistreur.ajouter(matchup, seed, cote, issue, nb_manches, 0 if a_commence else 1)
 
-            for issue, nb_manches in resultats:
-                manches_total_tous_runs += nb_manches
 
-                if issue == "TIMEOUT":
-                    nb_timeouts += 1
-                elif issue == "A":
-                    victoires_a += 1
-                    manches_parties_valides.append(nb_manches)
-                    manches_quand_a_gagne.append(nb_manches)
-                else:
-                    victoires_b += 1
-                    manches_parties_valides.append(nb_manches)
-                    manches_quand_b_gagne.append(nb_manches)
+def _colonnes_latences(latences_a: HistogrammeLatence, latences_b: HistogrammeLatence) -> Dict[str, object]:
+    """
+    Clés latency_* d'un résultat (vide si le profil n'était pas actif).
+    latency_hist_* garde l'histogramme complet pour fusionner les répétitions.
+    """
+    colonnes: Dict[str, object] = {}
+    for cote, h in (("A", latences_a), ("B", latences_b)):
+        if h.n == 0:
+            continue
+        for cle, valeur in h.resume().items():
+            colonnes["latency_%s_%s" % (cote, cle)] = valeur
+        colonnes["latency_hist_" + cote] = h.vers_dict()
+    return colonnes
 
-        else:
-            gagnant, m = jouer_une_partie(strat_a, strat_b, seed=s, max_manches=max_manches)
-            manches_total_tous_runs += m
-
-            if gagnant == "TIMEOUT":
-                nb_timeouts += 1
-            elif gagnant == "BotA":
-                victoires_a += 1
-                manches_parties_valides.append(m)
-                manches_quand_a_gagne.append(m)
-            else:
-                victoires_b += 1
-                manches_parties_valides.append(m)
-                manches_quand_b_gagne.append(m)
 
-        if print_every > 0 and (k % print_every == 0):
-            print("  Parties terminées:", k, "/", n_games)
+def _resultat_simple(
+    strat_a: Strategie,
+    strat_b: Strategie,
+    n_games: int,
+    seed: int,
+    symetriser: bool,
+    partiel: Dict[str, object],
+) -> Dict[str, object]:
+    """Construit le dict résultat d'UNE expérience à partir du partiel complet."""
+    victoires_a = partiel["victoires_a"]
+    victoires_b = partiel["victoires_b"]
+    nb_timeouts = partiel["nb_timeouts"]
+    nb_cycles = partiel["nb_cycles"]
+    manches_total_tous_runs = partiel["manches_total_tous_runs"]
+    manches_parties_valides = partiel["manches_parties_valides"]
+    manches_quand_a_gagne = partiel["manches_quand_a_gagne"]
+    manches_quand_b_gagne = partiel["manches_quand_b_gagne"]
 
     nb_total = (2 * n_games) if symetriser else n_games
-    nb_valides = nb_total - nb_timeouts
+    nb_valides = nb_total - nb_timeouts - nb_cycles
 
     if nb_valides <= 0:
         winrate_a = float("nan")
@@ -491,7 +1250,7 @@ def comparer_deux_strategies(
         winrate_b = 100.0 * victoires_b / nb_valides
         bas, haut = ic95_proportion(victoires_a, nb_valides)
 
-    res = {
+    return {
         "mode": "simple",
         "A": strat_a.nom,
         "B": strat_b.nom,
@@ -503,6 +1262,7 @@ def comparer_deux_strategies(
         "n_valid_games": nb_valides,
         "n_total_runs": nb_total,
         "n_timeouts": nb_timeouts,
+        "n_cycles": nb_cycles,
 
         "winrate_A_pct": winrate_a,
         "winrate_B_pct": winrate_b,
@@ -510,79 +1270,157 @@ def comparer_deux_strategies(
         "winrate_A_ci95_high_pct": 100.0 * haut,
 
         # avg_rounds_overall = moyenne des parties terminées
-        "avg_rounds_overall": moyenne(manches_parties_valides) if manches_parties_valides else float("nan"),
+        "avg_rounds_overall": manches_parties_valides.moyenne(),
+        "median_rounds_overall": manches_parties_valides.mediane(),
+        "std_rounds_overall": manches_parties_valides.ecart_type(),
+        "min_rounds_overall": manches_parties_valides.min if manches_parties_valides else "",
+        "max_rounds_overall": manches_parties_valides.max if manches_parties_valides else "",
 
         # avg_rounds_all_runs = moyenne de tous les runs, timeout inclus
         "avg_rounds_all_runs": (manches_total_tous_runs / nb_total) if nb_total > 0 else float("nan"),
 
-        "avg_rounds_when_A_wins": moyenne(manches_quand_a_gagne) if manches_quand_a_gagne else "",
-        "avg_rounds_when_B_wins": moyenne(manches_quand_b_gagne) if manches_quand_b_gagne else "",
-    }
+        "avg_rounds_when_A_wins": manches_quand_a_gagne.moyenne() if manches_quand_a_gagne else "",
+        "avg_rounds_when_B_wins": manches_quand_b_gagne.moyenne() if manches_quand_b_gagne else "",
 
-    if export_csv:
-        ecrire_ligne_csv(res)
+        "total_rounds_all_runs": manches_total_tous_runs,
 
-    return res
+        **_colonnes_latences(partiel["latences_a"], partiel["latences_b"]),
+    }
 
 
-def comparer_deux_strategies_repetitions(
+def comparer_deux_strategies(
     strat_a: Strategie,
     strat_b: Strategie,
     n_games: int,
     seed: int,
-    n_repetitions: int,
     print_every: int = 0,
     export_csv: bool = True,
     symetriser: bool = True,
     max_manches: int = 5000,
+    demi_largeur_cible_pct: Optional[float] = None,
+    decision_50: bool = False,
+    taille_lot: int = 50,
+    alpha: float = 0.05,
+    enregistreur: Optional[EnregistreurParties] = None,
+    telemetrie: Optional[Telemetrie] = None,
 ) -> Dict[str, object]:
     """
-    Analyse robuste (répétitions) :
-    - On répète l'expérience plusieurs fois.
-    - Chaque répétition utilise une seed différente.
-    - On résume :
-      moyenne / écart-type / médiane / min / max du winrate,
-      + agrégation globale sur toutes les répétitions.
+    UNE expérience :
+    - symetriser=True (recommandé) : on joue 2 parties par seed (A/B puis B/A)
+      => plus robuste et indépendant de l'ordre.
+    - symetriser=False : une seule partie par seed.
+
+    Les TIMEOUTS et les CYCLES (parties qui tournent en rond) sont comptés
+    et exclus du winrate.
+
+    Mode séquentiel (demi_largeur_cible_pct et/ou decision_50) : n_games devient
+    un maximum. Après chaque lot de taille_lot seeds, on s'arrête si
+      - l'intervalle séquentiel a une demi-largeur <= demi_largeur_cible_pct, ou
+      - decision_50 et l'intervalle est entièrement d'un côté de 50%.
+    Les bornes séquentielles restent valides (niveau 1 - alpha) malgré les
+    arrêts possibles à chaque lot : voir z_sequentiel.
+    Les seeds jouées sont les premières de la liste complète : un arrêt au lot k
+    donne le même résultat que n_games = k * taille_lot.
+
+    enregistreur : chaque partie y est aussi enregistrée individuellement
+    (voir stockage.EnregistreurParties), pour une analyse ultérieure.
+
+    telemetrie : reçoit l'avancement seed par seed (ligne de progression, ETA).
     """
-    winrates: List[float] = []
-    moyennes_manches_finies: List[float] = []
-    moyennes_manches_tous_runs: List[float] = []
-    timeouts: List[int] = []
+    sequentiel = demi_largeur_cible_pct is not None or decision_50
+    seeds = _tirer_seeds(seed, n_games)
+    partiel = _nouveau_partiel()
+    if enregistreur is not None:
+        matchup = _nouveau_matchup(enregistreur, strat_a, strat_b, n_games, seed, symetriser, max_manches)
+
+    if sequentiel:
+        n_regards = -(-n_games // taille_lot)
+        z = z_sequentiel(alpha, n_regards)
+        parties_par_seed = 2 if symetriser else 1
+        arret = "cap"
+        bas_seq, haut_seq = 0.0, 1.0
+
+    n_joues = 0
+    debut = _debut_mesure(strat_a, strat_b)
+    for k, s in enumerate(seeds, start=1):
+        issues = _jouer_seed(strat_a, strat_b, s, symetriser, max_manches, debut[0])
+        for issue, nb_manches, _ in issues:
+            _ajouter_issue(partiel, issue, nb_manches)
+        if enregistreur is not None:
+            _enregistrer_seed(enregistreur, matchup, s, issues)
+        if telemetrie is not None:
+            telemetrie.avancer(len(issues), sum(m for _, m, _ in issues))
+        n_joues = k
+
+        if print_every > 0 and (k % print_every == 0):
+            if telemetrie is not None:
+                telemetrie.effacer_ligne()
+            print("  Parties terminées:", k, "/", n_games)
+
+        if sequentiel and (k % taille_lot == 0 or k == n_games):
+            nb_valides = parties_par_seed * k - partiel["nb_timeouts"] - partiel["nb_cycles"]
+            bas_seq, haut_seq = intervalle_wilson(partiel["victoires_a"], nb_valides, z)
+            if demi_largeur_cible_pct is not None and 100.0 * (haut_seq - bas_seq) / 2.0 <= demi_largeur_cible_pct:
+                arret = "precision"
+                break
+            if decision_50 and (bas_seq > 0.5 or haut_seq < 0.5):
+                arret = "decision"
+                break
+
+    valider_cache_parties()
+    _fin_mesure(partiel, strat_a, strat_b, debut)
+    if telemetrie is not None:
+        telemetrie.compter_decisions(partiel["decisions_a"], partiel["decisions_b"])
+    if enregistreur is not None:
+        enregistreur.vider_tampon()
+    res = _resultat_simple(strat_a, strat_b, n_joues, seed, symetriser, partiel)
+
+    if sequentiel:
+        res["n_games_max"] = n_games
+        res["sequential_stop"] = arret
+        res["winrate_A_seq_low_pct"] = 100.0 * bas_seq
+        res["winrate_A_seq_high_pct"] = 100.0 * haut_seq
+
+    if export_csv:
+        ecrire_ligne_csv(res)
+
+    return res
+
+
+def _resultat_repetitions(
+    strat_a: Strategie,
+    strat_b: Strategie,
+    n_games: int,
+    seed: int,
+    resultats_reps: List[Dict[str, object]],
+) -> Dict[str, object]:
+    """Résume une liste de résultats "simple" (une par répétition)."""
+    winrates = Accumulateur()
+    moyennes_manches_finies = Accumulateur()
+    moyennes_manches_tous_runs = Accumulateur()
 
     total_wins_a = 0
     total_wins_b = 0
     total_valid_games = 0
     total_timeouts = 0
+    total_cycles = 0
+    total_manches = 0
+    latences_a = HistogrammeLatence()
+    latences_b = HistogrammeLatence()
 
-    for rep in range(n_repetitions):
-        seed_locale = seed + 10000 * rep
-
-        if print_every > 0:
-            print("Répétition", rep + 1, "/", n_repetitions)
-
-        res_rep = comparer_deux_strategies(
-            strat_a,
-            strat_b,
-            n_games=n_games,
-            seed=seed_locale,
-            print_every=print_every,
-            export_csv=False,
-            symetriser=symetriser,
-            max_manches=max_manches,
-        )
-
+    for res_rep in resultats_reps:
         try:
-            winrates.append(float(res_rep["winrate_A_pct"]))
+            winrates.ajouter(float(res_rep["winrate_A_pct"]))
         except Exception:
             pass
 
         try:
-            moyennes_manches_finies.append(float(res_rep["avg_rounds_overall"]))
+            moyennes_manches_finies.ajouter(float(res_rep["avg_rounds_overall"]))
         except Exception:
             pass
 
         try:
-            moyennes_manches_tous_runs.append(float(res_rep["avg_rounds_all_runs"]))
+            moyennes_manches_tous_runs.ajouter(float(res_rep["avg_rounds_all_runs"]))
         except Exception:
             pass
 
@@ -591,7 +1429,12 @@ def comparer_deux_strategies_repetitions(
             total_wins_b += int(res_rep.get("wins_B", 0))
             total_valid_games += int(res_rep.get("n_valid_games", 0))
             total_timeouts += int(res_rep.get("n_timeouts", 0))
-            timeouts.append(int(res_rep.get("n_timeouts", 0)))
+            total_cycles += int(res_rep.get("n_cycles", 0))
+            total_manches += int(res_rep.get("total_rounds_all_runs", 0))
+            if "latency_hist_A" in res_rep:
+                latences_a.fusionner(HistogrammeLatence.depuis_dict(res_rep["latency_hist_A"]))
+            if "latency_hist_B" in res_rep:
+                latences_b.fusionner(HistogrammeLatence.depuis_dict(res_rep["latency_hist_B"]))
         except Exception:
             pass
 
@@ -602,19 +1445,19 @@ def comparer_deux_strategies_repetitions(
         winrate_global = float("nan")
         bas_global, haut_global = 0.0, 1.0
 
-    res = {
+    return {
         "mode": "repetitions",
         "A": strat_a.nom,
         "B": strat_b.nom,
         "n_games": n_games,
         "seed": seed,
-        "n_repetitions": n_repetitions,
+        "n_repetitions": len(resultats_reps),
 
-        "winrate_A_mean_pct": moyenne(winrates),
-        "winrate_A_std_pct": ecart_type(winrates),
-        "winrate_A_median_pct": mediane(winrates),
-        "winrate_A_min_pct": min(winrates) if winrates else float("nan"),
-        "winrate_A_max_pct": max(winrates) if winrates else float("nan"),
+        "winrate_A_mean_pct": winrates.moyenne(),
+        "winrate_A_std_pct": winrates.ecart_type(),
+        "winrate_A_median_pct": winrates.mediane(),
+        "winrate_A_min_pct": winrates.min if winrates else float("nan"),
+        "winrate_A_max_pct": winrates.max if winrates else float("nan"),
 
         # Agrégation globale : on recombine toutes les répétitions
         "total_wins_A": total_wins_a,
@@ -622,18 +1465,89 @@ def comparer_deux_strategies_repetitions(
         "total_valid_games": total_valid_games,
         "total_timeouts": total_timeouts,
         "n_timeouts": total_timeouts,
+        "total_cycles": total_cycles,
+        "n_cycles": total_cycles,
 
         "winrate_A_global_pct": winrate_global,
         "winrate_A_global_ci95_low_pct": 100.0 * bas_global,
         "winrate_A_global_ci95_high_pct": 100.0 * haut_global,
 
-        "avg_rounds_overall_mean": moyenne(moyennes_manches_finies),
-        "avg_rounds_overall_std": ecart_type(moyennes_manches_finies),
+        "avg_rounds_overall_mean": moyennes_manches_finies.moyenne(),
+        "avg_rounds_overall_std": moyennes_manches_finies.ecart_type(),
 
-        "avg_rounds_all_runs_mean": moyenne(moyennes_manches_tous_runs),
-        "avg_rounds_all_runs_std": ecart_type(moyennes_manches_tous_runs),
+        "avg_rounds_all_runs_mean": moyennes_manches_tous_runs.moyenne(),
+        "avg_rounds_all_runs_std": moyennes_manches_tous_runs.ecart_type(),
+
+        "total_rounds_all_runs": total_manches,
+
+        **_colonnes_latences(latences_a, latences_b),
     }
 
+
+def _seed_repetition(seed: int, rep: int) -> int:
+    return seed + 10000 * rep
+
+
+def comparer_deux_strategies_repetitions(
+    strat_a: Strategie,
+    strat_b: Strategie,
+    n_games: int,
+    seed: int,
+    n_repetitions: int,
+    print_every: int = 0,
+    export_csv: bool = True,
+    symetriser: bool = True,
+    max_manches: int = 5000,
+    stockage: Optional[StockageResultats] = None,
+    enregistreur: Optional[EnregistreurParties] = None,
+    telemetrie: Optional[Telemetrie] = None,
+) -> Dict[str, object]:
+    """
+    Analyse robuste (répétitions) :
+    - On répète l'expérience plusieurs fois.
+    - Chaque répétition utilise une seed différente.
+    - On résume :
+      moyenne / écart-type / médiane / min / max du winrate,
+      + agrégation globale sur toutes les répétitions.
+
+    stockage : chaque répétition terminée y est enregistrée ; une répétition
+    déjà présente (mêmes paramètres) est relue au lieu d'être rejouée.
+    """
+    resultats_reps: List[Dict[str, object]] = []
+
+    for rep in range(n_repetitions):
+        seed_locale = _seed_repetition(seed, rep)
+
+        cle = _cle_repetition(strat_a, strat_b, n_games, seed_locale, symetriser, max_manches)
+        if stockage is not None:
+            deja = stockage.lire(cle)
+            if deja is not None:
+                resultats_reps.append(deja)
+                continue
+
+        if print_every > 0:
+            if telemetrie is not None:
+                telemetrie.effacer_ligne()
+            print("Répétition", rep + 1, "/", n_repetitions)
+
+        res_rep = comparer_deux_strategies(
+            strat_a,
+            strat_b,
+            n_games=n_games,
+            seed=seed_locale,
+            print_every=print_every,
+            export_csv=False,
+            symetriser=symetriser,
+            max_manches=max_manches,
+            enregistreur=enregistreur,
+            telemetrie=telemetrie,
+        )
+        if stockage is not None:
+            stockage.enregistrer(cle, "repetition", res_rep)
+        resultats_reps.append(res_rep)
+
+    res = _resultat_repetitions(strat_a, strat_b, n_games, seed, resultats_reps)
+
     if export_csv:
         ecrire_ligne_csv(res)
 
@@ -665,12 +1579,22 @@ def print_result(res: Dict[str, object]) -> None:
         else:
             print("Winrate: non disponible (trop de timeouts)")
 
+        if "sequential_stop" in res:
+            print(
+                f"Séquentiel: arrêt '{res['sequential_stop']}' après {n} / {res['n_games_max']} seeds"
+                f"   |   IC séquentiel: [{res['winrate_A_seq_low_pct']:.2f}% ; {res['winrate_A_seq_high_pct']:.2f}%]"
+            )
+
         print("-" * 72)
         if isinstance(res.get("avg_rounds_overall"), float):
             print(f"Avg rounds overall (parties finies): {res['avg_rounds_overall']:.2f}")
         else:
             print("Avg rounds overall (parties finies): non disponible")
 
+        if res.get("min_rounds_overall", "") != "":
+            print(f"Median / std / min / max rounds:    {res['median_rounds_overall']:g} / "
+                  f"{res['std_rounds_overall']:.2f} / {res['min_rounds_overall']} / {res['max_rounds_overall']}")
+
         if isinstance(res.get("avg_rounds_all_runs"), float):
             print(f"Avg rounds all runs (avec timeout): {res['avg_rounds_all_runs']:.2f}")
 
@@ -681,6 +1605,8 @@ def print_result(res: Dict[str, object]) -> None:
 
         print(f"Valid games: {res.get('n_valid_games', '')}")
         print(f"Timeouts: {res.get('n_timeouts', 0)}")
+        print(f"Cycles (parties sans fin détectées): {res.get('n_cycles', 0)}")
+        _print_latences(res)
         print("=" * 72)
         print()
 
@@ -711,14 +1637,405 @@ def print_result(res: Dict[str, object]) -> None:
         print(f"Total wins B: {res.get('total_wins_B', 0)}")
         print(f"Total valid games: {res.get('total_valid_games', 0)}")
         print(f"Timeouts (total): {res.get('total_timeouts', 0)}")
+        print(f"Cycles (total): {res.get('total_cycles', 0)}")
+        _print_latences(res)
         print("=" * 72)
         print()
 
 
+def _print_latences(res: Dict[str, object]) -> None:
+    """Latences de décision (si le profil était actif) : p50 / p90 / p99 par stratégie."""
+    for cote in ("A", "B"):
+        if "latency_%s_calls" % cote not in res:
+            continue
+        print(
+            f"Latence {cote} ({res[cote]}): {res['latency_%s_calls' % cote]} appels, "
+            f"{res['latency_%s_total_s' % cote]:.3f} s | p50 {res['latency_%s_p50_us' % cote]:.1f} µs"
+            f" | p90 {res['latency_%s_p90_us' % cote]:.1f} µs | p99 {res['latency_%s_p99_us' % cote]:.1f} µs"
+        )
+
+
+# ============================================================
+# ======================= CALIBRATION (MODELE DE COUT) ========
+# ============================================================
+
+def _positions_echantillon(n_positions: int, seed: int, n_parties_min: int = 30) -> Tuple[List[GameState], float]:
+    """
+    Positions variées (début, milieu et fin de partie) prises dans des parties
+    Random contre Random, et longueur moyenne de ces parties (au moins n_parties_min).
+    """
+    rng = random.Random(seed)
+    positions: List[GameState] = []
+    longueurs: List[int] = []
+    while len(positions) < n_positions or len(longueurs) < n_parties_min:
+        etat = creer_partie_bot_vs_bot(random.Random(rng.randrange(0, 2**31 - 1)))
+        manches = 0
+        while not etat.terminee and manches < 1000:
+            if len(positions) < n_positions and rng.random() < 0.1:
+                positions.append(etat.copie_legere())
+            etat.appliquer_manche(choix_robot_aleatoire(etat.rng))
+            manches += 1
+        longueurs.append(manches)
+    return positions, moyenne(longueurs)
+
+
+class ModeleCout:
+    """
+    Coût estimé d'une partie entre deux stratégies (voir calibrer_strategies) :
+
+    - cout_decision_s[nom] : durée médiane d'une décision de la stratégie
+    - cout_manche_s : durée d'une manche hors décision (moteur)
+    - manches_par_partie : longueur moyenne d'une partie
+
+    cout_partie_s(A, B) = manches_par_partie * (cout_manche_s + moyenne des deux décisions) :
+    chaque joueur décide une manche sur deux.
+    """
+
+    def __init__(self, cout_decision_s: Dict[str, float], cout_manche_s: float, manches_par_partie: float):
+        self.cout_decision_s = dict(cout_decision_s)
+        self.cout_manche_s = cout_manche_s
+        self.manches_par_partie = manches_par_partie
+
+    def cout_partie_s(self, strat_a: Strategie, strat_b: Strategie) -> float:
+        decisions = (self.cout_decision_s[strat_a.nom] + self.cout_decision_s[strat_b.nom]) / 2.0
+        return self.manches_par_partie * (self.cout_manche_s + decisions)
+
+    def est_grosse(self, strat: Strategie, facteur: float = 20.0) -> bool:
+        """Stratégie "grosse" : une décision coûte plus de facteur manches du moteur."""
+        return self.cout_decision_s[strat.nom] > facteur * self.cout_manche_s
+
+
+def calibrer_strategies(
+    strategies: List[Strategie],
+    n_positions: int = 40,
+    seed: int = 2024,
+    duree_max_s: float = 2.0,
+) -> ModeleCout:
+    """
+    Micro-benchmark : chaque stratégie décide sur les mêmes positions échantillons
+    (au moins 3, puis jusqu'à n_positions tant que duree_max_s n'est pas dépassée).
+    Chaque décision se fait sur une copie de la position (hasard propre), la copie
+    n'est pas chronométrée.
+    """
+    positions, manches_par_partie = _positions_echantillon(n_positions, seed)
+
+    durees_manche = []
+    for k, position in enumerate(positions):
+        copie = position.copie_legere()
+        copie.rng = random.Random(k)
+        debut = time.perf_counter()
+        copie.appliquer_manche("poids")
+        durees_manche.append(time.perf_counter() - debut)
+
+    couts: Dict[str, float] = {}
+    for strat in strategies:
+        durees = []
+        total = 0.0
+        for k, position in enumerate(positions):
+            if len(durees) >= 3 and total > duree_max_s:
+                break
+            copie = position.copie_legere()
+            copie.rng = random.Random(k)
+            debut = time.perf_counter()
+            strat.choisir(copie)
+            duree = time.perf_counter() - debut
+            durees.append(duree)
+            total += duree
+        couts[strat.nom] = mediane(durees)
+
+    return ModeleCout(couts, mediane(durees_manche), manches_par_partie)
+
+
+def _plan_effort_fixe(
+    plan: List[Tuple[Strategie, Strategie, int, bool]],
+    n_games_petit: int,
+    n_games_gros: int,
+    n_repetitions_gros: int,
+    modele: Optional[ModeleCout] = None,
+) -> List[Tuple[Strategie, Strategie, int, bool, int, int]]:
+    """
+    Effort historique : n_games_petit (1 expérience) ou n_games_gros x n_repetitions_gros.
+    Ordre : du plus long au plus court (coût estimé par le modèle, sinon nombre de parties).
+    """
+    entrees = []
+    for s1, s2, seed_locale, gros in plan:
+        n_games, n_reps = (n_games_gros, n_repetitions_gros) if gros else (n_games_petit, 1)
+        cout = n_games * n_reps * (modele.cout_partie_s(s1, s2) if modele is not None else 1.0)
+        entrees.append((cout, (s1, s2, seed_locale, gros, n_games, n_reps)))
+
+    entrees.sort(key=lambda e: -e[0])
+    return [e for _, e in entrees]
+
+
+def planifier_selon_budget(
+    plan: List[Tuple[Strategie, Strategie, int, bool]],
+    modele: ModeleCout,
+    budget_s: float,
+    n_processus: int = 1,
+    n_repetitions_gros: int = 5,
+    n_games_min: int = 20,
+    n_games_max: int = 5000,
+) -> List[Tuple[Strategie, Strategie, int, bool, int, int]]:
+    """
+    Effort par match-up pour tenir dans budget_s (temps mur, n_processus cœurs) :
+
+    1) gros = les deux stratégies sont grosses selon le modèle (est_grosse_strategie) ;
+    2) chaque match-up reçoit une part égale du budget, convertie en seeds
+       (2 parties par seed), bornée dans [n_games_min, n_games_max] ;
+       le budget libéré par les match-ups bornés est redistribué aux autres ;
+    3) un gros match-up répartit ses seeds sur n_repetitions_gros répétitions ;
+    4) ordre : du plus long au plus court (meilleur remplissage du pool,
+       et un lancement interrompu a déjà fait le plus cher).
+
+    Retourne des entrées (strat1, strat2, seed_locale, gros, n_games, n_repetitions).
+    """
+    budget_total = budget_s * max(1, n_processus)
+    cout_seed = [2.0 * modele.cout_partie_s(s1, s2) for s1, s2, _, _ in plan]
+    seeds = [0] * len(plan)
+
+    # répartition à parts égales, avec redistribution du budget des match-ups bornés
+    restants = list(range(len(plan)))
+    budget = budget_total
+    while restants:
+        part = budget / len(restants)
+        voulus = {i: (int(part / cout_seed[i]) if cout_seed[i] > 0 else n_games_max) for i in restants}
+        bornes = [i for i in restants if not (n_games_min < voulus[i] < n_games_max)]
+        if not bornes:
+            for i in restants:
+                seeds[i] = voulus[i]
+            break
+        for i in bornes:
+            seeds[i] = max(n_games_min, min(n_games_max, voulus[i]))
+            budget -= seeds[i] * cout_seed[i]
+            restants.remove(i)
+        budget = max(0.0, budget)
+
+    entrees = []
+    for i, (s1, s2, seed_locale, _) in enumerate(plan):
+        gros = est_grosse_strategie(s1, modele) and est_grosse_strategie(s2, modele)
+        n_reps = max(1, n_repetitions_gros) if gros else 1
+        n_games = max(1, seeds[i] // n_reps)
+        entrees.append((n_games * n_reps * cout_seed[i], (s1, s2, seed_locale, gros, n_games, n_reps)))
+
+    entrees.sort(key=lambda e: -e[0])
+    return [e for _, e in entrees]
+
+
 # ============================================================
 # ======================= COMPARAISON ADAPTATIVE =============
 # ============================================================
 
+# -----------------------
+# Reprise d'un tournoi (voir stockage.StockageResultats)
+# -----------------------
+
+def _cle_unite(*morceaux: object) -> str:
+    return "|".join(str(m) for m in morceaux)
+
+
+def _cle_repetition(
+    strat_a: Strategie,
+    strat_b: Strategie,
+    n_games: int,
+    seed: int,
+    symetriser: bool,
+    max_manches: int,
+) -> str:
+    """Une répétition : tout ce dont dépend son résultat."""
+    return _cle_unite(
+        "repetition", strat_a.nom, strat_a.version, strat_b.nom, strat_b.version,
+        n_games, seed, symetriser, max_manches,
+        _empreinte_paquet_courant(), _version_moteur_stats(),
+    )
+
+
+def _cle_matchup(strat_a: Strategie, strat_b: Strategie, seed: int, parametres: Tuple[object, ...]) -> str:
+    """Un match-up du tournoi : stratégies, seed locale et paramètres de l'expérience."""
+    return _cle_unite(
+        "matchup", strat_a.nom, strat_a.version, strat_b.nom, strat_b.version, seed,
+        *parametres, _empreinte_paquet_courant(), _version_moteur_stats(),
+    )
+
+
+def exporter_resultats_csv(stockage: StockageResultats, chemin: Optional[Path] = None) -> int:
+    """
+    Réécrit un CSV (data/results_export.csv par défaut) à partir des match-ups
+    du stockage, avec les colonnes de ecrire_ligne_csv. Renvoie le nombre de lignes.
+    """
+    if chemin is None:
+        chemin = chemin_results_csv().with_name("results_export.csv")
+    return stockage.exporter_csv(chemin, COLONNES_CSV)
+
+
+def run_export() -> None:
+    """
+    Point d'entrée : python sources/main.py export
+    """
+    stockage = StockageResultats(chemin_results_sqlite())
+    try:
+        n = exporter_resultats_csv(stockage)
+    finally:
+        stockage.fermer()
+    print("Match-ups exportés :", n, "->", chemin_results_csv().with_name("results_export.csv"))
+
+
+def _planifier_comparaisons(
+    seed: int,
+    modele: Optional[ModeleCout] = None,
+) -> List[Tuple[Strategie, Strategie, int, bool]]:
+    """
+    Liste des match-ups : (strat1, strat2, seed_locale, gros_vs_gros).
+    gros_vs_gros selon les coûts calibrés (modele), sinon selon les listes à la main.
+    """
+    plan = []
+    for i in range(len(STRATEGIES)):
+        for j in range(i + 1, len(STRATEGIES)):
+            strat1 = STRATEGIES[i]
+            strat2 = STRATEGIES[j]
+            gros = est_grosse_strategie(strat1, modele) and est_grosse_strategie(strat2, modele)
+            plan.append((strat1, strat2, seed + 1000 * i + j, gros))
+    return plan
+
+
+def _parametres_matchup(
+    gros: bool,
+    n_games: int,
+    n_repetitions: int,
+    max_manches: int,
+    demi_largeur_cible_pct: Optional[float] = None,
+    decision_50: bool = False,
+) -> Tuple[object, ...]:
+    """Paramètres qui définissent un match-up du tournoi (partie de sa clé de reprise)."""
+    if gros:
+        return ("repetitions", n_games, n_repetitions, max_manches)
+    return ("simple", n_games, max_manches, demi_largeur_cible_pct, decision_50)
+
+
+def _reprendre_matchup(stockage: Optional[StockageResultats], cle: str) -> Optional[Dict[str, object]]:
+    """Match-up déjà terminé lors d'un lancement précédent : on l'affiche sans le rejouer."""
+    if stockage is None:
+        return None
+    res = stockage.lire(cle)
+    if res is not None:
+        print(">>> Déjà calculé (repris du stockage) :", res["A"], "vs", res["B"])
+        print_result(res)
+    return res
+
+
+def _comparer_plan_en_parallele(
+    plan: List[Tuple[Strategie, Strategie, int, bool, int, int]],
+    export_csv: bool,
+    n_processus: int,
+    taille_morceau: int,
+    max_manches: int,
+    stockage: Optional[StockageResultats] = None,
+    enregistreur: Optional[EnregistreurParties] = None,
+    telemetrie: Optional[Telemetrie] = None,
+) -> None:
+    """
+    Mode multiprocessus, plan = [(strat1, strat2, seed_locale, gros, n_games, n_repetitions), ...] :
+    1) chaque (match-up, répétition, morceau de seeds) devient une unité de travail,
+       soumise dans l'ordre du plan (du plus long au plus court avec un budget) ;
+    2) les unités tournent sur un pool de processus ;
+    3) les partiels sont refusionnés dans l'ordre des seeds.
+
+    Chaque partie ne dépend que de sa seed (random.Random propre), donc le résultat est identique
+    (au bit près) à celui du mode série.
+
+    stockage : les match-ups et répétitions déjà terminés ne sont pas soumis au pool.
+    enregistreur : les processus renvoient le détail des parties, enregistré ici dans l'ordre des seeds.
+    telemetrie : avancement à chaque morceau terminé ; le temps CPU d'un match-up
+    est la somme de celui de ses morceaux.
+    """
+    taille_morceau = max(1, taille_morceau)
+
+    def _suivre(future) -> None:
+        if telemetrie is not None and not future.cancelled() and future.exception() is None:
+            telemetrie.avancer(*_volume_partiel(future.result()))
+
+    with ProcessPoolExecutor(
+        max_workers=n_processus,
+        initializer=_initialiser_processus,
+        initargs=(_CHEMIN_CACHE_PARTIES, _TAILLE_CACHE_PARTIES, PROFIL_LATENCES),
+    ) as pool:
+        travaux = []
+        for strat1, strat2, seed_locale, gros, n_games, n_repetitions in plan:
+            parametres = _parametres_matchup(gros, n_games, n_repetitions, max_manches)
+            cle = _cle_matchup(strat1, strat2, seed_locale, parametres)
+            if stockage is not None and stockage.lire(cle) is not None:
+                travaux.append((strat1, strat2, seed_locale, gros, cle, None, None, None))
+                continue
+
+            if gros:
+                seeds_reps = [_seed_repetition(seed_locale, rep) for rep in range(n_repetitions)]
+            else:
+                seeds_reps = [seed_locale]
+
+            futures_reps = []
+            for seed_rep in seeds_reps:
+                cle_rep = _cle_repetition(strat1, strat2, n_games, seed_rep, True, max_manches)
+                deja = stockage.lire(cle_rep) if (gros and stockage is not None) else None
+                if deja is not None:
+                    futures_reps.append((cle_rep, deja))
+                    continue
+
+                seeds = _tirer_seeds(seed_rep, n_games)
+                futures = [
+                    pool.submit(_jouer_lot, strat1, strat2, seeds[d:d + taille_morceau], True, max_manches,
+                                enregistreur is not None)
+                    for d in range(0, len(seeds), taille_morceau)
+                ]
+                for f in futures:
+                    f.add_done_callback(_suivre)
+                futures_reps.append((cle_rep, futures))
+
+            travaux.append((strat1, strat2, seed_locale, gros, cle, n_games, seeds_reps, futures_reps))
+
+        for strat1, strat2, seed_locale, gros, cle, n_games, seeds_reps, futures_reps in travaux:
+            if futures_reps is None:
+                _reprendre_matchup(stockage, cle)
+                continue
+
+            resultats_reps = []
+            cpu_s = 0.0
+            decisions = [0, 0]
+            for seed_rep, (cle_rep, futures) in zip(seeds_reps, futures_reps):
+                if isinstance(futures, dict):
+                    resultats_reps.append(futures)
+                    continue
+                partiels = [f.result() for f in futures]
+                cpu_s += sum(p["temps_cpu_s"] for p in partiels)
+                decisions[0] += sum(p["decisions_a"] for p in partiels)
+                decisions[1] += sum(p["decisions_b"] for p in partiels)
+                if enregistreur is not None:
+                    matchup = _nouveau_matchup(enregistreur, strat1, strat2, n_games, seed_rep, True, max_manches)
+                    for p in partiels:
+                        for s, issues in p.pop("parties"):
+                            _enregistrer_seed(enregistreur, matchup, s, issues)
+                    enregistreur.vider_tampon()
+                partiel = _fusionner_partiels(partiels)
+                res_rep = _resultat_simple(strat1, strat2, n_games, seed_rep, True, partiel)
+                if gros and stockage is not None:
+                    stockage.enregistrer(cle_rep, "repetition", res_rep)
+                resultats_reps.append(res_rep)
+
+            if telemetrie is not None:
+                telemetrie.effacer_ligne()
+            if gros:
+                print(">>> GROS vs GROS :", strat1.nom, "vs", strat2.nom)
+                res = _resultat_repetitions(strat1, strat2, n_games, seed_locale, resultats_reps)
+            else:
+                res = resultats_reps[0]
+
+            if telemetrie is not None:
+                telemetrie.fin_matchup(res, cpu_s=cpu_s, decisions=(decisions[0], decisions[1]))
+            if stockage is not None:
+                stockage.enregistrer(cle, "matchup", res)
+            if export_csv:
+                ecrire_ligne_csv(res)
+            print_result(res)
+
+
 def comparer_toutes_strategies_adaptatif(
     seed: int = 12345,
     n_games_petit: int = 80,
@@ -726,71 +2043,192 @@ def comparer_toutes_strategies_adaptatif(
     n_repetitions_gros: int = 5,
     print_every_gros: int = 50,
     export_csv: bool = True,
+    n_processus: int = 1,
+    taille_morceau: int = 25,
+    max_manches: int = 5000,
+    demi_largeur_cible_pct: Optional[float] = None,
+    decision_50: bool = False,
+    stockage: Optional[StockageResultats] = None,
+    enregistreur: Optional[EnregistreurParties] = None,
+    telemetrie: Optional[Telemetrie] = None,
+    budget_s: Optional[float] = None,
+    modele: Optional[ModeleCout] = None,
 ) -> None:
     """
     Compare toutes les stratégies entre elles, effort adaptatif.
+
+    n_processus > 1 : les parties sont réparties sur plusieurs processus
+    (morceaux de taille_morceau seeds), avec des résultats identiques au mode série.
+
+    demi_largeur_cible_pct / decision_50 : les petites comparaisons passent en
+    mode séquentiel (voir comparer_deux_strategies), n_games_petit devient un
+    maximum. Ce mode décide lot par lot : il tourne en série.
+
+    stockage : tournoi reprenable. Chaque match-up (et chaque répétition d'un
+    gros match-up) terminé y est enregistré dans sa propre transaction ; en
+    relançant avec les mêmes paramètres, les unités déjà terminées sont relues
+    (ni rejouées, ni réécrites dans le CSV).
+
+    enregistreur : détail de chaque partie jouée (voir stockage.EnregistreurParties).
+
+    telemetrie : ligne de progression avec ETA et chiffres par match-up
+    (voir Telemetrie) ; les match-ups repris du stockage ne comptent pas dans l'ETA.
+
+    modele : coûts des stratégies ; calibrés (calibrer_strategies) s'il n'est pas
+    fourni. Le classement gros / petit vient des coûts mesurés, et les match-ups
+    tournent du plus long au plus court.
+
+    budget_s : effort choisi par le modèle de coût (voir planifier_selon_budget)
+    au lieu de n_games_petit / n_games_gros.
     """
-    for i in range(len(STRATEGIES)):
-        for j in range(i + 1, len(STRATEGIES)):
-            strat1 = STRATEGIES[i]
-            strat2 = STRATEGIES[j]
+    if modele is None:
+        modele = calibrer_strategies(STRATEGIES)
+    if budget_s is None:
+        plan = _plan_effort_fixe(
+            _planifier_comparaisons(seed, modele), n_games_petit, n_games_gros, n_repetitions_gros, modele,
+        )
+    else:
+        plan = planifier_selon_budget(
+            _planifier_comparaisons(seed, modele), modele, budget_s,
+            n_processus=n_processus, n_repetitions_gros=n_repetitions_gros,
+        )
+    sequentiel = demi_largeur_cible_pct is not None or decision_50
 
-            seed_locale = seed + 1000 * i + j
+    if telemetrie is not None:
+        for strat1, strat2, seed_locale, gros, n_games, n_repetitions in plan:
+            parametres = _parametres_matchup(
+                gros, n_games, n_repetitions, max_manches, demi_largeur_cible_pct, decision_50,
+            )
+            if stockage is None or stockage.lire(_cle_matchup(strat1, strat2, seed_locale, parametres)) is None:
+                telemetrie.n_parties_prevues += _parties_prevues(n_games, n_repetitions)
+
+    if n_processus > 1 and not sequentiel:
+        _comparer_plan_en_parallele(
+            plan,
+            export_csv=export_csv,
+            n_processus=n_processus,
+            taille_morceau=taille_morceau,
+            max_manches=max_manches,
+            stockage=stockage,
+            enregistreur=enregistreur,
+            telemetrie=telemetrie,
+        )
+        return
 
-            strat1_grosse = est_grosse_strategie(strat1)
-            strat2_grosse = est_grosse_strategie(strat2)
+    for strat1, strat2, seed_locale, gros, n_games, n_repetitions in plan:
+        parametres = _parametres_matchup(
+            gros, n_games, n_repetitions, max_manches, demi_largeur_cible_pct, decision_50,
+        )
+        cle = _cle_matchup(strat1, strat2, seed_locale, parametres)
+        if _reprendre_matchup(stockage, cle) is not None:
+            continue
+
+        if telemetrie is not None:
+            telemetrie.debut_matchup(strat1, strat2)
+        if gros:
+            print(">>> GROS vs GROS :", strat1.nom, "vs", strat2.nom)
+            res = comparer_deux_strategies_repetitions(
+                strat1,
+                strat2,
+                n_games=n_games,
+                seed=seed_locale,
+                n_repetitions=n_repetitions,
+                print_every=print_every_gros,
+                export_csv=False,
+                symetriser=True,
+                max_manches=max_manches,
+                stockage=stockage,
+                enregistreur=enregistreur,
+                telemetrie=telemetrie,
+            )
+        else:
+            res = comparer_deux_strategies(
+                strat1,
+                strat2,
+                n_games=n_games,
+                seed=seed_locale,
+                print_every=0,
+                export_csv=False,
+                symetriser=True,
+                max_manches=max_manches,
+                demi_largeur_cible_pct=demi_largeur_cible_pct,
+                decision_50=decision_50,
+                enregistreur=enregistreur,
+                telemetrie=telemetrie,
+            )
 
-            if strat1_grosse and strat2_grosse:
-                print(">>> GROS vs GROS :", strat1.nom, "vs", strat2.nom)
-                res = comparer_deux_strategies_repetitions(
-                    strat1,
-                    strat2,
-                    n_games=n_games_gros,
-                    seed=seed_locale,
-                    n_repetitions=n_repetitions_gros,
-                    print_every=print_every_gros,
-                    export_csv=export_csv,
-                    symetriser=True,
-                )
-                print_result(res)
-            else:
-                res = comparer_deux_strategies(
-                    strat1,
-                    strat2,
-                    n_games=n_games_petit,
-                    seed=seed_locale,
-                    print_every=0,
-                    export_csv=export_csv,
-                    symetriser=True,
-                )
-                print_result(res)
+        if telemetrie is not None:
+            telemetrie.fin_matchup(res)
+        if stockage is not None:
+            stockage.enregistrer(cle, "matchup", res)
+        if export_csv:
+            ecrire_ligne_csv(res)
+        print_result(res)
 
 
-def run_stats() -> None:
+def run_stats(
+    enregistrer_parties: bool = False,
+    profil_latences: bool = False,
+    budget_s: Optional[float] = None,
+) -> None:
     """
     Point d'entrée : python sources/main.py stats
+
+    enregistrer_parties (python sources/main.py stats --parties) : détail de
+    chaque partie dans data/parties/ (voir stockage.charger_parties).
+
+    profil_latences (--latences) : chronomètre chaque décision ; p50/p90/p99
+    par stratégie et par match-up dans les résultats et le CSV.
+
+    budget_s (--budget=SECONDES) : choisit le nombre de parties de chaque
+    match-up pour tenir dans ce temps (voir planifier_selon_budget).
+
+    Les stratégies sont d'abord calibrées (calibrer_strategies) : le classement
+    gros / petit vient du coût mesuré d'une décision.
     """
     print("=== MODE STATS (sans pygame) ===")
+    print("Calibration des stratégies (coût d'une décision)...")
+    modele = calibrer_strategies(STRATEGIES)
     print("Stratégies disponibles:")
     for s in STRATEGIES:
-        tag = ""
-        if est_grosse_strategie(s):
-            tag = " (GROSSE)"
-        elif est_petite_strategie(s):
-            tag = " (petite)"
-        print(" -", s.nom + tag)
+        tag = " (GROSSE)" if est_grosse_strategie(s, modele) else " (petite)"
+        print(f" - {s.nom}: {1e6 * modele.cout_decision_s[s.nom]:.1f} µs / décision{tag}")
     print()
 
     seed = 12345
 
-    comparer_toutes_strategies_adaptatif(
-        seed=seed,
-        n_games_petit=500,
-        n_games_gros=400,
-        n_repetitions_gros=6,
-        print_every_gros=50,
-        export_csv=True,
-    )
+    # Parties déjà simulées (mêmes stratégies, seeds, paquet, moteur) : relues sur disque.
+    # Tournoi reprenable : un lancement interrompu repart du premier match-up non terminé.
+    # Le profil des latences mesure les décisions : il rejoue tout (ni cache, ni reprise).
+    activer_cache_parties(None if profil_latences else chemin_cache_parties())
+    activer_profil_latences(profil_latences)
+    stockage = None if profil_latences else StockageResultats(chemin_results_sqlite())
+
+    enregistreur = EnregistreurParties(chemin_parties()) if enregistrer_parties else None
+
+    # Progression en direct (stderr) + résumé JSON à côté de results.csv
+    telemetrie = Telemetrie()
+    try:
+        comparer_toutes_strategies_adaptatif(
+            seed=seed,
+            n_games_petit=500,
+            n_games_gros=400,
+            n_repetitions_gros=6,
+            print_every_gros=50,
+            export_csv=True,
+            n_processus=os.cpu_count() or 1,
+            stockage=stockage,
+            enregistreur=enregistreur,
+            telemetrie=telemetrie,
+            budget_s=budget_s,
+            modele=modele,
+        )
+    finally:
+        print("Télémétrie :", telemetrie.ecrire_resume())
+        if stockage is not None:
+            stockage.fermer()
+        if enregistreur is not None:
+            enregistreur.fermer()
 
 
 if __name__ == "__main__":
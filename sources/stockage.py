@@ -0,0 +1,346 @@
+# -*- coding: utf-8 -*-
+"""
+Stockage sur disque des simulations (sans pygame).
+
+- CacheParties : résultat (gagnant, nb_manches, premier joueur) de chaque partie déjà simulée.
+  Une partie ne dépend que de (stratégies, seed, max_manches, paquet, moteur) :
+  si rien de tout ça n'a changé, on relit le résultat au lieu de rejouer.
+- StockageResultats : résultats agrégés (répétitions, match-ups) d'un tournoi,
+  pour reprendre un tournoi interrompu et réexporter le CSV.
+- EnregistreurParties : le détail partie par partie, en colonnes NumPy
+  écrites par morceaux (mémoire bornée), relues sans copie (np.memmap).
+"""
+
+import csv
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+def empreinte_paquet(liste_animaux: Iterable[object]) -> str:
+    """
+    Empreinte (sha1) du contenu du paquet : noms et caractéristiques, dans l'ordre.
+    L'ordre compte : la distribution mélange la liste telle quelle.
+    """
+    h = hashlib.sha1()
+    for a in liste_animaux:
+        h.update(repr((a.nom, a.poids, a.longueur, a.longevite)).encode("utf-8"))
+    return h.hexdigest()
+
+
+class CacheParties:
+    """
+    Cache persistant (SQLite) des parties simulées.
+
+    - lire(cle) -> (gagnant, nb_manches, premier) ou None ; premier = bot qui a commencé
+    - ecrire(cle, gagnant, nb_manches, premier)
+    - valider() : écrit sur disque (les écritures sont groupées par transactions)
+      puis évince les entrées les moins récemment utilisées au-delà de taille_max.
+
+    Une lecture trouvée ne fait pas d'UPDATE : sa récence attend en mémoire et
+    part en un seul executemany à la validation. Le nombre de lignes est suivi en
+    mémoire (lignes au départ + écritures de ce processus) ; COUNT(*) n'est refait
+    que si la limite semble dépassée.
+
+    Plusieurs processus peuvent partager le même fichier (mode WAL) :
+    chacun ouvre sa propre connexion.
+    """
+
+    def __init__(self, chemin, taille_max: int = 500_000, ecritures_par_transaction: int = 200):
+        self.chemin = Path(chemin)
+        self.taille_max = taille_max
+        self.ecritures_par_transaction = max(1, ecritures_par_transaction)
+        self.trouves = 0
+        self.manques = 0
+        self._en_attente = 0
+        self._usages: Dict[str, int] = {}
+
+        self.chemin.parent.mkdir(parents=True, exist_ok=True)
+        self._connexion = sqlite3.connect(str(self.chemin), timeout=60)
+        self._connexion.execute("PRAGMA journal_mode=WAL")
+        self._connexion.execute("PRAGMA synchronous=NORMAL")
+        colonnes = [c[1] for c in self._connexion.execute("PRAGMA table_info(parties)")]
+        if colonnes and "premier" not in colonnes:
+            # ancien format (sans le premier joueur) : le cache se reconstruit
+            self._connexion.execute("DROP TABLE parties")
+        self._connexion.execute(
+            "CREATE TABLE IF NOT EXISTS parties ("
+            " cle TEXT PRIMARY KEY,"
+            " gagnant TEXT NOT NULL,"
+            " manches INTEGER NOT NULL,"
+            " premier TEXT NOT NULL,"
+            " utilise INTEGER NOT NULL)"
+        )
+        self._connexion.execute("CREATE INDEX IF NOT EXISTS parties_utilise ON parties(utilise)")
+        self._connexion.commit()
+
+        ligne = self._connexion.execute("SELECT MAX(utilise) FROM parties").fetchone()
+        self._horloge = (ligne[0] or 0) + 1
+        self._nb_lignes = len(self)
+
+    def __len__(self) -> int:
+        return self._connexion.execute("SELECT COUNT(*) FROM parties").fetchone()[0]
+
+    def _tic(self) -> int:
+        self._horloge += 1
+        return self._horloge
+
+    def lire(self, cle: str) -> Optional[Tuple[str, int, str]]:
+        ligne = self._connexion.execute(
+            "SELECT gagnant, manches, premier FROM parties WHERE cle = ?", (cle,)
+        ).fetchone()
+        if ligne is None:
+            self.manques += 1
+            return None
+
+        self.trouves += 1
+        self._usages[cle] = self._tic()
+        if len(self._usages) >= self.ecritures_par_transaction:
+            self.valider()
+        return ligne[0], int(ligne[1]), ligne[2]
+
+    def ecrire(self, cle: str, gagnant: str, nb_manches: int, premier: str) -> None:
+        self._connexion.execute(
+            "INSERT OR REPLACE INTO parties (cle, gagnant, manches, premier, utilise) VALUES (?, ?, ?, ?, ?)",
+            (cle, gagnant, int(nb_manches), premier, self._tic()),
+        )
+        self._usages.pop(cle, None)
+        # majorant : un remplacement compte aussi comme une ligne de plus
+        self._nb_lignes += 1
+        self._en_attente += 1
+        if self._en_attente >= self.ecritures_par_transaction:
+            self.valider()
+
+    def valider(self) -> None:
+        """Valide la transaction en cours, puis applique la limite de taille (LRU)."""
+        if self._en_attente == 0 and not self._usages:
+            return
+
+        if self._usages:
+            self._connexion.executemany(
+                "UPDATE parties SET utilise = ? WHERE cle = ?",
+                [(utilise, cle) for cle, utilise in self._usages.items()],
+            )
+            self._usages.clear()
+
+        if self._en_attente and self._nb_lignes > self.taille_max:
+            # recalage sur la table : remplacements, écritures des autres processus
+            self._nb_lignes = len(self)
+            en_trop = self._nb_lignes - self.taille_max
+            if en_trop > 0:
+                self._connexion.execute(
+                    "DELETE FROM parties WHERE cle IN"
+                    " (SELECT cle FROM parties ORDER BY utilise LIMIT ?)",
+                    (en_trop,),
+                )
+                self._nb_lignes = self.taille_max
+        self._en_attente = 0
+        self._connexion.commit()
+
+    def vider(self) -> None:
+        self._connexion.execute("DELETE FROM parties")
+        self._connexion.commit()
+        self._en_attente = 0
+        self._usages.clear()
+        self._nb_lignes = 0
+
+    def fermer(self) -> None:
+        self.valider()
+        self._connexion.close()
+
+
+class StockageResultats:
+    """
+    Résultats des comparaisons (SQLite), une ligne par unité terminée :
+
+    - niveau "repetition" : une répétition d'un match-up gros vs gros
+    - niveau "matchup"    : le résultat final d'un match-up (la ligne du CSV)
+
+    Chaque unité est écrite dans sa propre transaction : un tournoi interrompu
+    garde tout ce qui était terminé et reprend là où il s'était arrêté
+    (lire(cle) renvoie le résultat déjà calculé).
+    """
+
+    def __init__(self, chemin):
+        self.chemin = Path(chemin)
+        self.chemin.parent.mkdir(parents=True, exist_ok=True)
+        self._connexion = sqlite3.connect(str(self.chemin), timeout=60)
+        self._connexion.execute(
+            "CREATE TABLE IF NOT EXISTS resultats ("
+            " cle TEXT PRIMARY KEY,"
+            " niveau TEXT NOT NULL,"
+            " a TEXT NOT NULL,"
+            " b TEXT NOT NULL,"
+            " seed INTEGER NOT NULL,"
+            " donnees TEXT NOT NULL)"
+        )
+        self._connexion.commit()
+
+    def __len__(self) -> int:
+        return self._connexion.execute("SELECT COUNT(*) FROM resultats").fetchone()[0]
+
+    def lire(self, cle: str) -> Optional[Dict[str, object]]:
+        ligne = self._connexion.execute(
+            "SELECT donnees FROM resultats WHERE cle = ?", (cle,)
+        ).fetchone()
+        if ligne is None:
+            return None
+        return json.loads(ligne[0])
+
+    def enregistrer(self, cle: str, niveau: str, res: Dict[str, object]) -> None:
+        with self._connexion:
+            self._connexion.execute(
+                "INSERT OR REPLACE INTO resultats (cle, niveau, a, b, seed, donnees) VALUES (?, ?, ?, ?, ?, ?)",
+                (cle, niveau, str(res.get("A", "")), str(res.get("B", "")), int(res.get("seed", 0)), json.dumps(res)),
+            )
+
+    def resultats(self, niveau: str = "matchup") -> List[Dict[str, object]]:
+        """Résultats d'un niveau, dans l'ordre où ils ont été terminés."""
+        lignes = self._connexion.execute(
+            "SELECT donnees FROM resultats WHERE niveau = ? ORDER BY rowid", (niveau,)
+        ).fetchall()
+        return [json.loads(l[0]) for l in lignes]
+
+    def exporter_csv(self, chemin, colonnes: List[str], niveau: str = "matchup") -> int:
+        """
+        Réécrit chemin avec les résultats du niveau demandé, mêmes colonnes et
+        même séparateur (;) que data/results.csv. Renvoie le nombre de lignes.
+        """
+        lignes = self.resultats(niveau)
+        chemin = Path(chemin)
+        chemin.parent.mkdir(parents=True, exist_ok=True)
+        with chemin.open("w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=colonnes, delimiter=";")
+            writer.writeheader()
+            for res in lignes:
+                writer.writerow({c: res.get(c, "") for c in colonnes})
+        return len(lignes)
+
+    def fermer(self) -> None:
+        self._connexion.close()
+
+
+# Issue d'une partie, du point de vue de A (colonne "gagnant")
+ISSUES_PARTIE = ("A", "B", "TIMEOUT", "CYCLE")
+CODE_ISSUE = {issue: i for i, issue in enumerate(ISSUES_PARTIE)}
+
+COLONNES_PARTIES = (
+    ("matchup", np.int32),   # identifiant de l'expérience (voir matchups.json)
+    ("seed", np.int64),
+    ("cote", np.int8),       # 0 : A joue BotA ; 1 : partie symétrisée, A joue BotB
+    ("gagnant", np.int8),    # indice dans ISSUES_PARTIE
+    ("manches", np.int32),
+    ("premier", np.int8),    # 0 : A commence ; 1 : B commence
+)
+
+
+class EnregistreurParties:
+    """
+    Enregistre chaque partie (matchup, seed, cote, gagnant, manches, premier)
+    dans des tableaux NumPy préalloués de taille_tampon lignes.
+
+    Quand le tampon est plein, chaque colonne est ajoutée en binaire brut à
+    dossier/<colonne>.bin : la mémoire reste bornée quel que soit le nombre de
+    parties. meta.json garde le type et le nombre de lignes de chaque colonne,
+    matchups.json la description de chaque expérience.
+
+    Relecture : charger_parties(dossier) -> colonnes en np.memmap (sans copie).
+    """
+
+    def __init__(self, dossier, taille_tampon: int = 65_536):
+        self.dossier = Path(dossier)
+        self.dossier.mkdir(parents=True, exist_ok=True)
+        self.taille_tampon = max(1, taille_tampon)
+        self._tampon = {nom: np.empty(self.taille_tampon, dtype=t) for nom, t in COLONNES_PARTIES}
+        self._n_tampon = 0
+
+        meta = _lire_json(self.dossier / "meta.json", {"n": 0})
+        self.n_ecrites = int(meta["n"])
+        self.matchups: List[Dict[str, object]] = _lire_json(self.dossier / "matchups.json", [])
+
+        # Arrêt brutal entre l'écriture des colonnes et celle de meta.json :
+        # on retire les lignes non déclarées pour garder les colonnes alignées.
+        for nom, t in COLONNES_PARTIES:
+            chemin = self.dossier / (nom + ".bin")
+            taille = self.n_ecrites * np.dtype(t).itemsize
+            if chemin.exists() and chemin.stat().st_size > taille:
+                with chemin.open("r+b") as f:
+                    f.truncate(taille)
+
+    def __len__(self) -> int:
+        return self.n_ecrites + self._n_tampon
+
+    def nouveau_matchup(self, **description: object) -> int:
+        """Déclare une expérience (A, B, seed, ...) et renvoie son identifiant."""
+        self.matchups.append(dict(description))
+        return len(self.matchups) - 1
+
+    def ajouter(self, matchup: int, seed: int, cote: int, issue: str, manches: int, premier: int) -> None:
+        i = self._n_tampon
+        t = self._tampon
+        t["matchup"][i] = matchup
+        t["seed"][i] = seed
+        t["cote"][i] = cote
+        t["gagnant"][i] = CODE_ISSUE[issue]
+        t["manches"][i] = manches
+        t["premier"][i] = premier
+        self._n_tampon = i + 1
+        if self._n_tampon == self.taille_tampon:
+            self.vider_tampon()
+
+    def vider_tampon(self) -> None:
+        """Ajoute le tampon aux fichiers de colonnes, puis met à jour les métadonnées."""
+        n = self._n_tampon
+        if n:
+            for nom, _ in COLONNES_PARTIES:
+                with (self.dossier / (nom + ".bin")).open("ab") as f:
+                    self._tampon[nom][:n].tofile(f)
+            self.n_ecrites += n
+            self._n_tampon = 0
+
+        meta = {
+            "n": self.n_ecrites,
+            "colonnes": {nom: np.dtype(t).str for nom, t in COLONNES_PARTIES},
+            "issues": list(ISSUES_PARTIE),
+        }
+        _ecrire_json(self.dossier / "meta.json", meta)
+        _ecrire_json(self.dossier / "matchups.json", self.matchups)
+
+    def fermer(self) -> None:
+        self.vider_tampon()
+
+
+def charger_parties(dossier) -> Dict[str, np.ndarray]:
+    """
+    Colonnes écrites par EnregistreurParties, en lecture seule et sans copie
+    (np.memmap) : seules les pages effectivement lues sont chargées.
+    """
+    dossier = Path(dossier)
+    meta = _lire_json(dossier / "meta.json", {"n": 0, "colonnes": {}})
+    n = int(meta["n"])
+    colonnes = {}
+    for nom, type_str in meta["colonnes"].items():
+        if n == 0:
+            colonnes[nom] = np.empty(0, dtype=type_str)
+        else:
+            colonnes[nom] = np.memmap(dossier / (nom + ".bin"), dtype=type_str, mode="r", shape=(n,))
+    return colonnes
+
+
+def _lire_json(chemin: Path, defaut):
+    if not chemin.exists():
+        return defaut
+    with chemin.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _ecrire_json(chemin: Path, donnees) -> None:
+    """Écriture atomique (fichier temporaire puis remplacement)."""
+    tmp = chemin.with_name(chemin.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(donnees, f)
+    tmp.replace(chemin)
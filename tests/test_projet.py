@@ -6,10 +6,20 @@ Exécution :
     python tests/test_projet.py
 """
  
+import io
+import json
+import os
+import random
 import sys
+import tempfile
+import time
 import unittest
+from unittest import mock
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import numpy as np
+
 # Permet d'importer les modules depuis sources/
 RACINE = Path(__file__).resolve().parents[1]
 SOURCES = RACINE / "sources"
@@ -19,6 +29,19 @@ if str(SOURCES) not in sys.path:
 import cerveau
 import stats
 
+# Tests de l'interface pygame : sans fenêtre ni son
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+def importer_game_pygame(test):
+    """Module game_pygame, ou test ignoré si pygame n'est pas installé."""
+    try:
+        import game_pygame
+    except ImportError:
+        test.skipTest("pygame absent")
+    return game_pygame
+
 
 class TestProjetDefiNature(unittest.TestCase):
     def test_liste_animaux_non_vide(self):
@@ -74,6 +97,805 @@ class TestProjetDefiNature(unittest.TestCase):
         self.assertIn("winrate_A_pct", res)
         self.assertIn("n_timeouts", res)
 
+    def test_moteur_vectorise_meme_regle_que_gamestate(self):
+        # égalité sur "longueur" (84 vs 84) : le joueur actif perd
+        a = cerveau.Animaux("a", 10, 84, 5)
+        b = cerveau.Animaux("b", 5, 84, 9)
+        deck = [a, b, cerveau.Animaux("c", 1, 1, 1), cerveau.Animaux("d", 2, 2, 2)]
+        for carac in cerveau.CARACS:
+            game = cerveau.GameState(cerveau.Joueur("J1", [deck[2], a]), cerveau.Joueur("J2", [deck[3], b]))
+            moteur = cerveau.MoteurVectorise.depuis_partie(game, 4, deck)
+            game.appliquer_manche(carac)
+            moteur.appliquer_manches([cerveau.CARACS.index(carac)] * 4)
+            attendu = 0 if game.dernier_gagnant is game.joueurs[0] else 1
+            self.assertTrue((moteur.tailles[:, attendu] == 3).all())
+            self.assertTrue((moteur.actif == 1).all())
+
+    def test_moteur_vectorise_conserve_les_cartes(self):
+        moteur = cerveau.MoteurVectorise.distribuer(cerveau.LISTE_ANIMAUX, 200)
+        for _ in range(30):
+            moteur.appliquer_manches(cerveau.politique_aleatoire_vectorisee(moteur))
+        n = len(cerveau.LISTE_ANIMAUX)
+        self.assertTrue((moteur.tailles.sum(axis=1) == n).all())
+        for g in range(moteur.piles.shape[0]):
+            cartes = list(moteur.piles[g, 0, :moteur.tailles[g, 0]]) + list(moteur.piles[g, 1, :moteur.tailles[g, 1]])
+            self.assertEqual(sorted(cartes), list(range(n)))
+
+    def test_stats_parallele_identique_a_la_serie(self):
+        strat_a = stats.STRATEGIE_PAR_NOM["Random"]
+        strat_b = stats.STRATEGIE_PAR_NOM["MeanRatio(hist)"]
+        serie = stats.comparer_deux_strategies(strat_a, strat_b, n_games=6, seed=5, export_csv=False, max_manches=300)
+
+        seeds = stats._tirer_seeds(5, 6)
+        morceaux = [seeds[0:2], seeds[2:4], seeds[4:6]]
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            partiels = list(pool.map(stats._jouer_lot, [strat_a] * 3, [strat_b] * 3, morceaux, [True] * 3, [300] * 3))
+        parallele = stats._resultat_simple(strat_a, strat_b, 6, 5, True, stats._fusionner_partiels(partiels))
+        self.assertEqual(parallele, serie)
+
+    def test_partie_stats_rng_propre_sans_toucher_au_hasard_global(self):
+        strat_a = stats.STRATEGIE_PAR_NOM["Random"]
+        strat_b = stats.STRATEGIE_PAR_NOM["MedianRatio(hist)"]
+        random.seed(42)
+        etat_global = random.getstate()
+        r1 = stats.jouer_une_partie(strat_a, strat_b, seed=11, max_manches=300)
+        self.assertEqual(random.getstate(), etat_global)
+        r2 = stats.jouer_une_partie(strat_a, strat_b, seed=11, max_manches=300)
+        self.assertEqual(r1, r2)
+
+    def test_partie_avec_rng_explicite_reproductible(self):
+        g1 = cerveau.creer_partie("PVP", rng=random.Random(3))
+        g2 = cerveau.creer_partie("PVP", rng=random.Random(3))
+        for _ in range(10):
+            g1.appliquer_manche(cerveau.choix_robot_aleatoire(g1.rng))
+            g2.appliquer_manche(cerveau.choix_robot_aleatoire(g2.rng))
+        self.assertEqual([c.nom for c in g1.joueurs[0].cartes], [c.nom for c in g2.joueurs[0].cartes])
+
+    def test_invariants_incrementaux_detectent_une_carte_perdue(self):
+        game = cerveau.creer_partie("PVP", rng=random.Random(1))
+        game.appliquer_manche("poids")
+        game.joueurs[0].cartes.pop()
+        with self.assertRaises(AssertionError):
+            game.appliquer_manche("longueur")
+
+    def test_audit_complet_periodique(self):
+        c1, c2 = cerveau.distribuer_cartes(cerveau.LISTE_ANIMAUX, random.Random(2))
+        game = cerveau.GameState(cerveau.Joueur("A", c1), cerveau.Joueur("B", c2), rng=random.Random(2), audit_tous_les=3)
+        for _ in range(9):
+            if game.terminee:
+                break
+            game.appliquer_manche("longevite")
+        game._verifier_invariants()
+        self.assertEqual(sum(game.compte_cartes), len(cerveau.LISTE_ANIMAUX))
+
+        # piles corrompues sans changer leur longueur : seul l'audit complet peut le voir
+        for corrompre in ("echange", "doublon"):
+            c1, c2 = cerveau.distribuer_cartes(cerveau.LISTE_ANIMAUX, random.Random(2))
+            game = cerveau.GameState(cerveau.Joueur("A", c1), cerveau.Joueur("B", c2), rng=random.Random(2), audit_tous_les=1)
+            game.appliquer_manche("longevite")
+            a, b = game.joueurs[0].cartes, game.joueurs[1].cartes
+            if corrompre == "echange":
+                a[0], b[0] = b[0], a[0]  # une carte change de joueur dans chaque sens
+            else:
+                a[0] = a[1]  # une carte remplacée par un doublon
+            with self.assertRaises(AssertionError):
+                game.appliquer_manche("longevite")
+
+    def test_agregats_historique_memes_decisions_que_les_listes(self):
+        game = cerveau.creer_partie("PVP", rng=random.Random(4))
+        for _ in range(40):
+            if game.terminee:
+                break
+            carte = game.joueur_actif.carte_visible()
+            if game.historique_cartes:
+                self.assertEqual(
+                    cerveau.choix_robot_intelligent(carte, game.historique_cartes),
+                    cerveau.choix_robot_intelligent(carte, game.agregats_historique),
+                )
+                self.assertEqual(
+                    cerveau.choix_robot_intelligent_moyenne(carte, game.historique_cartes),
+                    cerveau.choix_robot_intelligent_moyenne(carte, game.agregats_historique),
+                )
+            game.appliquer_manche(cerveau.choix_robot_aleatoire(game.rng))
+
+    def test_agregats_mediane_exacte(self):
+        agregats = cerveau.AgregatsHistorique()
+        for a in cerveau.LISTE_ANIMAUX[:5]:
+            agregats.ajouter(a)
+        attendu = sorted(a.poids for a in cerveau.LISTE_ANIMAUX[:5])[2]
+        self.assertEqual(agregats.medianes()[0], attendu)
+
+    def test_monte_carlo_batch_valide_et_reproductible(self):
+        choix = []
+        for _ in range(2):
+            game = cerveau.creer_partie("RI", rng=random.Random(6))
+            for _ in range(5):
+                game.appliquer_manche(cerveau.choix_robot_aleatoire(game.rng))
+            choix.append(cerveau.choix_robot_monte_carlo_batch(game, "median"))
+            choix.append(cerveau.choix_robot_monte_carlo_batch(game, "random"))
+            choix.append(cerveau.choix_robot_monte_carlo_batch(game, "random", essais_max=60, taille_lot=15))
+        for c in choix[:3]:
+            self.assertIn(c, cerveau.CARACS)
+        self.assertEqual(choix[:3], choix[3:])
+
+    def test_monte_carlo_batch_arret_anticipe(self):
+        # une carte chacun : "poids" gagne la partie, les deux autres la perdent
+        a = cerveau.Animaux("a", 10, 1, 1)
+        b = cerveau.Animaux("b", 5, 9, 9)
+        game = cerveau.GameState(cerveau.Joueur("A", [a]), cerveau.Joueur("B", [b]), rng=random.Random(3))
+        with mock.patch.object(cerveau.MoteurVectorise, "depuis_partie",
+                               wraps=cerveau.MoteurVectorise.depuis_partie) as depuis_partie:
+            choix = cerveau.choix_robot_monte_carlo_batch(game, "random", essais_max=120, taille_lot=20)
+        self.assertEqual(choix, "poids")
+        self.assertEqual(depuis_partie.call_count, 1)  # 1 lot sur 6
+        game_pygame = importer_game_pygame(self)
+        game = cerveau.creer_partie("RA", rng=random.Random(1))
+        game.mode_robot = "MC_R"
+        robot = game_pygame.RobotEnArrierePlan()
+        try:
+            robot.lancer(game)
+            self.assertTrue(robot.en_cours())
+            # une autre partie (Rejouer) ne récupère pas le résultat
+            self.assertIsNone(robot.resultat(cerveau.creer_partie("PVP")))
+            debut = time.time()
+            while not robot.pret() and time.time() - debut < 30:
+                time.sleep(0.001)
+            self.assertTrue(robot.pret())
+            car = robot.resultat(game)
+            self.assertIn(car, cerveau.CARACS)
+            self.assertFalse(robot.en_cours())
+            self.assertFalse(robot.pret())
+        finally:
+            robot.fermer()
+
+    def test_ordonnanceur_affichage_zones_sales(self):
+        game_pygame = importer_game_pygame(self)
+        pygame = game_pygame.pygame
+        haut, jeu, voile = pygame.Rect(0, 0, 100, 10), pygame.Rect(0, 10, 100, 90), pygame.Rect(0, 0, 100, 100)
+        ordo = game_pygame.OrdonnanceurAffichage({"haut": haut, "jeu": jeu, "overlays": voile})
+        for nom in ("haut", "jeu", "overlays"):
+            ordo.signaler(nom, (1,))
+        self.assertEqual(len(ordo.valider()), 3)  # premier affichage : tout
+
+        ordo.signaler("haut", (1,))
+        ordo.signaler("jeu", (2,))
+        ordo.signaler("overlays", (1,))
+        ordo.recouvrir("overlays", False)
+        self.assertEqual(ordo.valider(), [jeu])
+        self.assertFalse(ordo.a_redessiner())
+
+        # un overlay affiché recouvre tout : le moindre changement repeint toute la fenêtre
+        ordo.signaler("jeu", (3,))
+        ordo.recouvrir("overlays", True)
+        self.assertEqual(ordo.valider(), [haut, jeu, voile])
+
+    def test_ordonnanceur_affichage_repos_reveille_par_evenement(self):
+        game_pygame = importer_game_pygame(self)
+        pygame = game_pygame.pygame
+        pygame.display.set_mode((10, 10))
+        pygame.event.clear()
+        ordo = game_pygame.OrdonnanceurAffichage({})
+        game_pygame._reveiller_boucle()
+        debut = time.perf_counter()
+        ordo.attendre(pygame.time.Clock(), False)
+        self.assertLess(time.perf_counter() - debut, ordo.ATTENTE_REPOS_MS / 1000)
+        self.assertIn(game_pygame.EVENEMENT_ROBOT, [e.type for e in ordo.evenements()])
+
+    def test_cache_textes_lru_et_decoupage_memorise(self):
+        game_pygame = importer_game_pygame(self)
+
+        class PoliceFactice:
+            # 10 pixels par caractère ; compte les appels
+            def __init__(self):
+                self.rendus = 0
+                self.mesures = 0
+
+            def render(self, texte, antialias, couleur):
+                self.rendus += 1
+                return ("surface", texte, couleur)
+
+            def size(self, texte):
+                self.mesures += 1
+                return (10 * len(texte), 12)
+
+        police = PoliceFactice()
+        cache = game_pygame.CacheTextes(taille_max=2)
+        s = cache.rendre(police, "Poids", (0, 0, 0))
+        self.assertIs(cache.rendre(police, "Poids", (0, 0, 0)), s)
+        self.assertIsNot(cache.rendre(police, "Poids", (255, 255, 255)), s)
+        self.assertEqual(police.rendus, 2)
+        cache.rendre(police, "Longueur", (0, 0, 0))  # évince le plus ancien ("Poids", noir)
+        self.assertEqual(len(cache), 2)
+        cache.rendre(police, "Poids", (0, 0, 0))
+        self.assertEqual(police.rendus, 4)
+
+        lignes = cache.decouper("un chat dort ici", police, 70)
+        self.assertEqual(lignes, ["un chat", "dort", "ici"])
+        mesures = police.mesures
+        self.assertEqual(cache.decouper("un chat dort ici", police, 70), lignes)
+        self.assertEqual(police.mesures, mesures)
+        self.assertEqual(cache.decouper("un chat dort ici", police, 200), ["un chat dort ici"])
+
+    def test_compositeur_cartes_face_dessinee_une_fois(self):
+        game_pygame = importer_game_pygame(self)
+        dessins = []
+
+        def dessiner(surface):
+            dessins.append(surface.get_size())
+            surface.fill((1, 2, 3))
+
+        faces = game_pygame.CompositeurCartes(taille_max=2)
+        faces.contexte(((40, 60), False))
+        f = faces.face(("J1", "lion", True), (40, 60), dessiner)
+        self.assertIs(faces.face(("J1", "lion", True), (40, 60), dessiner), f)
+        self.assertEqual(f.get_at((0, 0))[:3], (1, 2, 3))
+        faces.face(("J1", "lion", False), (40, 60), dessiner)
+        faces.face(("J2", "ours", False), (40, 60), dessiner)
+        self.assertEqual(len(faces), 2)
+        self.assertEqual(len(dessins), 3)
+
+        # changement d'option (ou de taille) : tout est redessiné
+        faces.contexte(((40, 60), True))
+        self.assertEqual(len(faces), 0)
+        faces.face(("J2", "ours", False), (40, 60), dessiner)
+        self.assertEqual(len(dessins), 4)
+
+        # face provisoire (image manquante) : pas gardée, redessinée tant qu'elle manque
+        def dessiner_sans_image(surface):
+            dessiner(surface)
+            return False
+
+        faces.face(("J1", "loup", True), (40, 60), dessiner_sans_image)
+        faces.face(("J1", "loup", True), (40, 60), dessiner)
+        faces.face(("J1", "loup", True), (40, 60), dessiner)
+        self.assertEqual(len(dessins), 6)
+
+    def test_miniatures_relues_depuis_le_disque(self):
+        game_pygame = importer_game_pygame(self)
+        pygame = game_pygame.pygame
+        with tempfile.TemporaryDirectory() as dossier:
+            source = os.path.join(dossier, "animal.png")
+            img = pygame.Surface((80, 40))
+            img.fill((200, 100, 50))
+            pygame.image.save(img, source)
+            cache = os.path.join(dossier, "cache")
+
+            m = game_pygame.charger_miniature(source, 40, 40, cache)
+            self.assertEqual(m.get_size(), (40, 20))  # ratio conservé
+            self.assertEqual(len(os.listdir(cache)), 1)
+
+            # relancement : ni décodage ni redimensionnement
+            with mock.patch.object(pygame.image, "load", side_effect=AssertionError("décodage")):
+                relue = game_pygame.charger_miniature(source, 40, 40, cache)
+            self.assertEqual(pygame.image.tobytes(relue, "RGBA"), pygame.image.tobytes(m, "RGBA"))
+
+            # fichier source modifié -> nouvelle miniature
+            stat = os.stat(source)
+            os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            game_pygame.charger_miniature(source, 40, 40, cache)
+            self.assertEqual(len(os.listdir(cache)), 2)
+
+            self.assertIsNone(game_pygame.charger_miniature(os.path.join(dossier, "absent.jpg"), 40, 40, cache))
+
+            prechargeur = game_pygame.PrechargeurImages(cache)
+            try:
+                prechargeur.lancer([(source, 20, 20), (source, 40, 40)])
+                self.assertEqual(prechargeur.prendre(source, 20, 20).get_size(), (20, 10))
+                self.assertEqual(prechargeur.prendre(source, 40, 40).get_size(), (40, 20))
+                self.assertEqual(prechargeur.restantes(), 0)
+            finally:
+                prechargeur.fermer()
+
+            # démarrage : seules restent les miniatures des demandes actuelles
+            open(os.path.join(cache, "abandon.rgba.99.tmp"), "wb").close()
+            open(os.path.join(cache, "LISEZMOI.txt"), "wb").close()
+            self.assertEqual(len(os.listdir(cache)), 5)
+            self.assertEqual(game_pygame.nettoyer_miniatures(cache, [(source, 40, 40)]), 3)
+            self.assertEqual(sorted(os.listdir(cache)), sorted([
+                "LISEZMOI.txt", os.path.basename(game_pygame._fichier_miniature(source, 40, 40, cache)),
+            ]))
+            with mock.patch.object(pygame.image, "load", side_effect=AssertionError("décodage")):
+                self.assertIsNotNone(game_pygame.charger_miniature(source, 40, 40, cache))
+
+    def test_cache_images_budget_maitre_partage_et_echecs_expirant(self):
+        game_pygame = importer_game_pygame(self)
+        pygame = game_pygame.pygame
+        pygame.display.set_mode((10, 10))
+        with tempfile.TemporaryDirectory() as dossier:
+            source = os.path.join(dossier, "animal.png")
+            pygame.image.save(pygame.Surface((200, 100)), source)
+            maintenant = [0.0]
+            # budget : le maître (200x100) + quelques petites tailles
+            cache = game_pygame.CacheImages(budget_octets=200 * 100 * 4 + 3000, duree_echec_s=10, horloge=lambda: maintenant[0])
+
+            with mock.patch.object(game_pygame, "decoder_image", wraps=game_pygame.decoder_image) as decoder:
+                for largeur in (20, 22, 24, 26, 28, 30):
+                    img = cache.image(source, largeur, largeur)
+                    self.assertEqual(img.get_width(), largeur)
+                self.assertEqual(decoder.call_count, 1)  # un seul décodage pour toutes les tailles
+            self.assertLessEqual(cache.octets, cache.budget_octets)
+            self.assertEqual(cache.octets, sum(cache.octets_image(i) for i in cache._images.values()))
+            self.assertIsNotNone(cache.image(source, 30, 30))  # la plus récente est restée
+
+            absent = os.path.join(dossier, "absent.png")
+            self.assertIsNone(cache.image(absent, 20, 20))
+            pygame.image.save(pygame.Surface((40, 40)), absent)
+            self.assertIsNone(cache.image(absent, 20, 20))  # échec encore retenu
+            maintenant[0] = 11.0
+            self.assertIsNotNone(cache.image(absent, 20, 20))  # échec expiré : on réessaie
+
+    def test_table_issues_identique_aux_comparaisons(self):
+        table = cerveau.table_issues(cerveau.LISTE_ANIMAUX)
+        self.assertIs(table, cerveau.table_issues(list(reversed(cerveau.LISTE_ANIMAUX))))
+        for a in cerveau.LISTE_ANIMAUX:
+            for p in cerveau.LISTE_ANIMAUX:
+                for c, carac in enumerate(cerveau.CARACS):
+                    attendu = getattr(a, carac) > getattr(p, carac)
+                    self.assertEqual(table.actif_gagne(a, p, carac), attendu)
+                    i, j = table.indice_de[id(a)], table.indice_de[id(p)]
+                    self.assertEqual(bool(table.victoires[i, j, c]), attendu)
+        poids = [a.poids for a in table.cartes]
+        self.assertEqual(int(table.rangs[poids.index(max(poids)), 0]), len(set(poids)) - 1)
+
+    def test_table_issues_reconstruite_si_le_paquet_change(self):
+        a = cerveau.Animaux("a", 10, 84, 5)
+        b = cerveau.Animaux("b", 5, 84, 9)
+        table = cerveau.table_issues([a, b])
+        self.assertTrue(table.actif_gagne(a, b, "poids"))
+        b.poids = 50
+        nouvelle = cerveau.table_issues([a, b])
+        self.assertIsNot(nouvelle, table)
+        self.assertFalse(nouvelle.actif_gagne(a, b, "poids"))
+
+    def test_stats_voit_le_paquet_recharge(self):
+        ancien = cerveau.LISTE_ANIMAUX
+        strat = stats.STRATEGIES[0]
+        cle_avant = stats._cle_partie(strat, strat, 1, 100)
+        with tempfile.TemporaryDirectory() as dossier:
+            csv_path = Path(dossier) / "animaux.csv"
+            lignes = ["nom;poids;longueur;longevite;descriptif"]
+            lignes += [f"bete_{i};{i + 1};{20 - i};{i % 5 + 1};" for i in range(6)]
+            csv_path.write_text("\n".join(lignes), encoding="utf-8")
+            try:
+                cerveau.recharger_animaux(csv_path)
+                self.assertEqual(stats.creer_partie_bot_vs_bot(random.Random(1)).nb_cartes_total, 6)
+                self.assertNotEqual(stats._cle_partie(strat, strat, 1, 100), cle_avant)
+            finally:
+                cerveau.LISTE_ANIMAUX = ancien
+                cerveau.TABLE_ISSUES = cerveau.table_issues(ancien)
+        self.assertEqual(stats._cle_partie(strat, strat, 1, 100), cle_avant)
+
+    def test_solveur_exact_petit_paquet(self):
+        # petit paquet sans carte imbattable : 2 cartes chacun
+        deck = [a for a in cerveau.LISTE_ANIMAUX if a.nom != "elephant_d_afrique"][:4]
+        c1, c2 = cerveau.distribuer_cartes(deck, random.Random(1))
+        game = cerveau.GameState(cerveau.Joueur("A", c1), cerveau.Joueur("Robot", c2), rng=random.Random(1))
+        valeurs = cerveau.resoudre_exact(cerveau.etat_canonique(game))
+        for q in valeurs.values():
+            self.assertTrue(all(-1.0 - 1e-9 <= v <= 1.0 + 1e-9 for v in q))
+
+        table = cerveau.TableTransposition(taille_max=len(valeurs))
+        choix = cerveau.choix_robot_exact(game, table=table)
+        q = valeurs[cerveau.etat_canonique(game)]
+        self.assertEqual(q[cerveau.CARACS.index(choix)], max(q))
+        self.assertGreater(max(q), q[0])  # la racine ne se résout pas par défaut en "poids"
+        self.assertEqual(table.manques, 1)
+        cerveau.choix_robot_exact(game, table=table)
+        self.assertEqual(table.manques, 1)
+
+        # table plus petite que le nombre d'états : la racine est évincée, le choix reste le bon
+        petite = cerveau.TableTransposition(taille_max=2)
+        self.assertGreater(len(valeurs), 2)
+        self.assertEqual(cerveau.choix_robot_exact(game, table=petite), choix)
+        self.assertEqual(len(petite), 2)
+
+    def test_solveur_exact_repli_grand_paquet(self):
+        game = cerveau.creer_partie("RI", rng=random.Random(1))
+        appels = []
+        choix = cerveau.choix_robot_exact(game, repli=lambda g: appels.append(g) or "poids")
+        self.assertEqual(choix, "poids")
+        self.assertEqual(len(appels), 1)
+
+    def test_table_transposition_bornee(self):
+        table = cerveau.TableTransposition(taille_max=2)
+        table.put("a", (0, 0, 0))
+        table.put("b", (1, 1, 1))
+        table.get("a")
+        table.put("c", (2, 2, 2))
+        self.assertEqual(len(table), 2)
+        self.assertIsNone(table.get("b"))
+        self.assertIsNotNone(table.get("a"))
+
+    def test_historique_partage_copie_a_l_ecriture(self):
+        origine = cerveau.HistoriquePartage([1, 2])
+        copie = origine.copie()
+        origine.append(3)
+        copie.extend([10, 11])
+        copie_de_copie = copie.copie()
+        copie_de_copie.append(12)
+        self.assertEqual(list(origine), [1, 2, 3])
+        self.assertEqual(list(copie), [1, 2, 10, 11])
+        self.assertEqual(list(copie_de_copie), [1, 2, 10, 11, 12])
+        self.assertEqual(copie[-1], 11)
+        self.assertEqual(copie_de_copie[-3:], [10, 11, 12])
+
+    def test_copie_legere_independante(self):
+        game = cerveau.creer_partie("RI", rng=random.Random(8))
+        for _ in range(5):
+            game.appliquer_manche("poids")
+        clone = game.copie_legere()
+        self.assertFalse(hasattr(clone, "__dict__"))
+        self.assertIs(clone.joueur_actif.nom, game.joueur_actif.nom)
+        cartes_avant = [list(j.cartes) for j in game.joueurs]
+        n_hist = len(game.historique_cartes)
+        clone.appliquer_manche("longueur")
+        self.assertEqual([list(j.cartes) for j in game.joueurs], cartes_avant)
+        self.assertEqual(len(game.historique_cartes), n_hist)
+        self.assertEqual(len(clone.historique_cartes), n_hist + 2)
+        self.assertEqual(len(clone.historique_manches), len(game.historique_manches) + 1)
+
+    def test_niveaux_de_journal(self):
+        parties = {}
+        for niveau in cerveau.NIVEAUX_JOURNAL:
+            c1, c2 = cerveau.distribuer_cartes(cerveau.LISTE_ANIMAUX, random.Random(9))
+            game = cerveau.GameState(cerveau.Joueur("A", c1), cerveau.Joueur("B", c2),
+                                     rng=random.Random(9), niveau_journal=niveau)
+            for _ in range(100):
+                if game.terminee:
+                    break
+                game.appliquer_manche(cerveau.choix_robot_aleatoire(game.rng))
+            parties[niveau] = game
+
+        full, compact, off = parties["full"], parties["compact"], parties["off"]
+        self.assertEqual(len(off.historique_manches), 0)
+        self.assertEqual(len(off.historique_cartes), 0)
+        self.assertIsNone(off.journal_compact)
+        self.assertEqual(len(off.agregats_historique), len(full.historique_cartes))
+
+        journal = compact.journal_compact.tableau()
+        self.assertEqual(len(journal), len(full.historique_manches))
+        for ligne, manche in zip(journal, full.historique_manches):
+            self.assertEqual(cerveau.CARACS[ligne["carac"]], manche["carac"])
+            self.assertEqual(ligne["v_actif"], manche["v_actif"])
+            self.assertEqual(full.joueurs[ligne["gagnant"]].nom, manche["gagnant"])
+            self.assertEqual(full.joueurs[ligne["actif"]].nom, manche["actif"])
+
+        with self.assertRaises(ValueError):
+            cerveau.GameState(cerveau.Joueur("A", c1), cerveau.Joueur("B", c2), niveau_journal="bavard")
+
+    def test_journal_compact_double_sa_capacite(self):
+        journal = cerveau.JournalCompact(capacite=2)
+        for i in range(5):
+            journal.ajouter(i % 2, i % 3, float(i), 1.0, 0)
+        self.assertEqual(len(journal), 5)
+        self.assertEqual(list(journal.tableau()["v_actif"]), [0.0, 1.0, 2.0, 3.0, 4.0])
+
+    def test_hash_position_incremental_egal_au_calcul_complet(self):
+        c1, c2 = cerveau.distribuer_cartes(cerveau.LISTE_ANIMAUX, random.Random(11))
+        game = cerveau.GameState(cerveau.Joueur("A", c1), cerveau.Joueur("B", c2), rng=random.Random(11),
+                                 detecteur_cycles=cerveau.DetecteurCycles())
+        for _ in range(60):
+            if game.terminee:
+                break
+            game.appliquer_manche(cerveau.choix_robot_aleatoire(game.rng))
+            self.assertEqual(game.hash_position, game.calculer_hash_position())
+        self.assertFalse(game.cycle_detecte)
+
+    def test_cycle_detecte_quand_tout_est_egalite(self):
+        # mêmes valeurs partout : l'actif perd toujours, les piles font 1-3 / 2-2 sans fin
+        deck = [cerveau.Animaux(f"x{i}", 5, 5, 5) for i in range(4)]
+        game = cerveau.GameState(cerveau.Joueur("A", deck[:2]), cerveau.Joueur("B", deck[2:]),
+                                 rng=random.Random(1), detecteur_cycles=cerveau.DetecteurCycles(200, 10))
+        manches = 0
+        while not game.terminee and not game.cycle_detecte and manches < 5000:
+            game.appliquer_manche("poids")
+            manches += 1
+        self.assertTrue(game.cycle_detecte)
+        self.assertFalse(game.terminee)
+        self.assertLess(manches, 1000)
+
+    def test_stats_sequentiel_s_arrete_tot_et_reste_coherent(self):
+        random_ = stats.STRATEGIE_PAR_NOM["Random"]
+        median = stats.STRATEGIE_PAR_NOM["MedianRatio(hist)"]
+        res = stats.comparer_deux_strategies(random_, median, n_games=300, seed=5, export_csv=False,
+                                             decision_50=True, taille_lot=20)
+        self.assertEqual(res["sequential_stop"], "decision")
+        self.assertLess(res["n_games"], 300)
+        self.assertLess(res["winrate_A_seq_high_pct"], 50.0)
+        # intervalle séquentiel plus large que l'IC95 simple (plusieurs regards)
+        self.assertLessEqual(res["winrate_A_seq_low_pct"], res["winrate_A_ci95_low_pct"])
+
+        # mêmes seeds que l'expérience fixe de même taille
+        fixe = stats.comparer_deux_strategies(random_, median, n_games=res["n_games"], seed=5, export_csv=False)
+        self.assertEqual(fixe["wins_A"], res["wins_A"])
+        self.assertEqual(fixe["avg_rounds_overall"], res["avg_rounds_overall"])
+
+    def test_cache_parties_rejoue_depuis_le_disque(self):
+        random_ = stats.STRATEGIE_PAR_NOM["Random"]
+        first = stats.STRATEGIE_PAR_NOM["FirstStat(poids)"]
+        sans_cache = stats.comparer_deux_strategies(random_, first, n_games=20, seed=3, export_csv=False)
+
+        with tempfile.TemporaryDirectory() as dossier:
+            stats.activer_cache_parties(Path(dossier) / "cache.sqlite")
+            try:
+                premier = stats.comparer_deux_strategies(random_, first, n_games=20, seed=3, export_csv=False)
+                cache = stats._cache_parties()
+                self.assertEqual(cache.trouves, 0)
+                self.assertEqual(len(cache), 40)
+
+                second = stats.comparer_deux_strategies(random_, first, n_games=20, seed=3, export_csv=False)
+                self.assertEqual(cache.trouves, 40)
+                for res in (premier, second):
+                    self.assertEqual(res["wins_A"], sans_cache["wins_A"])
+                    self.assertEqual(res["avg_rounds_overall"], sans_cache["avg_rounds_overall"])
+
+                # nouvelle version de stratégie : nouvelles clés, parties rejouées
+                first_v2 = stats.Strategie(first.nom, first.choisir, version="2")
+                stats.comparer_deux_strategies(random_, first_v2, n_games=20, seed=3, export_csv=False)
+                self.assertEqual(cache.trouves, 40)
+                self.assertEqual(len(cache), 80)
+
+                # le premier joueur est relu avec le résultat (pas de nouvelle distribution)
+                attendu = stats._simuler_partie(random_, first, 11, 5000)
+                stats.jouer_une_partie(random_, first, seed=11)
+                with mock.patch.object(stats, "creer_partie_bot_vs_bot", side_effect=AssertionError("redistribué")):
+                    self.assertEqual(stats.jouer_une_partie(random_, first, seed=11), attendu)
+            finally:
+                stats.activer_cache_parties(None)
+
+    def test_cache_parties_ancien_format_reconstruit(self):
+        import sqlite3
+        from stockage import CacheParties
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = Path(dossier) / "c.sqlite"
+            ancien = sqlite3.connect(str(chemin))
+            ancien.execute("CREATE TABLE parties (cle TEXT PRIMARY KEY, gagnant TEXT NOT NULL,"
+                           " manches INTEGER NOT NULL, utilise INTEGER NOT NULL)")
+            ancien.execute("INSERT INTO parties VALUES ('a', 'BotA', 3, 1)")
+            ancien.commit()
+            ancien.close()
+
+            cache = CacheParties(chemin)
+            self.assertEqual(len(cache), 0)
+            cache.ecrire("a", "BotB", 4, "BotA")
+            self.assertEqual(cache.lire("a"), ("BotB", 4, "BotA"))
+            cache.fermer()
+
+    def test_cache_parties_borne(self):
+        with tempfile.TemporaryDirectory() as dossier:
+            from stockage import CacheParties
+            cache = CacheParties(Path(dossier) / "c.sqlite", taille_max=10, ecritures_par_transaction=5)
+            for i in range(30):
+                cache.ecrire(str(i), "BotA", i, "BotB")
+            cache.valider()
+            self.assertLessEqual(len(cache), 10)
+            self.assertEqual(cache.lire("29"), ("BotA", 29, "BotB"))
+            self.assertIsNone(cache.lire("0"))
+            cache.fermer()
+
+    def test_cache_parties_recence_des_lectures(self):
+        with tempfile.TemporaryDirectory() as dossier:
+            from stockage import CacheParties
+            cache = CacheParties(Path(dossier) / "c.sqlite", taille_max=3, ecritures_par_transaction=100)
+            for cle in "abc":
+                cache.ecrire(cle, "BotA", 1, "BotA")
+            cache.valider()
+            with mock.patch.object(CacheParties, "__len__", side_effect=AssertionError("COUNT(*)")):
+                self.assertEqual(cache.lire("a"), ("BotA", 1, "BotA"))
+                cache.valider()  # seule la récence de "a" est écrite
+            cache.ecrire("d", "BotB", 2, "BotA")
+            cache.valider()
+            self.assertEqual(len(cache), 3)
+            self.assertIsNone(cache.lire("b"))
+            self.assertEqual(cache.lire("a"), ("BotA", 1, "BotA"))
+            cache.fermer()
+
+    def test_tournoi_reprend_depuis_le_stockage(self):
+        from stockage import StockageResultats
+        strats = [stats.STRATEGIE_PAR_NOM[n] for n in ("Random", "MedianRatio(hist)", "CheatAbsolute(see both)")]
+        # coûts fixés : le classement gros / petit ne dépend pas de la machine
+        modele = stats.ModeleCout({"Random": 1e-6, "MedianRatio(hist)": 1e-3, "CheatAbsolute(see both)": 1e-3},
+                                  cout_manche_s=1e-5, manches_par_partie=50)
+        params = dict(seed=7, n_games_petit=10, n_games_gros=6, n_repetitions_gros=2, export_csv=False,
+                      modele=modele)
+
+        with tempfile.TemporaryDirectory() as dossier, mock.patch.object(stats, "STRATEGIES", strats):
+            stockage = StockageResultats(Path(dossier) / "r.sqlite")
+            try:
+                stats.comparer_toutes_strategies_adaptatif(stockage=stockage, **params)
+                self.assertEqual(len(stockage.resultats("matchup")), 3)
+                self.assertEqual(len(stockage.resultats("repetition")), 2)
+
+                # relance : tout est relu, rien n'est rejoué
+                with mock.patch.object(stats, "jouer_une_partie", side_effect=AssertionError("rejoué")):
+                    stats.comparer_toutes_strategies_adaptatif(stockage=stockage, **params)
+                    stats.comparer_toutes_strategies_adaptatif(stockage=stockage, n_processus=2, **params)
+                self.assertEqual(len(stockage.resultats("matchup")), 3)
+
+                direct = stats.comparer_deux_strategies(strats[0], strats[1], n_games=10, seed=7 + 1,
+                                                        export_csv=False)
+                matchups = {(r["A"], r["B"]): r for r in stockage.resultats("matchup")}
+                self.assertEqual(matchups[(strats[0].nom, strats[1].nom)]["wins_A"], direct["wins_A"])
+
+                chemin_csv = Path(dossier) / "export.csv"
+                self.assertEqual(stats.exporter_resultats_csv(stockage, chemin_csv), 3)
+                entete = chemin_csv.read_text(encoding="utf-8").splitlines()[0]
+                self.assertEqual(entete.split(";"), stats.COLONNES_CSV)
+            finally:
+                stockage.fermer()
+
+    def test_enregistreur_parties_colonnes_coherentes(self):
+        from stockage import EnregistreurParties, charger_parties, ISSUES_PARTIE
+        random_ = stats.STRATEGIE_PAR_NOM["Random"]
+        first = stats.STRATEGIE_PAR_NOM["FirstStat(poids)"]
+
+        with tempfile.TemporaryDirectory() as dossier:
+            enregistreur = EnregistreurParties(Path(dossier) / "serie", taille_tampon=7)
+            res = stats.comparer_deux_strategies(random_, first, n_games=15, seed=4, export_csv=False,
+                                                 enregistreur=enregistreur)
+            enregistreur.fermer()
+            parties = charger_parties(Path(dossier) / "serie")
+            self.assertIsInstance(parties["manches"], np.memmap)
+            self.assertEqual(len(parties["seed"]), 30)
+            self.assertEqual(int(np.sum(parties["gagnant"] == ISSUES_PARTIE.index("A"))), res["wins_A"])
+            self.assertEqual(int(parties["manches"].sum()), round(res["avg_rounds_all_runs"] * 30))
+            # même seed, côtés opposés : le premier joueur (vu de A) s'inverse
+            self.assertTrue(np.all(parties["premier"][0::2] != parties["premier"][1::2]))
+
+            # reprise du même dossier : on ajoute à la suite
+            enregistreur = EnregistreurParties(Path(dossier) / "serie")
+            stats.comparer_deux_strategies(random_, first, n_games=5, seed=9, export_csv=False,
+                                           enregistreur=enregistreur)
+            enregistreur.fermer()
+            parties = charger_parties(Path(dossier) / "serie")
+            self.assertEqual(len(parties["seed"]), 40)
+            self.assertEqual(list(np.unique(parties["matchup"])), [0, 1])
+
+            # tournoi multiprocessus : mêmes lignes qu'en série
+            with mock.patch.object(stats, "STRATEGIES", [random_, first]):
+                for nom, n_processus in (("t1", 1), ("t2", 2)):
+                    enregistreur = EnregistreurParties(Path(dossier) / nom)
+                    stats.comparer_toutes_strategies_adaptatif(seed=3, n_games_petit=12, export_csv=False,
+                                                               n_processus=n_processus, taille_morceau=5,
+                                                               enregistreur=enregistreur)
+                    enregistreur.fermer()
+            t1, t2 = charger_parties(Path(dossier) / "t1"), charger_parties(Path(dossier) / "t2")
+            for colonne in t1:
+                self.assertTrue(np.array_equal(t1[colonne], t2[colonne]))
+
+    def test_accumulateur_identique_aux_listes_et_fusionnable(self):
+        rng = random.Random(2)
+        valeurs = [rng.randint(5, 300) for _ in range(501)]
+        acc = stats.Accumulateur()
+        for v in valeurs:
+            acc.ajouter(v)
+        self.assertEqual(acc.moyenne(), stats.moyenne(valeurs))
+        self.assertEqual(acc.mediane(), stats.mediane(valeurs))
+        self.assertAlmostEqual(acc.ecart_type(), stats.ecart_type(valeurs), places=9)
+        self.assertEqual((acc.min, acc.max), (min(valeurs), max(valeurs)))
+
+        # morceaux fusionnés == une seule passe (nombre pair de valeurs : médiane entre deux)
+        morceaux = []
+        for d in range(0, 500, 90):
+            m = stats.Accumulateur()
+            for v in valeurs[d:min(d + 90, 500)]:
+                m.ajouter(v)
+            morceaux.append(m)
+        total = stats.Accumulateur()
+        for m in morceaux:
+            total.fusionner(m)
+        self.assertEqual(total.n, 500)
+        self.assertEqual(total.moyenne(), stats.moyenne(valeurs[:500]))
+        self.assertEqual(total.mediane(), stats.mediane(valeurs[:500]))
+        self.assertAlmostEqual(total.ecart_type(), stats.ecart_type(valeurs[:500]), places=9)
+
+        vide = stats.Accumulateur()
+        self.assertTrue(vide.moyenne() != vide.moyenne())  # nan
+        vide.ajouter(4)
+        self.assertEqual((vide.ecart_type(), vide.mediane()), (0.0, 4))
+
+    def test_telemetrie_progression_et_resume_json(self):
+        strats = [stats.STRATEGIE_PAR_NOM[n] for n in ("Random", "FirstStat(poids)", "MeanRatio(hist)")]
+        flux = io.StringIO()
+        telemetrie = stats.Telemetrie(intervalle_s=0.0, flux=flux)
+        with mock.patch.object(stats, "STRATEGIES", strats), mock.patch("sys.stdout", io.StringIO()):
+            stats.comparer_toutes_strategies_adaptatif(seed=2, n_games_petit=10, export_csv=False,
+                                                       telemetrie=telemetrie)
+
+        self.assertEqual(telemetrie.n_parties_prevues, 3 * 20)
+        self.assertEqual(telemetrie.parties, 3 * 20)
+        self.assertIn("ETA", flux.getvalue())
+        self.assertEqual(len(telemetrie.matchups), 3)
+        for m in telemetrie.matchups:
+            self.assertEqual(m["parties"], 20)
+            self.assertEqual(m["decisions_A"] + m["decisions_B"], m["manches"])
+            self.assertGreater(m["cpu_s"], 0.0)
+        self.assertEqual(sum(m["manches"] for m in telemetrie.matchups), telemetrie.manches)
+
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = telemetrie.ecrire_resume(Path(dossier) / "t.json")
+            resume = json.loads(chemin.read_text(encoding="utf-8"))
+        self.assertEqual(resume["parties"], 60)
+        self.assertEqual(len(resume["matchups"]), 3)
+        self.assertIn("parties_par_s", resume)
+
+    def test_histogramme_latence_quantiles(self):
+        h = stats.HistogrammeLatence()
+        for ns in range(1, 100_001):
+            h.ajouter(ns * 10)
+        self.assertEqual(h.n, 100_000)
+        for q in (0.5, 0.9, 0.99):
+            exact = q * 1_000_000
+            self.assertLess(abs(h.quantile(q) - exact) / exact, 0.125)
+
+        autre = stats.HistogrammeLatence.depuis_dict(h.vers_dict())
+        autre.fusionner(h)
+        self.assertEqual((autre.n, autre.total_ns), (2 * h.n, 2 * h.total_ns))
+        self.assertEqual(autre.quantile(0.9), h.quantile(0.9))
+        self.assertEqual(h.difference(stats.HistogrammeLatence()).comptes, h.comptes)
+
+    def test_profil_latences_par_matchup(self):
+        random_ = stats.STRATEGIE_PAR_NOM["Random"]
+        mean = stats.STRATEGIE_PAR_NOM["MeanRatio(hist)"]
+        sans = stats.comparer_deux_strategies(random_, mean, n_games=10, seed=6, export_csv=False)
+        self.assertNotIn("latency_A_calls", sans)
+
+        stats.activer_profil_latences(True)
+        try:
+            res = stats.comparer_deux_strategies_repetitions(random_, mean, n_games=10, seed=6,
+                                                             n_repetitions=2, export_csv=False)
+        finally:
+            stats.activer_profil_latences(False)
+        self.assertNotIn("decisions_A", res)  # dépend du cache : télémétrie seulement
+        self.assertEqual(res["latency_A_calls"] + res["latency_B_calls"], res["total_rounds_all_runs"])
+        self.assertLessEqual(res["latency_A_p50_us"], res["latency_A_p99_us"])
+        self.assertGreater(res["latency_B_total_s"], 0.0)
+        self.assertIn("latency_B_p90_us", stats.COLONNES_CSV)
+
+    def test_plan_selon_budget_modele_de_cout(self):
+        strats = [stats.STRATEGIE_PAR_NOM[n] for n in
+                  ("Random", "FirstStat(poids)", "CheatMedianAllCards(median global)", "MedianRatio(hist)")]
+        plan = [(strats[0], strats[1], 1, False), (strats[0], strats[2], 2, False), (strats[2], strats[3], 3, True)]
+        modele = stats.ModeleCout(
+            {"Random": 1e-6, "FirstStat(poids)": 1e-6,
+             "CheatMedianAllCards(median global)": 1e-3, "MedianRatio(hist)": 1e-3},
+            cout_manche_s=1e-5, manches_par_partie=50,
+        )
+        entrees = stats.planifier_selon_budget(plan, modele, budget_s=60.0, n_repetitions_gros=3,
+                                               n_games_min=10, n_games_max=2000)
+        par_seed = {e[2]: e for e in entrees}
+
+        # gros = les deux stratégies sont lentes selon le modèle (la stratégie lente
+        # absente des listes à la main compte) ; une seule lente ne suffit pas
+        self.assertTrue(par_seed[3][3])
+        self.assertEqual(par_seed[3][5], 3)
+        self.assertFalse(par_seed[2][3])
+        self.assertEqual(par_seed[2][5], 1)
+        # le match-up rapide, plafonné à n_games_max, coûte le moins : il passe en dernier
+        self.assertEqual(entrees[2][2], 1)
+        self.assertEqual(entrees[2][4], 2000)
+
+        # le budget libéré par le match-up plafonné est redistribué aux autres
+        parts = [2 * e[4] * e[5] * modele.cout_partie_s(e[0], e[1]) for e in entrees]
+        self.assertLessEqual(sum(parts), 60.0)
+        self.assertGreater(sum(parts), 0.9 * 60.0)
+        self.assertGreater(parts[1], 60.0 / 3)
+        self.assertGreaterEqual(parts[0], parts[1])
+
+        # effort fixe : mêmes classes, du plus long au plus court
+        fixe = stats._plan_effort_fixe(plan, 10, 50, 3, modele)
+        self.assertEqual([e[2] for e in fixe], [3, 2, 1])
+        self.assertEqual([e[4] * e[5] for e in fixe], [150, 10, 10])
+
+    def test_calibration_strategies_rapides(self):
+        strats = [stats.STRATEGIE_PAR_NOM[n] for n in ("Random", "CheatMedianAllCards(median global)")]
+        modele = stats.calibrer_strategies(strats, n_positions=10, duree_max_s=0.05)
+        self.assertGreater(modele.manches_par_partie, 1)
+        self.assertGreater(modele.cout_manche_s, 0)
+        self.assertEqual(set(modele.cout_decision_s), {s.nom for s in strats})
+        self.assertGreater(modele.cout_decision_s["CheatMedianAllCards(median global)"],
+                           modele.cout_decision_s["Random"])
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)